@@ -0,0 +1,167 @@
+"""
+Persistent on-disk cache of parsed Vivado analysis log files.
+
+Entries are keyed by file path, size, modification time and parser version, so a
+log is only parsed again when it changes or when the parser itself changes.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+from parsers import FREQUENCY_RECORD_FIELDS, PARSER_VERSION
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_logs (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    parser_version INTEGER NOT NULL,
+    records TEXT NOT NULL
+)
+"""
+
+
+class ParseCache:
+    """
+    SQLite-backed cache of the frequency records parsed from each log file.
+
+    Args:
+        db_path (str): Path to the SQLite database file, created if missing.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(_SCHEMA)
+        except sqlite3.DatabaseError:
+            # A corrupt cache file is never worth failing a run for, start over
+            conn.close()
+            os.remove(self.db_path)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(_SCHEMA)
+        return conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM parsed_logs").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def get(self, file_path, stat=None):
+        """
+        Look up the cached records for a log file.
+
+        Args:
+            file_path (str): Path to the log file.
+            stat (os.stat_result, optional): Stat of the file, taken now if not given.
+
+        Returns:
+            list[dict] or None: The cached records, or None if missing or stale.
+        """
+        stat = stat if stat is not None else os.stat(file_path)
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, parser_version, records FROM parsed_logs WHERE path = ?",
+            (os.path.abspath(file_path),),
+        ).fetchone()
+
+        if row is None or tuple(row[:3]) != (stat.st_size, stat.st_mtime_ns, PARSER_VERSION):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [dict(zip(FREQUENCY_RECORD_FIELDS, values)) for values in json.loads(row[3])]
+
+    def put(self, file_path, records, stat=None):
+        """
+        Store the records parsed from a log file.
+
+        Args:
+            file_path (str): Path to the log file.
+            records (list[dict]): Records returned by parsers.parse_frequency_records.
+            stat (os.stat_result, optional): Stat of the file taken before it was parsed,
+                so that a file modified while being parsed is treated as stale next time.
+        """
+        self.put_many([(file_path, records, stat)])
+
+    def put_many(self, entries):
+        """
+        Store several (file_path, records, stat) entries in one transaction.
+
+        Args:
+            entries (iterable): Tuples accepted by put.
+        """
+        rows = []
+        for file_path, records, stat in entries:
+            stat = stat if stat is not None else os.stat(file_path)
+            values = [[record[key] for key in FREQUENCY_RECORD_FIELDS] for record in records]
+            rows.append(
+                (
+                    os.path.abspath(file_path),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    PARSER_VERSION,
+                    json.dumps(values, separators=(",", ":")),
+                )
+            )
+
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO parsed_logs VALUES (?, ?, ?, ?, ?)", rows)
+
+    def prune(self):
+        """
+        Remove entries for files that no longer exist or were parsed by another parser version.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        removed = [
+            (path,)
+            for path, version in self._conn.execute("SELECT path, parser_version FROM parsed_logs")
+            if version != PARSER_VERSION or not os.path.exists(path)
+        ]
+        with self._conn:
+            self._conn.executemany("DELETE FROM parsed_logs WHERE path = ?", removed)
+        return len(removed)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._conn:
+            self._conn.execute("DELETE FROM parsed_logs")
+        self._conn.execute("VACUUM")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear a parsed-log cache.")
+    parser.add_argument("db_path", help="Path to the cache database")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--clear", action="store_true", help="Remove every entry")
+    group.add_argument("--prune", action="store_true", help="Remove stale entries")
+    args = parser.parse_args()
+
+    with ParseCache(args.db_path) as cache:
+        if args.clear:
+            cache.clear()
+            print(f"Cleared {args.db_path}")
+        elif args.prune:
+            print(f"Removed {cache.prune()} stale entries from {args.db_path}")
+        else:
+            print(f"{len(cache)} cached log files in {args.db_path}")
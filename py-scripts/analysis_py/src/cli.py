@@ -0,0 +1,254 @@
+"""
+Command-line entry point of the analysis: ingest, query, export, plot and bench.
+
+Only this module and config are imported at startup. Every command imports the
+modules it needs when it runs, so a scripted query loads NumPy but never matplotlib,
+and `--help` loads neither.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from config import CACHE_FILE, INDEX_FILE, OUTPUT_DIR, PLOT_STORE_DIR
+
+# hwpq directory of this repository
+DEFAULT_BASE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "hwpq"
+)
+
+# Modules each command imports, timed by the bench command
+COMMAND_MODULES = {
+    "ingest": ("query",),
+    "query": ("query",),
+    "export": ("dataset",),
+    "plot": ("plotter",),
+}
+
+# Libraries whose import time dominates startup
+HEAVY_MODULES = ("numpy", "matplotlib")
+
+
+def output_path(args, name):
+    """Path of an output file under the base directory's OUTPUT_DIR."""
+    return os.path.join(args.base_dir, OUTPUT_DIR, name)
+
+
+def open_cache(args):
+    """Open the parse cache of the arguments, None with --no-cache."""
+    if args.no_cache:
+        return None
+    from cache import ParseCache
+
+    return ParseCache(args.cache or output_path(args, CACHE_FILE))
+
+
+def build_index(args, path):
+    """
+    Parse every log of every device, through the parse cache, into a design-space index.
+
+    Devices are filtered when querying, so the saved index always covers the whole tree.
+    """
+    from query import DesignSpaceIndex
+
+    cache = open_cache(args)
+    try:
+        index = DesignSpaceIndex.from_results_tree(args.base_dir, workers=args.workers, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    index.save(path)
+    return index
+
+
+def ingest(args):
+    """Parse the result tree and save the design-space index used by query."""
+    start = time.perf_counter()
+    path = args.index or output_path(args, INDEX_FILE)
+    index = build_index(args, path)
+    print(f"Indexed {len(index)} variants in {time.perf_counter() - start:.2f}s to {path}")
+
+
+def mix_argument(text):
+    """Parse the --mix of query, importing workload only when that command runs."""
+    from workload import parse_mix
+
+    try:
+        return parse_mix(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def query(args):
+    """Rank architectures from the saved index, building it first if missing or stale."""
+    from query import load_index, print_results
+
+    path = args.index or output_path(args, INDEX_FILE)
+    index = load_index(path, args.base_dir)
+    if index is None:
+        index = build_index(args, path)
+
+    print_results(
+        index.query(
+            queue_size=args.queue_size,
+            mix=args.mix,
+            min_throughput=args.min_mops,
+            max_luts_percent=args.max_luts,
+            max_registers_percent=args.max_registers,
+            max_bram_percent=args.max_bram,
+            max_power=args.max_power,
+            devices=args.device,
+            rank_by=args.rank_by,
+            top=args.top,
+        )
+    )
+
+
+def export(args):
+    """Write the parsed results to a .npy or .csv file."""
+    from dataset import ResultsDataset
+
+    cache = open_cache(args)
+    try:
+        dataset = ResultsDataset.from_results_tree(args.base_dir, args.device, workers=args.workers, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    if not args.all_points:
+        dataset = dataset.max_frequency_points()
+
+    if args.output.endswith(".npy"):
+        dataset.save(args.output)
+    else:
+        dataset.save_csv(args.output)
+    print(f"Exported {len(dataset)} rows to {args.output}")
+
+
+def plot(args):
+    """Render the selected figures."""
+    from plotter import process_and_plot_all
+    from render_cache import RenderStore
+
+    cache = open_cache(args)
+    store = None if args.no_store else RenderStore(output_path(args, PLOT_STORE_DIR))
+    try:
+        process_and_plot_all(
+            args.base_dir,
+            args.output or os.path.join(args.base_dir, OUTPUT_DIR),
+            workers=args.workers,
+            cache=cache,
+            architectures=args.arch,
+            figures=None if "all" in args.figures else args.figures,
+            devices=args.device,
+            render_store=store,
+            preview=args.preview,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def startup_time(command, repeat=5):
+    """
+    Time a fresh interpreter starting the CLI and importing a command's modules.
+
+    Args:
+        command (str): Key of COMMAND_MODULES, or None for the CLI alone
+        repeat (int, optional): Number of runs, the median is kept
+
+    Returns:
+        tuple: (median seconds, heavy modules loaded)
+    """
+    modules = COMMAND_MODULES.get(command, ())
+    code = (
+        f"import sys; sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r}); import cli; "
+        + "".join(f"import {module}; " for module in modules)
+        + f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loaded = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), loaded.strip()
+
+
+def bench(args):
+    """Print the startup time of every command."""
+    baseline, _ = startup_time(None, args.repeat)
+    print(f"{'command':10s} {'startup ms':>10s} {'over CLI':>9s}  heavy imports")
+    print(f"{'(cli)':10s} {baseline * 1000:10.1f} {0:9.1f}  -")
+    for command in COMMAND_MODULES:
+        seconds, loaded = startup_time(command, args.repeat)
+        print(f"{command:10s} {seconds * 1000:10.1f} {(seconds - baseline) * 1000:9.1f}  {loaded or '-'}")
+
+
+def build_parser():
+    """Create the argument parser of every command."""
+    parser = argparse.ArgumentParser(description="Analyze hwpq Vivado results.")
+    parser.add_argument("--base-dir", default=DEFAULT_BASE_DIR, help="hwpq directory containing the architecture directories")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_parsing_options(command, devices=True):
+        if devices:
+            command.add_argument("--device", action="append", help="Only include this device (repeatable)")
+        command.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes parsing logs")
+        command.add_argument("--cache", help=f"Parse cache, {OUTPUT_DIR}/{CACHE_FILE} by default")
+        command.add_argument("--no-cache", action="store_true", help="Parse every log again")
+
+    command = commands.add_parser("ingest", help="Parse the result tree into the design-space index")
+    add_parsing_options(command, devices=False)
+    command.add_argument("--index", help=f"Index file of every device, {OUTPUT_DIR}/{INDEX_FILE} by default")
+    command.set_defaults(run=ingest)
+
+    command = commands.add_parser("query", help="Rank architectures meeting a queue size, throughput and device budget")
+    add_parsing_options(command)
+    command.add_argument("--index", help=f"Index file, {OUTPUT_DIR}/{INDEX_FILE} by default, built if missing or stale")
+    command.add_argument("--queue-size", type=int, default=1, help="Entries the queue must hold")
+    command.add_argument("--mix", type=mix_argument, default="dequeue", help='Operation mix, e.g. "enqueue=1,dequeue=1"')
+    command.add_argument("--min-mops", type=float, help="Minimum throughput under the mix, in MOPS")
+    command.add_argument("--max-luts", type=float, help="Maximum LUT utilization, in percent")
+    command.add_argument("--max-registers", type=float, help="Maximum register utilization, in percent")
+    command.add_argument("--max-bram", type=float, help="Maximum BRAM utilization, in percent")
+    command.add_argument("--max-power", type=float, help="Maximum power, in W")
+    command.add_argument(
+        "--rank-by",
+        choices=("throughput", "frequency", "luts", "registers", "bram", "resources", "power"),
+        default="throughput",
+        help="Ranking order",
+    )
+    command.add_argument("--top", type=int, help="Number of results shown")
+    command.set_defaults(run=query)
+
+    command = commands.add_parser("export", help="Export parsed results to .npy or .csv")
+    add_parsing_options(command)
+    command.add_argument("output", help="Output file; .npy keeps the binary dataset, anything else is CSV")
+    command.add_argument("--all-points", action="store_true", help="Every target frequency, not only the maximum")
+    command.set_defaults(run=export)
+
+    command = commands.add_parser("plot", help="Render figures")
+    add_parsing_options(command)
+    command.add_argument("figures", nargs="+", help='Figure names, e.g. dequeue_performance_comparison, or "all"')
+    command.add_argument("--arch", action="append", help="Only plot this architecture key (repeatable)")
+    command.add_argument("--output", help=f"Output directory, {OUTPUT_DIR} by default")
+    command.add_argument("--preview", action="store_true", help="Save previews first, final figures in the background")
+    command.add_argument("--no-store", action="store_true", help="Render every figure instead of reusing unchanged ones")
+    command.set_defaults(run=plot)
+
+    command = commands.add_parser("bench", help="Measure the startup time of every command")
+    command.add_argument("--repeat", type=int, default=5, help="Runs per command, the median is reported")
+    command.set_defaults(run=bench)
+    return parser
+
+
+def main(argv=None):
+    """Run the command given on the command line, or in argv."""
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,44 @@
 # Output settings
 OUTPUT_DIR = "../vivado-analysis_plots"
 
-# Performance factors for operations across architectures
+# Parsed-log cache, stored inside OUTPUT_DIR
+CACHE_FILE = "parse_cache.sqlite3"
+
+# Rendered-figure store for incremental plot runs, stored inside OUTPUT_DIR
+PLOT_STORE_DIR = "plot_store"
+
+# Design-space index written by `cli.py ingest`, stored inside OUTPUT_DIR
+INDEX_FILE = "design_space_index.npz"
+
+# Number of (architecture, operation) metric series kept in memory
+METRICS_CACHE_SIZE = 256
+
+# FPGA device analyzed when a single device is plotted
+DEFAULT_DEVICE = "xcau25p"
+
+# Resources available on each FPGA device (CLB LUTs, CLB registers, 36Kb BRAM tiles)
+DEVICE_RESOURCES = {
+    "xcau25p": {"luts": 141000, "registers": 282000, "bram": 300},
+    "xcvu19p": {"luts": 4085760, "registers": 8171520, "bram": 2160},
+}
+
+# Vivado part of each FPGA device, passed to the synthesis Tcl script by sweep.py
+DEVICE_PARTS = {
+    "xcau25p": "xcau25p-ffvb676-1-e",
+    "xcvu19p": "xcvu19p-fsva3824-1-e",
+}
+
+# Resources of the default device
+TOTAL_LUTS = DEVICE_RESOURCES[DEFAULT_DEVICE]["luts"]
+TOTAL_REGISTERS = DEVICE_RESOURCES[DEFAULT_DEVICE]["registers"]
+TOTAL_BRAM = DEVICE_RESOURCES[DEFAULT_DEVICE]["bram"]
+
+# Performance factors (ops/cycle) for operations across architectures, see throughput.py
 PERFORMANCE_FACTORS = {
     "enqueue": {
         "register_array_enq_enabled": 1,
         "register_array_pipelined_enq_enabled": 1/2,
-        # register_tree handled specially with log2 formula
+        # register_tree depends on the queue size, its models are registered in throughput.py
         "systolic_array": 1,
         # bram_tree, pipelined_bram_tree and hybrid tree do not support enqueue operation
     },
@@ -3,8 +3,15 @@ Data processing functions for Vivado analysis results.
 """
 
 import numpy as np
-from math import log2
-from config import PERFORMANCE_FACTORS
+from config import DEVICE_RESOURCES
+from dataset import as_data_dict
+from metrics_engine import METRICS_CACHE, compute_metrics, nearest_power_of_two
+from scaling_model import fit_metric
+from throughput import supports
+from workload import mix_throughput
+
+# Metric holding the absolute count of each device resource
+RESOURCE_USED_FIELDS = {"luts": "luts_used", "registers": "registers_used", "bram": "bram_used"}
 
 
 def sort_xy(x, y):
@@ -26,30 +33,23 @@ def sort_xy(x, y):
     return x[sort_idx], y[sort_idx]
 
 
+def _series(data_dict, metric, arch="", operation=None):
+    # One architecture through the vectorized engine, computed once per data version
+    return METRICS_CACHE.series(data_dict, arch, metric, operation)
+
+
 def get_max_achieved_frequency(data_dict):
     """
     For each queue size, get the maximum achieved frequency.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [maximum achieved frequencies])
     """
-    queue_sizes = []
-    max_frequencies = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the maximum achieved frequency
-        if "max_achieved_frequency" in metrics:
-            max_freq = metrics["max_achieved_frequency"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            max_frequencies.append(max_freq)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, max_frequencies)
+    return _series(data_dict, "max_achieved_frequency")
 
 
 def get_lut_usage(data_dict):
@@ -57,25 +57,15 @@ def get_lut_usage(data_dict):
     For each queue size, get the number of LUTs used.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [LUT usage counts])
     """
-    queue_sizes = []
-    lut_usage = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the LUTs used
-        if "luts_used" in metrics:
-            luts = metrics["luts_used"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            lut_usage.append(luts)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, lut_usage)
+    # Counts stay integers, as parsed
+    queue_sizes, lut_usage = _series(data_dict, "luts_used")
+    return queue_sizes, lut_usage.astype(np.int64)
 
 
 def get_lut_utilization(data_dict):
@@ -83,25 +73,13 @@ def get_lut_utilization(data_dict):
     For each queue size, get the LUT utilization percentage.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [LUT utilization percentages])
     """
-    queue_sizes = []
-    lut_util = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the LUT utilization percentage
-        if "luts_util_percent" in metrics:
-            util = metrics["luts_util_percent"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            lut_util.append(util)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, lut_util)
+    return _series(data_dict, "luts_util_percent")
 
 
 def get_register_usage(data_dict):
@@ -109,25 +87,15 @@ def get_register_usage(data_dict):
     For each queue size, get the number of registers used.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [register usage counts])
     """
-    queue_sizes = []
-    reg_usage = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the registers used
-        if "registers_used" in metrics:
-            regs = metrics["registers_used"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            reg_usage.append(regs)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, reg_usage)
+    # Counts stay integers, as parsed
+    queue_sizes, register_usage = _series(data_dict, "registers_used")
+    return queue_sizes, register_usage.astype(np.int64)
 
 
 def get_register_utilization(data_dict):
@@ -135,25 +103,13 @@ def get_register_utilization(data_dict):
     For each queue size, get the register utilization percentage.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [register utilization percentages])
     """
-    queue_sizes = []
-    reg_util = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the register utilization percentage
-        if "registers_util_percent" in metrics:
-            util = metrics["registers_util_percent"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            reg_util.append(util)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, reg_util)
+    return _series(data_dict, "registers_util_percent")
 
 
 def get_bram_usage(data_dict):
@@ -161,25 +117,13 @@ def get_bram_usage(data_dict):
     For each queue size, get the number of BRAMs used.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [BRAM usage counts])
     """
-    queue_sizes = []
-    bram_usage = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the BRAMs used
-        if "bram_used" in metrics:
-            brams = metrics["bram_used"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            bram_usage.append(brams)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, bram_usage)
+    return _series(data_dict, "bram_used")
 
 
 def get_bram_utilization(data_dict):
@@ -187,25 +131,13 @@ def get_bram_utilization(data_dict):
     For each queue size, get the BRAM utilization percentage.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
 
     Returns:
         tuple: ([queue sizes], [BRAM utilization percentages])
     """
-    queue_sizes = []
-    bram_util = []
-
-    for queue_size, metrics in data_dict.items():
-        # Extract the BRAM utilization percentage
-        if "bram_util_percent" in metrics:
-            util = metrics["bram_util_percent"]
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            bram_util.append(util)
-
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, bram_util)
+    return _series(data_dict, "bram_util_percent")
 
 
 def compute_performance(data_dict, arch, operation):
@@ -214,64 +146,102 @@ def compute_performance(data_dict, arch, operation):
     and architecture-specific performance factors.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
         arch (str): Architecture name
         operation (str): Operation type ('enqueue', 'dequeue', 'replace')
 
     Returns:
         tuple: ([queue sizes], [performance values])
     """
-    queue_sizes = []
-    performance_values = []
+    return _series(data_dict, f"{operation}_performance", arch, operation)
 
-    # Safety Percaution: convert arch to lowercase for case-insensitive lookup
-    arch_lower = arch.lower()
 
-    for queue_size, metrics in data_dict.items():
-        # Extract the maximum achieved frequency
-        if "max_achieved_frequency" in metrics:
-            max_freq = metrics["max_achieved_frequency"]
-
-            # Calculate performance based on architecture and operation
-            if operation == "enqueue" and arch_lower == "register_tree_enq_enabled":
-                # Special case for register tree enqueue where performance scales with log2(queue_size)
-                perf_factor = 1 / log2(queue_size)
-            elif operation == "enqueue" and arch_lower == "register_tree_pipelined_enq_enabled":
-                # Special case for register tree cycled enqueue where performance scales with log2(queue_size)
-                perf_factor = 1 / (log2(queue_size) + 1)
-            else:
-                # For other architectures/operations, use predefined performance factors
-                perf_factor = PERFORMANCE_FACTORS.get(operation, {}).get(arch_lower, 1)
-
-            performance = max_freq * perf_factor
-
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            performance_values.append(performance)
+def compute_energy_per_operation(data_dict, arch, operation):
+    """
+    For each queue size, compute the energy of one operation from the power reported
+    at the maximum achieved frequency.
 
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, performance_values)
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        arch (str): Architecture name
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
 
+    Returns:
+        tuple: ([queue sizes], [energy in nJ/op])
+    """
+    return _series(data_dict, f"{operation}_energy", arch, operation)
 
-def compute_resource_utilization(data_dict):
-    queue_sizes = []
-    resource_utilization = []
 
-    for queue_size, metrics in data_dict.items():
-        if "max_achieved_frequency" in metrics:
-            # max_freq = metrics["max_achieved_frequency"]
-            lut_utilization = metrics["luts_util_percent"]
-            reg_utilization = metrics["registers_util_percent"]
-            bram_utilization = metrics["bram_util_percent"]
+def compute_performance_per_watt(data_dict, arch, operation):
+    """
+    For each queue size, compute throughput per watt.
 
-            resource = np.max([lut_utilization, reg_utilization, bram_utilization])
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        arch (str): Architecture name
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
 
-            # Add to our lists
-            queue_sizes.append(queue_size)
-            resource_utilization.append(resource)
+    Returns:
+        tuple: ([queue sizes], [MOPS/W])
+    """
+    return _series(data_dict, f"{operation}_performance_per_watt", arch, operation)
 
-    # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, resource_utilization)
+
+def rank_energy_efficiency(data_dicts, operation, arch_list=None):
+    """
+    Rank architectures by throughput per watt at every queue size.
+
+    Queue sizes are matched by their nearest power of two (see nearest_power_of_two).
+    Architectures without the operation or a power figure are left out.
+
+    Args:
+        data_dicts (dict or LazyResults): Maps architecture names to their data dictionaries
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
+        arch_list (list, optional): Architectures to rank, all supporting the operation by default
+
+    Returns:
+        dict: Maps queue sizes to lists of {"arch", "queue_size", "performance", "power",
+            "energy", "performance_per_watt"} dictionaries, best first.
+    """
+    keys = [k for k in (data_dicts if arch_list is None else arch_list) if k in data_dicts and supports(k, operation)]
+    table = compute_metrics({k: data_dicts[k] for k in keys}, operations=(operation,))
+    performance_per_watt = table[f"{operation}_performance_per_watt"]
+
+    rankings = {}
+    for row in np.argsort(-np.nan_to_num(performance_per_watt, nan=-np.inf), kind="stable").tolist():
+        if not performance_per_watt[row] > 0:
+            continue
+        rankings.setdefault(nearest_power_of_two(int(table.queue_sizes[row])), []).append(
+            {
+                "arch": str(table.arch_keys[row]),
+                "queue_size": int(table.queue_sizes[row]),
+                "performance": float(table[f"{operation}_performance"][row]),
+                "power": float(table["power"][row]),
+                "energy": float(table[f"{operation}_energy"][row]),
+                "performance_per_watt": float(performance_per_watt[row]),
+            }
+        )
+    return dict(sorted(rankings.items()))
+
+
+def compute_mix_performance(data_dict, arch, mix):
+    """
+    For each queue size, compute the sustained performance under a mix of operations.
+
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        arch (str): Architecture name
+        mix (dict): Maps operations to relative weights, e.g. {"replace": 6, "enqueue": 3, "dequeue": 1}
+
+    Returns:
+        tuple: ([queue sizes], [sustained MOPS]), empty if the architecture cannot run the mix
+    """
+    return mix_throughput({arch: data_dict}, mix).get(arch, (np.array([], dtype=np.int64), np.array([])))
+
+
+def compute_resource_utilization(data_dict):
+    return _series(data_dict, "resource_utilization")
 
 
 def compute_resource_utilization_efficiency(data_dict, arch, operation):
@@ -280,48 +250,117 @@ def compute_resource_utilization_efficiency(data_dict, arch, operation):
     Lower values indicate better area efficiency.
 
     Args:
-        data_dict (dict): Data returned from parser.process_directory function
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
         arch (str): Architecture name
         operation (str): Operation type ('enqueue', 'dequeue', 'replace')
 
     Returns:
         tuple: ([queue sizes], [area efficiency values])
     """
+    return _series(data_dict, f"{operation}_efficiency", arch, operation)
+
+
+def get_device_utilization(data_dict, device, resource="luts"):
+    """
+    For each queue size, get the percentage of a device's resource used.
+
+    Unlike the rounded Vivado percentages, this is computed from the absolute counts,
+    so results on devices of very different sizes can be compared.
+
+    Args:
+        data_dict (dict or ResultsDataset): Data returned from parser.process_directory function,
+            or a dataset holding a single architecture variant
+        device (str): FPGA device the results were implemented on (key in DEVICE_RESOURCES)
+        resource (str, optional): "luts", "registers" or "bram"
+
+    Returns:
+        tuple: ([queue sizes], [utilization percentages])
+    """
+    data_dict = as_data_dict(data_dict)
+    total = DEVICE_RESOURCES[device][resource]
+    used_field = RESOURCE_USED_FIELDS[resource]
     queue_sizes = []
-    efficiency_values = []
-    
-    # Convert arch to lowercase for case-insensitive lookup
-    arch_lower = arch.lower()
+    utilization = []
 
     for queue_size, metrics in data_dict.items():
-        if "max_achieved_frequency" in metrics:
-            max_freq = metrics["max_achieved_frequency"]
-            lut_utilization = metrics["luts_util_percent"]
-            reg_utilization = metrics["registers_util_percent"]
-            bram_utilization = metrics["bram_util_percent"]
-
-            total_util = np.max([lut_utilization, reg_utilization, bram_utilization])
-
-            # Get performance factor
-            if operation == "enqueue" and arch_lower == "register_tree_enq_enabled":
-                perf_factor = 1 / log2(queue_size)
-            elif operation == "enqueue" and arch_lower == "register_tree_pipelined_enq_enabled":
-                perf_factor = 1 / (log2(queue_size) + 1)  # Assuming pipelined adds one cycle
-            else:
-                # For other architectures/operations, use predefined performance factors
-                perf_factor = PERFORMANCE_FACTORS.get(operation, {}).get(arch_lower, 1)
-
-            # Calculate performance
-            performance = max_freq * perf_factor
-
-            # Calculate resource utilization efficiency (performance/resource)
-            # Higher is better: more performance achieved with less resource
-            efficiency = performance / total_util if performance > 0 else float("inf")
-
-            # Add to our lists
+        if used_field in metrics:
             queue_sizes.append(queue_size)
-            efficiency_values.append(efficiency)
+            utilization.append(100 * metrics[used_field] / total)
 
     # Sort by queue size for better visualization
-    return sort_xy(queue_sizes, efficiency_values)
+    return sort_xy(queue_sizes, utilization)
+
 
+def join_devices(data_by_device, match_power_of_two=True):
+    """
+    Join the results of the same architecture and queue size across devices.
+
+    Only queue sizes implemented on at least two devices are kept. Each joined metrics
+    dictionary keeps its own "queue_size" and gains "luts_device_percent",
+    "registers_device_percent" and "bram_device_percent", normalized against the
+    totals of its own device.
+
+    Args:
+        data_by_device (dict): Maps devices to {arch_key: data_dict} dictionaries
+        match_power_of_two (bool, optional): Match queue sizes by their nearest power of two
+
+    Returns:
+        dict: Maps architecture keys to {queue_size: {device: metrics}}, keyed by the
+            nearest power of two when matching on it.
+    """
+    joined = {}
+    for device, data_dicts in data_by_device.items():
+        totals = DEVICE_RESOURCES[device]
+        for arch_name, data_dict in data_dicts.items():
+            for queue_size, metrics in as_data_dict(data_dict).items():
+                metrics = dict(metrics)
+                for resource, used_field in RESOURCE_USED_FIELDS.items():
+                    if used_field in metrics:
+                        metrics[f"{resource}_device_percent"] = 100 * metrics[used_field] / totals[resource]
+                key = nearest_power_of_two(queue_size) if match_power_of_two else queue_size
+                joined.setdefault(arch_name, {}).setdefault(key, {})[device] = metrics
+
+    return {
+        arch_name: {key: by_size[key] for key in sorted(by_size) if len(by_size[key]) > 1}
+        for arch_name, by_size in joined.items()
+        if any(len(by_device) > 1 for by_device in by_size.values())
+    }
+
+
+def get_with_predictions(data_dict, metric, queue_sizes):
+    """
+    For each requested queue size, get the measured metric, or a prediction from the
+    architecture's scaling law where that size was never synthesized.
+
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        metric (str): Metric of the data dictionaries, e.g. "max_achieved_frequency" or "luts_used"
+        queue_sizes (iterable): Queue sizes to report
+
+    Returns:
+        tuple: ([queue sizes], [values], [lower bounds], [upper bounds], [states]), sorted
+            by queue size, where every state is "measured", "interpolated" (predicted inside
+            the measured range) or "extrapolated"; measured points have their value as both
+            bounds, predictions outside the range of the law are NaN.
+
+    Raises:
+        ValueError: If a prediction is needed but fewer than two queue sizes were measured.
+    """
+    data_dict = as_data_dict(data_dict)
+    queue_sizes = np.unique(np.asarray(list(queue_sizes), dtype=np.int64))
+    measured = np.array([q in data_dict and metric in data_dict[q] for q in queue_sizes.tolist()], dtype=bool)
+
+    values = np.array([data_dict[q][metric] if m else np.nan for q, m in zip(queue_sizes.tolist(), measured)])
+    lower = values.copy()
+    upper = values.copy()
+    states = np.full(len(queue_sizes), "measured", dtype=object)
+    if not measured.all():
+        fit = fit_metric(data_dict, metric)
+        estimates, low, high = fit.predict(queue_sizes[~measured])
+        values[~measured] = estimates
+        lower[~measured] = low
+        upper[~measured] = high
+        states[~measured] = np.where(fit.extrapolates(queue_sizes[~measured]), "extrapolated", "interpolated")
+
+    return queue_sizes, values, lower, upper, states
@@ -0,0 +1,590 @@
+"""
+Columnar dataset of Vivado analysis results backed by NumPy structured arrays.
+
+Every row is one frequency point of one sweep, identified by
+(architecture, variant, device, data_width, queue_size, target_frequency).
+"""
+
+import csv
+import itertools
+import os
+import re
+from collections.abc import Mapping
+import numpy as np
+from numpy.lib import recfunctions
+import parsers
+from config import DEFAULT_DEVICE
+
+# Identifying columns of a row, in order
+KEY_FIELDS = ("architecture", "variant", "device", "data_width", "queue_size", "target_frequency")
+
+# Columns identifying one sweep, i.e. one log file
+SWEEP_FIELDS = KEY_FIELDS[:-1]
+
+DATASET_DTYPE = np.dtype(
+    [
+        ("architecture", "U32"),
+        ("variant", "U12"),
+        ("device", "U12"),
+        ("data_width", "i4"),
+        ("queue_size", "i8"),
+    ]
+    # Missing values (e.g. unreported power) are stored as NaN
+    + [(field, "f8") for field in parsers.FREQUENCY_RECORD_FIELDS]
+)
+
+# Variants stored under enqueue_0/enqueue_1 result subdirectories
+ENQUEUE_VARIANTS = {"enqueue_0": "enq_disabled", "enqueue_1": "enq_enabled"}
+
+# Architecture keys that differ from "<architecture>_<variant>", None drops the variant
+ARCH_KEY_OVERRIDES = {
+    # Systolic array always enables enqueue
+    ("systolic_array", "enq_enabled"): "systolic_array",
+    ("systolic_array", "enq_disabled"): None,
+}
+
+# Metrics that are integer counts in parsers.parse_metrics output
+_COUNT_FIELDS = ("luts_used", "registers_used")
+
+_RESULTS_DIR_RE = re.compile(r"^vivado_analysis_results_(\d+)bit_(\w+)$")
+
+
+def arch_key(architecture, variant):
+    """
+    Get the key used for an architecture variant throughout config and plotting.
+
+    Args:
+        architecture (str): Architecture directory name (e.g. "register_tree")
+        variant (str): "enq_disabled", "enq_enabled" or "" for architectures without variants
+
+    Returns:
+        str or None: The architecture key (e.g. "register_tree_enq_enabled"), or None if
+            the variant is not used.
+    """
+    if (architecture, variant) in ARCH_KEY_OVERRIDES:
+        return ARCH_KEY_OVERRIDES[(architecture, variant)]
+    return f"{architecture}_{variant}" if variant else architecture
+
+
+def find_results_dirs(base_dir, devices=None, architectures=None):
+    """
+    Find the result directories under a hwpq tree.
+
+    Args:
+        base_dir (str): Directory containing one subdirectory per architecture
+        devices (iterable, optional): Only include these FPGA devices (e.g. "xcau25p")
+        architectures (iterable, optional): Only include these architecture directories
+
+    Returns:
+        list[tuple]: (architecture, device, data_width, log_dir) for every results directory.
+    """
+    results_dirs = []
+    for architecture in sorted(os.listdir(base_dir)):
+        arch_path = os.path.join(base_dir, architecture)
+        if not os.path.isdir(arch_path):
+            continue
+        if architectures is not None and architecture not in architectures:
+            continue
+
+        for results_dir in sorted(os.listdir(arch_path)):
+            match = _RESULTS_DIR_RE.match(results_dir)
+            log_dir = os.path.join(arch_path, results_dir)
+            if not match or not os.path.isdir(log_dir):
+                continue
+
+            data_width, device = int(match.group(1)), match.group(2)
+            if devices is not None and device not in devices:
+                continue
+            results_dirs.append((architecture, device, data_width, log_dir))
+
+    return results_dirs
+
+
+def sweep_files(results_dirs):
+    """
+    List the log files of result directories with the sweep they belong to.
+
+    Args:
+        results_dirs (list[tuple]): Entries returned by find_results_dirs
+
+    Returns:
+        list[tuple]: ((architecture, variant, device, data_width, queue_size), file_path) pairs.
+    """
+    files = []
+    for architecture, device, data_width, log_dir in results_dirs:
+        for file_dir in parsers.directory_layout(log_dir):
+            variant = ENQUEUE_VARIANTS.get(os.path.basename(file_dir), "") if file_dir != log_dir else ""
+            for file_path in parsers.list_log_files(file_dir):
+                sweep = (architecture, variant, device, data_width, parsers.queue_size_from_path(file_path))
+                files.append((sweep, file_path))
+    return files
+
+
+# Source of ResultsDataset versions
+_DATASET_VERSIONS = itertools.count()
+
+
+class ResultsDataset:
+    """
+    Frequency points of many Vivado sweeps stored as one NumPy structured array.
+
+    Args:
+        rows (numpy.ndarray): Structured array with dtype DATASET_DTYPE
+    """
+
+    def __init__(self, rows=None):
+        self.rows = rows if rows is not None else np.empty(0, dtype=DATASET_DTYPE)
+        # Identifies the data for caches of derived metrics; rows are never modified in place
+        self.version = next(_DATASET_VERSIONS)
+
+    @classmethod
+    def from_records(cls, sweep_records):
+        """
+        Build a dataset from parsed frequency records.
+
+        Args:
+            sweep_records (iterable): (sweep, records) pairs where sweep is
+                (architecture, variant, device, data_width, queue_size) and records
+                come from parsers.parse_frequency_records
+
+        Returns:
+            ResultsDataset: The dataset, rows in the order given.
+        """
+        nan = float("nan")
+        rows = [
+            sweep + tuple(nan if record[field] is None else record[field] for field in parsers.FREQUENCY_RECORD_FIELDS)
+            for sweep, records in sweep_records
+            for record in records
+        ]
+        return cls(np.array(rows, dtype=DATASET_DTYPE))
+
+    @classmethod
+    def from_results_tree(
+        cls, base_dir, devices=None, architectures=None, workers=1, chunksize=8, cache=None, backend="python"
+    ):
+        """
+        Parse every result directory under a hwpq tree.
+
+        Args:
+            base_dir (str): Directory containing one subdirectory per architecture
+            devices (iterable, optional): Only include these FPGA devices
+            architectures (iterable, optional): Only include these architecture directories
+            workers (int, optional): Worker processes used to parse log files, None for all cores
+            chunksize (int, optional): Number of log files handed to a worker at a time
+            cache (cache.ParseCache, optional): Persistent cache of parsed log files
+            backend (str, optional): Parser used for each file, one of parsers.PARSER_BACKENDS
+
+        Returns:
+            ResultsDataset: All frequency points found.
+        """
+        files = sweep_files(find_results_dirs(base_dir, devices, architectures))
+        records_by_path = parsers.load_records(
+            [file_path for _, file_path in files], workers=workers, chunksize=chunksize, cache=cache, backend=backend
+        )
+        return cls.from_records((sweep, records_by_path[file_path]) for sweep, file_path in files)
+
+    @classmethod
+    def concatenate(cls, datasets):
+        """Join several datasets into one."""
+        return cls(np.concatenate([dataset.rows for dataset in datasets]))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open a dataset written by save.
+
+        Args:
+            path (str): Path to the .npy file
+            mmap (bool, optional): Memory-map the file read-only instead of reading it
+
+        Returns:
+            ResultsDataset: The stored dataset.
+        """
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+    def save(self, path):
+        """
+        Write the dataset to a compact binary .npy file.
+
+        Args:
+            path (str): Destination path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.save(path, np.ascontiguousarray(self.rows), allow_pickle=False)
+
+    def save_csv(self, path):
+        """
+        Write the dataset to a CSV file with a header row, missing values left empty.
+
+        Args:
+            path (str): Destination path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.rows.dtype.names)
+            for row in self.rows.tolist():
+                writer.writerow("" if value != value else value for value in row)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, field):
+        if field == "arch_key":
+            return self.arch_keys()
+        return self.rows[field]
+
+    def __repr__(self):
+        return f"ResultsDataset({len(self)} rows)"
+
+    def arch_keys(self):
+        """
+        Get the architecture key of every row.
+
+        Returns:
+            numpy.ndarray: Architecture keys, "" for variants that are not used.
+        """
+        pairs, inverse = self._group_index(("architecture", "variant"))
+        keys = np.array([arch_key(str(a), str(v)) or "" for a, v in pairs.tolist()] or [""])
+        return keys[inverse]
+
+    def where(self, mask):
+        """Get the rows selected by a boolean mask."""
+        return ResultsDataset(self.rows[mask])
+
+    def filter(self, **criteria):
+        """
+        Select rows by column values.
+
+        Each keyword names a column (or "arch_key") and gives either a single value,
+        a collection of accepted values, or a callable mapping the column to a mask.
+
+        Returns:
+            ResultsDataset: The matching rows.
+        """
+        mask = np.ones(len(self.rows), dtype=bool)
+        for field, value in criteria.items():
+            column = self[field]
+            if callable(value):
+                mask &= value(column)
+            elif isinstance(value, (list, tuple, set, frozenset, np.ndarray)):
+                mask &= np.isin(column, list(value))
+            else:
+                mask &= column == value
+        return self.where(mask)
+
+    def unique(self, field):
+        """Get the sorted distinct values of a column."""
+        return np.unique(self[field])
+
+    def _group_index(self, fields):
+        columns = recfunctions.repack_fields(self.rows[list(fields)])
+        keys, inverse = np.unique(columns, return_inverse=True)
+        return keys, inverse.reshape(-1)
+
+    def group_by(self, *fields):
+        """
+        Split the dataset by the distinct values of some columns.
+
+        Args:
+            *fields (str): Columns to group by
+
+        Yields:
+            tuple: (key, ResultsDataset) where key is a tuple of column values.
+        """
+        if not len(self.rows):
+            return
+        keys, inverse = self._group_index(fields)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+        for key, index in zip(keys.tolist(), np.split(order, bounds)):
+            yield key, ResultsDataset(self.rows[index])
+
+    def aggregate(self, fields, column, reducer="max"):
+        """
+        Reduce a column over groups in one vectorized pass.
+
+        Args:
+            fields (tuple): Columns to group by
+            column (str): Column to reduce
+            reducer (str, optional): "max", "min", "sum", "mean" or "count"
+
+        Returns:
+            tuple: (keys, values) where keys is a structured array of the group columns.
+        """
+        keys, inverse = self._group_index(fields)
+        values = self.rows[column].astype(float)
+
+        if reducer == "count":
+            return keys, np.bincount(inverse, minlength=len(keys))
+        if reducer in ("sum", "mean"):
+            totals = np.bincount(inverse, weights=values, minlength=len(keys))
+            if reducer == "sum":
+                return keys, totals
+            return keys, totals / np.bincount(inverse, minlength=len(keys))
+
+        ufunc = {"max": np.fmax, "min": np.fmin}[reducer]
+        result = np.full(len(keys), np.nan)
+        ufunc.at(result, inverse, values)
+        return keys, result
+
+    def max_frequency_points(self):
+        """
+        Keep only the point with the maximum achieved frequency of every sweep.
+
+        Ties keep the earliest row, matching parsers.parse_metrics.
+
+        Returns:
+            ResultsDataset: One row per (architecture, variant, device, data_width, queue_size).
+        """
+        if not len(self.rows):
+            return ResultsDataset(self.rows)
+        _, inverse = self._group_index(SWEEP_FIELDS)
+        order = np.lexsort((np.arange(len(self.rows)), -self.rows["achieved_frequency"], inverse))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = inverse[order][1:] != inverse[order][:-1]
+        return ResultsDataset(self.rows[order[first]])
+
+    def to_data_dict(self):
+        """
+        Convert a single architecture variant to the {queue_size: metrics} layout of
+        parsers.process_directory.
+
+        Returns:
+            dict: Maps queue sizes to metrics dictionaries.
+
+        Raises:
+            ValueError: If the dataset holds more than one sweep per queue size.
+        """
+        points = self.max_frequency_points().rows
+        if len(np.unique(points["queue_size"])) != len(points):
+            raise ValueError("Dataset holds several architectures, devices or widths; filter it first")
+
+        data_dict = {}
+        for row in points:
+            queue_size = int(row["queue_size"])
+            metrics = {"queue_size": queue_size, "max_achieved_frequency": float(row["achieved_frequency"])}
+            for key in parsers.METRIC_FIELDS:
+                if not np.isnan(row[key]):
+                    metrics[key] = int(row[key]) if key in _COUNT_FIELDS else float(row[key])
+            data_dict[queue_size] = metrics
+        return dict(sorted(data_dict.items()))
+
+    def to_data_dicts(self):
+        """
+        Convert to the {arch_key: {queue_size: metrics}} layout used by the plotting functions.
+
+        Returns:
+            dict: Maps architecture keys to data dictionaries, in architecture order.
+
+        Raises:
+            ValueError: If the dataset holds more than one device or data width.
+        """
+        if len(self._group_index(("device", "data_width"))[0]) > 1:
+            raise ValueError("Dataset holds several devices or data widths; filter it first")
+
+        data_dicts = {}
+        for (architecture, variant), subset in self.group_by("architecture", "variant"):
+            key = arch_key(architecture, variant)
+            if key is not None:
+                data_dicts[key] = subset.to_data_dict()
+        return data_dicts
+
+
+class LazyResults(Mapping):
+    """
+    Read-only mapping of architecture keys to data dictionaries that parses an
+    architecture variant only when it is first accessed, then memoizes it.
+
+    Only directory listings are read up front, so iterating over the keys or
+    checking membership costs no parsing.
+
+    Args:
+        base_dir (str): Directory containing one subdirectory per architecture
+        device (str, optional): FPGA device to load
+        data_width (int, optional): Data width to load, required if the device has several
+        architectures (iterable, optional): Only include these architecture directories
+        workers (int, optional): Worker processes used to parse log files, None for all cores
+        chunksize (int, optional): Number of log files handed to a worker at a time
+        cache (cache.ParseCache, optional): Persistent cache of parsed log files
+        backend (str, optional): Parser used for each file, one of parsers.PARSER_BACKENDS
+    """
+
+    def __init__(
+        self,
+        base_dir,
+        device=DEFAULT_DEVICE,
+        data_width=None,
+        architectures=None,
+        workers=1,
+        chunksize=8,
+        cache=None,
+        backend="python",
+    ):
+        self.device = device
+        self._load_options = {"workers": workers, "chunksize": chunksize, "cache": cache, "backend": backend}
+        self._sources = {}
+        self._loaded = {}
+        self._data_dicts = {}
+
+        results_dirs = [
+            entry
+            for entry in find_results_dirs(base_dir, [device], architectures)
+            if data_width is None or entry[2] == data_width
+        ]
+        for sweep, file_path in sweep_files(results_dirs):
+            key = arch_key(sweep[0], sweep[1])
+            if key is None:
+                continue
+            sources = self._sources.setdefault(key, [])
+            if sources and sources[0][0][3] != sweep[3]:
+                raise ValueError(f"{key} has several data widths on {device}; pass data_width")
+            sources.append((sweep, file_path))
+
+    def __getitem__(self, key):
+        if key not in self._data_dicts:
+            self.prefetch([key])
+            self._data_dicts[key] = self._loaded[key].to_data_dict()
+        return self._data_dicts[key]
+
+    def __iter__(self):
+        return iter(self._sources)
+
+    def __len__(self):
+        return len(self._sources)
+
+    def __contains__(self, key):
+        return key in self._sources
+
+    @classmethod
+    def by_device(cls, base_dir, devices=None, architectures=None, **options):
+        """
+        Create one lazy mapping per FPGA device found under a hwpq tree.
+
+        Args:
+            base_dir (str): Directory containing one subdirectory per architecture
+            devices (iterable, optional): Only include these devices, all found by default
+            architectures (iterable, optional): Only include these architecture directories
+            **options: data_width, workers, chunksize, cache and backend, as for LazyResults
+
+        Returns:
+            dict: Maps devices to LazyResults, in device order.
+        """
+        found = sorted({device for _, device, _, _ in find_results_dirs(base_dir, devices, architectures)})
+        return {device: cls(base_dir, device=device, architectures=architectures, **options) for device in found}
+
+    def prefetch(self, keys):
+        """
+        Parse several architecture variants at once, sharing one pool of workers.
+
+        Args:
+            keys (iterable): Architecture keys to load
+
+        Raises:
+            KeyError: If a key has no results.
+        """
+        prefetch_together([(self, keys)])
+
+    def _missing(self, keys):
+        missing = [key for key in dict.fromkeys(keys) if key not in self._loaded]
+        for key in missing:
+            if key not in self._sources:
+                raise KeyError(key)
+        return missing
+
+    def _store(self, keys, records_by_path):
+        for key in keys:
+            self._loaded[key] = ResultsDataset.from_records(
+                (sweep, records_by_path[file_path]) for sweep, file_path in self._sources[key]
+            )
+
+    def loaded_keys(self):
+        """Get the architecture keys parsed so far."""
+        return [key for key in self._sources if key in self._loaded]
+
+    def subset(self, keys):
+        """
+        Restrict the mapping to some architecture keys, sharing what was already parsed.
+
+        Args:
+            keys (iterable): Architecture keys to keep
+
+        Returns:
+            LazyResults: A view over the given keys that are available.
+        """
+        view = LazyResults.__new__(LazyResults)
+        view.device = self.device
+        view._load_options = self._load_options
+        view._sources = {key: self._sources[key] for key in keys if key in self._sources}
+        view._loaded = self._loaded
+        view._data_dicts = self._data_dicts
+        return view
+
+    def dataset(self, keys=None):
+        """
+        Get the frequency points of some architecture variants as one dataset.
+
+        Args:
+            keys (iterable, optional): Architecture keys to include, all by default
+
+        Returns:
+            ResultsDataset: The rows of the requested variants.
+        """
+        keys = list(self._sources) if keys is None else [key for key in keys if key in self._sources]
+        self.prefetch(keys)
+        return ResultsDataset.concatenate([self._loaded[key] for key in keys] or [ResultsDataset()])
+
+
+def prefetch_together(requests):
+    """
+    Parse the architecture variants needed from several LazyResults in one pass,
+    e.g. one per device, so all their log files share one pool of workers.
+
+    The workers, chunksize, cache and backend of the first mapping are used.
+
+    Args:
+        requests (iterable): (LazyResults, keys) pairs
+
+    Raises:
+        KeyError: If a key has no results.
+    """
+    requests = [(results, results._missing(keys)) for results, keys in requests]
+    file_paths = [
+        file_path for results, missing in requests for key in missing for _, file_path in results._sources[key]
+    ]
+    if not file_paths:
+        return
+
+    records_by_path = parsers.load_records(file_paths, **requests[0][0]._load_options)
+    for results, missing in requests:
+        results._store(missing, records_by_path)
+
+
+def as_data_dict(data):
+    """
+    Accept either a {queue_size: metrics} dictionary or a single-architecture dataset.
+
+    Args:
+        data (dict or ResultsDataset): Data for one architecture
+
+    Returns:
+        dict: Maps queue sizes to metrics dictionaries.
+    """
+    return data.to_data_dict() if isinstance(data, ResultsDataset) else data
+
+
+def as_data_dicts(data):
+    """
+    Accept either a {arch_key: data_dict} dictionary or a dataset of several architectures.
+
+    Args:
+        data (dict or ResultsDataset): Data for several architectures
+
+    Returns:
+        dict: Maps architecture keys to data dictionaries.
+    """
+    return data.to_data_dicts() if isinstance(data, ResultsDataset) else data
@@ -0,0 +1,188 @@
+"""
+Robust achieved-frequency statistics: a "sustainable Fmax" per sweep with bootstrap
+confidence intervals, instead of the single best target of parsers.parse_metrics.
+
+Only the plateau of a sweep is sampled: the targets the design could not meet, where
+the achieved frequency is at or below the target. Below that, Vivado stops optimizing
+once timing is met and the achieved frequency rises with the target, which says nothing
+about the design's limit. Those points, and repeated runs when a dataset holds several,
+are the samples. The sustainable Fmax is an upper quantile of them, so one lucky
+place-and-route result does not set it.
+"""
+
+import argparse
+import numpy as np
+from dataset import SWEEP_FIELDS, DATASET_DTYPE, LazyResults, ResultsDataset
+
+# Quantile of the achieved frequencies taken as sustainable
+SUSTAINABLE_QUANTILE = 0.75
+
+# Bootstrap resamples drawn per sweep
+BOOTSTRAP_SAMPLES = 1000
+
+FMAX_STATS_DTYPE = np.dtype(
+    [(field, DATASET_DTYPE[field]) for field in SWEEP_FIELDS]
+    + [
+        ("samples", "i8"),
+        ("peak_frequency", "f8"),
+        ("sustainable_frequency", "f8"),
+        ("sustainable_lower", "f8"),
+        ("sustainable_upper", "f8"),
+    ]
+)
+
+
+def _sorted_quantile(values, counts, quantile):
+    # Linear-interpolated quantile of rows sorted ascending with NaN padding after the first counts values
+    position = quantile * (counts - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, counts - 1)
+    low_values = np.take_along_axis(values, low[..., None], axis=-1)[..., 0]
+    high_values = np.take_along_axis(values, high[..., None], axis=-1)[..., 0]
+    return low_values + (position - low) * (high_values - low_values)
+
+
+def plateau_mask(rows, inverse, groups):
+    """
+    Select the plateau points of every sweep.
+
+    A sweep meeting timing at every target has no plateau; its highest target, the
+    closest to one, is kept instead.
+
+    Args:
+        rows (numpy.ndarray): Frequency points with dtype DATASET_DTYPE
+        inverse (numpy.ndarray): Sweep index of every row
+        groups (int): Number of sweeps
+
+    Returns:
+        numpy.ndarray: Boolean mask of the rows sampled.
+    """
+    plateau = rows["achieved_frequency"] <= rows["target_frequency"]
+    has_plateau = np.bincount(inverse, weights=plateau, minlength=groups) > 0
+    top_target = np.full(groups, -np.inf)
+    np.maximum.at(top_target, inverse, rows["target_frequency"])
+    return plateau | (~has_plateau[inverse] & (rows["target_frequency"] == top_target[inverse]))
+
+
+def sustainable_fmax(
+    dataset, quantile=SUSTAINABLE_QUANTILE, samples=BOOTSTRAP_SAMPLES, confidence=0.95, seed=0
+):
+    """
+    Compute the sustainable Fmax of every sweep with a bootstrap confidence interval.
+
+    Only plateau points are sampled (see plateau_mask). All sweeps are resampled at once: their samples are padded into one matrix and
+    every bootstrap draw is one vectorized gather and sort.
+
+    Args:
+        dataset (ResultsDataset): Frequency points, possibly of repeated runs
+        quantile (float, optional): Quantile of the achieved frequencies taken as sustainable
+        samples (int, optional): Bootstrap resamples
+        confidence (float, optional): Coverage of the interval
+        seed (int, optional): Seed of the random generator, so plots are reproducible
+
+    Returns:
+        numpy.ndarray: One row per sweep with dtype FMAX_STATS_DTYPE, sorted by sweep;
+            "samples" counts the plateau points and "peak_frequency" is the best of all points.
+    """
+    rows = dataset.rows[~np.isnan(dataset.rows["achieved_frequency"])]
+    if not len(rows):
+        return np.empty(0, dtype=FMAX_STATS_DTYPE)
+    keys, inverse = ResultsDataset(rows)._group_index(SWEEP_FIELDS)
+    peaks = np.full(len(keys), -np.inf)
+    np.maximum.at(peaks, inverse, rows["achieved_frequency"])
+
+    keep = plateau_mask(rows, inverse, len(keys))
+    rows, inverse = rows[keep], inverse[keep]
+    counts = np.bincount(inverse, minlength=len(keys))
+
+    # (sweeps, samples) matrix, NaN after each sweep's own samples
+    order = np.argsort(inverse, kind="stable")
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    columns = np.arange(len(order)) - starts[inverse[order]]
+    padded = np.full((len(keys), counts.max()), np.nan)
+    padded[inverse[order], columns] = rows["achieved_frequency"][order]
+    padded.sort(axis=1)
+
+    rng = np.random.default_rng(seed)
+    draws = (rng.random((samples,) + padded.shape) * counts[:, None]).astype(np.int64)
+    resampled = padded[np.arange(len(keys))[None, :, None], draws]
+    resampled[:, np.arange(padded.shape[1])[None, :] >= counts[:, None]] = np.nan
+    resampled.sort(axis=2)
+    estimates = _sorted_quantile(resampled, np.broadcast_to(counts, (samples, len(keys))), quantile)
+
+    stats = np.empty(len(keys), dtype=FMAX_STATS_DTYPE)
+    for field in SWEEP_FIELDS:
+        stats[field] = keys[field]
+    stats["samples"] = counts
+    stats["peak_frequency"] = peaks
+    stats["sustainable_frequency"] = _sorted_quantile(padded, counts, quantile)
+    stats["sustainable_lower"], stats["sustainable_upper"] = np.quantile(
+        estimates, [(1 - confidence) / 2, (1 + confidence) / 2], axis=0
+    )
+    return stats
+
+
+def frequency_bands(data, arch_name, **options):
+    """
+    Get the sustainable Fmax of one architecture with its confidence interval.
+
+    Args:
+        data (LazyResults or ResultsDataset): Frequency points of several architectures;
+            plain data dictionaries only hold the peak, so they give no bands
+        arch_name (str): Architecture key
+        **options: quantile, samples, confidence and seed, as for sustainable_fmax
+
+    Returns:
+        tuple or None: ([queue sizes], [sustainable Fmax], [lower bounds], [upper bounds])
+            sorted by queue size, or None without frequency points.
+    """
+    if isinstance(data, LazyResults):
+        if arch_name not in data:
+            return None
+        dataset = data.dataset([arch_name])
+    elif isinstance(data, ResultsDataset):
+        dataset = data.filter(arch_key=arch_name)
+    else:
+        return None
+
+    stats = sustainable_fmax(dataset, **options)
+    if not len(stats) or len(np.unique(stats["queue_size"])) != len(stats):
+        # Several devices or data widths would overlap; leave those unbanded
+        return None
+    stats = stats[np.argsort(stats["queue_size"])]
+    return (
+        stats["queue_size"],
+        stats["sustainable_frequency"],
+        stats["sustainable_lower"],
+        stats["sustainable_upper"],
+    )
+
+
+def print_report(dataset, **options):
+    """
+    Print the peak and sustainable Fmax of every sweep.
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+        **options: quantile, samples, confidence and seed, as for sustainable_fmax
+    """
+    print(f"{'architecture':24s} {'variant':12s} {'device':8s} {'N':>6s} {'n':>3s} {'peak':>8s} {'sustain':>8s}  interval")
+    for row in sustainable_fmax(dataset, **options):
+        print(
+            f"{row['architecture']:24s} {row['variant']:12s} {row['device']:8s} {row['queue_size']:6d} "
+            f"{row['samples']:3d} {row['peak_frequency']:8.1f} {row['sustainable_frequency']:8.1f}  "
+            f"[{row['sustainable_lower']:.1f}, {row['sustainable_upper']:.1f}]"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the sustainable Fmax of every sweep.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--device", action="append", help="Only include this device (repeatable)")
+    parser.add_argument("--arch", action="append", help="Only include this architecture (repeatable)")
+    parser.add_argument("--quantile", type=float, default=SUSTAINABLE_QUANTILE, help="Quantile taken as sustainable")
+    parser.add_argument("--samples", type=int, default=BOOTSTRAP_SAMPLES, help="Bootstrap resamples")
+    args = parser.parse_args()
+
+    dataset = ResultsDataset.from_results_tree(args.base_dir, devices=args.device, architectures=args.arch)
+    print_report(dataset, quantile=args.quantile, samples=args.samples)
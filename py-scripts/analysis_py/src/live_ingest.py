@@ -0,0 +1,248 @@
+"""
+Incremental ingestion of Vivado analysis logs that are still being written by a sweep.
+"""
+
+import argparse
+import os
+import time
+
+import parsers
+from dataset import ResultsDataset, arch_key, find_results_dirs, sweep_files
+
+# Line written by synth_design_param_sweep_parallel.tcl when it stops raising the frequency early
+FINISHED_MARKER = "WNS exceeded"
+
+# Last entry of clock_freq_values in synth_design_param_sweep_parallel.tcl, a sweep meeting
+# timing up to it ends without the marker above
+FINAL_TARGET_FREQUENCY = 800.0
+
+
+class _TailedFile:
+    """State kept for one followed log file."""
+
+    def __init__(self, sweep):
+        self.sweep = sweep
+        self.reset()
+
+    def reset(self, inode=None):
+        self.inode = inode
+        self.offset = 0
+        self.builder = parsers.FrequencyRecordBuilder()
+        self.records = []
+        self.best = None
+        self.finished = False
+
+
+class LogTailer:
+    """
+    Follows result files under a hwpq tree and parses only the frequency blocks
+    appended since the last poll.
+
+    Args:
+        base_dir (str, optional): Directory containing one subdirectory per architecture;
+            new result files under it are picked up on every poll
+        devices (iterable, optional): Only follow these FPGA devices
+        architectures (iterable, optional): Only follow these architecture directories
+        cache (cache.ParseCache, optional): Persistent cache updated with the records read
+    """
+
+    def __init__(self, base_dir=None, devices=None, architectures=None, cache=None):
+        self.base_dir = base_dir
+        self.devices = devices
+        self.architectures = architectures
+        self.cache = cache
+        self.dataset = ResultsDataset()
+        self._files = {}
+
+    def add_file(self, file_path, sweep):
+        """
+        Follow one log file.
+
+        Args:
+            file_path (str): Path to the log file, which does not need to exist yet
+            sweep (tuple): (architecture, variant, device, data_width, queue_size) of the file
+        """
+        if file_path not in self._files:
+            self._files[file_path] = _TailedFile(sweep)
+
+    def discover(self):
+        """Start following result files that appeared under base_dir."""
+        if self.base_dir is None:
+            return
+        results_dirs = find_results_dirs(self.base_dir, self.devices, self.architectures)
+        for sweep, file_path in sweep_files(results_dirs):
+            self.add_file(file_path, sweep)
+
+    def poll(self):
+        """
+        Read everything appended to the followed files since the last poll.
+
+        Returns:
+            dict: Maps file paths to the list of new frequency records found in them.
+        """
+        self.discover()
+
+        new_records = {}
+        rewritten = False
+        for file_path, tailed in self._files.items():
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+
+            # The sweep re-creates the file when a configuration is run again
+            if stat.st_ino != tailed.inode or stat.st_size < tailed.offset:
+                rewritten = rewritten or bool(tailed.records)
+                tailed.reset(stat.st_ino)
+
+            if stat.st_size == tailed.offset:
+                continue
+
+            records = self._read_appended(file_path, tailed)
+            if records:
+                new_records[file_path] = records
+                # Only cache once no partial line is pending, so the entry equals a full parse
+                if self.cache is not None and tailed.offset >= stat.st_size:
+                    self.cache.put(file_path, tailed.records, stat)
+
+        if rewritten:
+            self.dataset = ResultsDataset.from_records(
+                (tailed.sweep, tailed.records) for tailed in self._files.values()
+            )
+        elif new_records:
+            appended = ResultsDataset.from_records(
+                (self._files[file_path].sweep, records) for file_path, records in new_records.items()
+            )
+            self.dataset = ResultsDataset.concatenate([self.dataset, appended])
+
+        return new_records
+
+    def _read_appended(self, file_path, tailed):
+        with open(file_path, "rb") as f:
+            f.seek(tailed.offset)
+            data = f.read()
+
+        # Leave a trailing partial line for the next poll
+        end = data.rfind(b"\n") + 1
+        tailed.offset += end
+
+        records = []
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            if line.startswith(FINISHED_MARKER):
+                tailed.finished = True
+            record = tailed.builder.feed(line)
+            if record is None:
+                continue
+
+            records.append(record)
+            tailed.records.append(record)
+            if record["target_frequency"] >= FINAL_TARGET_FREQUENCY:
+                tailed.finished = True
+            # Keep the max-frequency point up to date without rescanning earlier records
+            if tailed.best is None or record["achieved_frequency"] > tailed.best["achieved_frequency"]:
+                tailed.best = record
+
+        return records
+
+    def is_finished(self, file_path):
+        """Whether the sweep writing a file stopped early or reached the last target frequency."""
+        return file_path in self._files and self._files[file_path].finished
+
+    def mark_finished(self, file_path):
+        """
+        Mark a followed file finished, e.g. once the Vivado job writing it exited.
+
+        Args:
+            file_path (str): Path to a followed log file
+        """
+        self._files[file_path].finished = True
+
+    def progress(self):
+        """
+        Summarize every followed file.
+
+        Returns:
+            list[dict]: One entry per file with its sweep, number of frequency points,
+                current maximum achieved frequency and whether it finished.
+        """
+        return [
+            {
+                "file_path": file_path,
+                "sweep": tailed.sweep,
+                "points": len(tailed.records),
+                "max_achieved_frequency": tailed.best["achieved_frequency"] if tailed.best else None,
+                "finished": tailed.finished,
+            }
+            for file_path, tailed in self._files.items()
+        ]
+
+    def data_dicts(self, device=None, data_width=None):
+        """
+        Get the partial results in the {arch_key: {queue_size: metrics}} layout.
+
+        Args:
+            device (str, optional): Only include this device
+            data_width (int, optional): Only include this data width
+
+        Returns:
+            dict: Maps architecture keys to data dictionaries of the points seen so far.
+        """
+        data_dicts = {}
+        for tailed in self._files.values():
+            architecture, variant, sweep_device, sweep_width, queue_size = tailed.sweep
+            key = arch_key(architecture, variant)
+            if tailed.best is None or key is None:
+                continue
+            if device is not None and sweep_device != device:
+                continue
+            if data_width is not None and sweep_width != data_width:
+                continue
+            data_dicts.setdefault(key, {})[queue_size] = parsers.metrics_from_records([tailed.best], queue_size)
+
+        return {key: dict(sorted(data_dict.items())) for key, data_dict in sorted(data_dicts.items())}
+
+    def watch(self, interval=5.0, callback=None, until_finished=False):
+        """
+        Poll repeatedly until interrupted.
+
+        Args:
+            interval (float, optional): Seconds between polls
+            callback (callable, optional): Called with (tailer, new_records) after a poll found data
+            until_finished (bool, optional): Return once every followed file is finished (see is_finished)
+        """
+        while True:
+            new_records = self.poll()
+            if new_records and callback is not None:
+                callback(self, new_records)
+            if until_finished and self._files and all(tailed.finished for tailed in self._files.values()):
+                return
+            time.sleep(interval)
+
+
+def _print_progress(tailer, new_records):
+    for entry in tailer.progress():
+        if entry["file_path"] not in new_records:
+            continue
+        architecture, variant, device, data_width, queue_size = entry["sweep"]
+        name = arch_key(architecture, variant) or f"{architecture}_{variant}"
+        state = "finished" if entry["finished"] else "running"
+        print(
+            f"{name:40s} {device:8s} {data_width:3d}bit N={queue_size:<7d} "
+            f"points={entry['points']:<3d} Fmax={entry['max_achieved_frequency']:.3f} MHz ({state})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follow a running parameter sweep.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--device", action="append", help="Only follow this device (repeatable)")
+    parser.add_argument("--arch", action="append", help="Only follow this architecture (repeatable)")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls")
+    args = parser.parse_args()
+
+    try:
+        LogTailer(args.base_dir, devices=args.device, architectures=args.arch).watch(
+            args.interval, callback=_print_progress
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,292 @@
+"""
+Vectorized metrics engine: computes every metric of every architecture and operation
+in one pass over aligned NumPy arrays.
+"""
+
+from collections import OrderedDict
+from math import log2
+import numpy as np
+from config import METRICS_CACHE_SIZE, PERFORMANCE_FACTORS
+from dataset import ResultsDataset, as_data_dict
+import throughput
+
+# Operations every architecture is evaluated on
+OPERATIONS = ("enqueue", "dequeue", "replace")
+
+# Metrics read from the data dictionaries, NaN where missing
+BASE_METRICS = (
+    "max_achieved_frequency",
+    "power",
+    "luts_used",
+    "luts_util_percent",
+    "registers_used",
+    "registers_util_percent",
+    "bram_used",
+    "bram_util_percent",
+)
+
+
+class MetricsTable:
+    """
+    Metrics of several architectures as aligned arrays with one entry per
+    (architecture, queue size), grouped by architecture and sorted by queue size.
+
+    Besides BASE_METRICS, the columns hold "resource_utilization" (the largest of the
+    LUT, register and BRAM percentages) and, for every operation computed,
+    "<operation>_performance" (MOPS), "<operation>_efficiency", "<operation>_energy"
+    (nJ per operation) and "<operation>_performance_per_watt" (MOPS/W).
+
+    Args:
+        arch_keys (numpy.ndarray): Architecture of every entry
+        queue_sizes (numpy.ndarray): Queue size of every entry
+        columns (dict): Maps metric names to float arrays aligned with queue_sizes
+    """
+
+    def __init__(self, arch_keys, queue_sizes, columns):
+        self.arch_keys = arch_keys
+        self.queue_sizes = queue_sizes
+        self.columns = columns
+
+        # Entries of each architecture are contiguous
+        self._slices = {}
+        if len(arch_keys):
+            starts = np.flatnonzero(np.r_[True, arch_keys[1:] != arch_keys[:-1]])
+            for start, end in zip(starts, np.r_[starts[1:], len(arch_keys)]):
+                self._slices[str(arch_keys[start])] = slice(int(start), int(end))
+
+    def __len__(self):
+        return len(self.queue_sizes)
+
+    def __contains__(self, arch_name):
+        return arch_name in self._slices
+
+    def __getitem__(self, metric):
+        return self.columns[metric]
+
+    def architectures(self):
+        """Get the architecture keys, in table order."""
+        return list(self._slices)
+
+    def series(self, arch_name, metric):
+        """
+        Slice one metric of one architecture, skipping queue sizes where it is missing.
+
+        Args:
+            arch_name (str): Architecture key
+            metric (str): Column name
+
+        Returns:
+            tuple: ([queue sizes], [metric values]) sorted by queue size.
+        """
+        rows = self._slices.get(arch_name, slice(0, 0))
+        values = self.columns[metric][rows]
+        present = ~np.isnan(values)
+        return self.queue_sizes[rows][present], values[present]
+
+
+def performance_factors(arch_keys, queue_sizes, operation):
+    """
+    Get the operations per cycle of every entry for one operation.
+
+    Args:
+        arch_keys (numpy.ndarray): Architecture of every entry
+        queue_sizes (numpy.ndarray): Queue size of every entry
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
+
+    Returns:
+        numpy.ndarray: Performance factors from the throughput registry.
+    """
+    return throughput.ops_per_cycle_by_arch(arch_keys, queue_sizes, operation)
+
+
+def nearest_power_of_two(queue_size):
+    """
+    Round queue sizes to the nearest power of two, so sweeps over 2^k and 2^k - 1
+    entries can be matched.
+
+    Args:
+        queue_size (int or numpy.ndarray): Queue size, or an array of queue sizes
+
+    Returns:
+        int or numpy.ndarray: The nearest power of two, elementwise for arrays.
+    """
+    if np.ndim(queue_size):
+        return 2 ** np.round(np.log2(queue_size)).astype(np.int64)
+    return 2 ** int(round(log2(queue_size)))
+
+
+def _build(arch_keys, queue_sizes, columns, operations):
+    # Group by architecture in first-seen order, then sort by queue size
+    names, first, inverse = np.unique(arch_keys, return_index=True, return_inverse=True)
+    rank = np.argsort(np.argsort(first))[inverse.reshape(-1)]
+    order = np.lexsort((queue_sizes, rank))
+    arch_keys = arch_keys[order]
+    queue_sizes = queue_sizes[order]
+    columns = {metric: values[order] for metric, values in columns.items()}
+
+    columns["resource_utilization"] = np.maximum.reduce(
+        [columns["luts_util_percent"], columns["registers_util_percent"], columns["bram_util_percent"]]
+    )
+    for operation in operations:
+        performance = columns["max_achieved_frequency"] * performance_factors(arch_keys, queue_sizes, operation)
+        columns[f"{operation}_performance"] = performance
+        # Higher is better: more performance achieved with less resource
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns[f"{operation}_efficiency"] = np.where(
+                performance > 0, performance / columns["resource_utilization"], np.inf
+            )
+        columns[f"{operation}_efficiency"][np.isnan(performance)] = np.nan
+
+        # W / MOPS is uJ per operation
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns[f"{operation}_energy"] = np.where(performance > 0, 1000 * columns["power"] / performance, np.inf)
+            columns[f"{operation}_performance_per_watt"] = performance / columns["power"]
+        columns[f"{operation}_energy"][np.isnan(performance) | np.isnan(columns["power"])] = np.nan
+
+    return MetricsTable(arch_keys, queue_sizes, columns)
+
+
+def compute_metrics(data, operations=OPERATIONS):
+    """
+    Compute every metric of every architecture in one vectorized pass.
+
+    Args:
+        data (dict, LazyResults or ResultsDataset): Maps architecture keys to data
+            dictionaries, or a dataset of one device and data width
+        operations (iterable, optional): Operations to compute performance and efficiency for
+
+    Returns:
+        MetricsTable: Aligned metric arrays.
+    """
+    if isinstance(data, ResultsDataset):
+        points = data.max_frequency_points()
+        if len(points._group_index(("device", "data_width"))[0]) > 1:
+            raise ValueError("Dataset holds several devices or data widths; filter it first")
+        keys = points.arch_keys()
+        used = keys != ""
+        rows = points.rows[used]
+        columns = {metric: rows[metric].astype(float) for metric in BASE_METRICS[1:]}
+        columns["max_achieved_frequency"] = rows["achieved_frequency"].astype(float)
+        return _build(keys[used], rows["queue_size"].astype(np.int64), columns, operations)
+
+    # Flatten the data dictionaries once
+    arch_keys = []
+    queue_sizes = []
+    values = {metric: [] for metric in BASE_METRICS}
+    for arch_name, data_dict in data.items():
+        for queue_size, metrics in as_data_dict(data_dict).items():
+            arch_keys.append(arch_name)
+            queue_sizes.append(queue_size)
+            for metric, column in values.items():
+                column.append(metrics.get(metric, np.nan))
+
+    columns = {metric: np.array(column, dtype=float) for metric, column in values.items()}
+    return _build(np.array(arch_keys, dtype=str), np.array(queue_sizes, dtype=np.int64), columns, operations)
+
+
+def data_version(data):
+    """
+    Get a token that changes whenever the data of an architecture changes.
+
+    Datasets carry a version number; plain dictionaries are identified by the object,
+    so a dictionary modified in place must be invalidated explicitly.
+
+    Args:
+        data (dict or ResultsDataset): Data for one architecture
+
+    Returns:
+        tuple: The version token.
+    """
+    if isinstance(data, ResultsDataset):
+        return ("dataset", data.version)
+    return ("object", id(data))
+
+
+class MetricsCache:
+    """
+    Bounded LRU cache of derived metrics, so a table or series shared by several figures
+    is computed once per run.
+
+    Entries are keyed by the architectures with their data versions and, for every
+    operation, the throughput of the operation, so changing PERFORMANCE_FACTORS or
+    registering a throughput model never returns stale values.
+
+    Args:
+        maxsize (int, optional): Number of metrics tables kept
+    """
+
+    def __init__(self, maxsize=METRICS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def table(self, data_dicts, operations=OPERATIONS):
+        """
+        Get the metrics of several architectures, computing them on the first request.
+
+        Args:
+            data_dicts (dict): Maps architecture names to their data dictionaries or datasets
+            operations (iterable, optional): Operations to compute
+
+        Returns:
+            MetricsTable: Metrics of the architectures, shared with later requests.
+        """
+        operations = tuple(operations)
+        key = (
+            tuple((arch, data_version(data)) for arch, data in data_dicts.items()),
+            tuple(
+                (operation, tuple(sorted(PERFORMANCE_FACTORS.get(operation, {}).items())), throughput.models_version())
+                for operation in operations
+            ),
+        )
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            # Keep the data alive, so its identity is not reused while the entry exists
+            entry = (dict(data_dicts), compute_metrics(dict(data_dicts), operations=operations))
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        return entry[1]
+
+    def series(self, data_dict, arch, metric, operation=None):
+        """
+        Get one metric of one architecture, computing it on the first request.
+
+        Args:
+            data_dict (dict or ResultsDataset): Data for the architecture
+            arch (str): Architecture name
+            metric (str): Column of MetricsTable
+            operation (str, optional): Operation the metric depends on
+
+        Returns:
+            tuple: ([queue sizes], [metric values]) sorted by queue size.
+        """
+        return self.table({arch: data_dict}, () if operation is None else (operation,)).series(arch, metric)
+
+    def invalidate(self, data=None):
+        """
+        Drop cached metrics after data changed.
+
+        Args:
+            data (dict or ResultsDataset, optional): Data whose entries are dropped, everything by default
+        """
+        if data is None:
+            self._entries.clear()
+            return
+        version = data_version(data)
+        for key in [key for key in self._entries if any(token == version for _, token in key[0])]:
+            del self._entries[key]
+
+
+# Derived metrics shared by data_processor and the plotting functions
+METRICS_CACHE = MetricsCache()
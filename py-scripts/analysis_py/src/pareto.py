@@ -0,0 +1,162 @@
+"""
+Multi-objective Pareto frontier of architectures: throughput against area and power.
+"""
+
+import numpy as np
+from dataset import ResultsDataset
+from metrics_engine import MetricsTable, OPERATIONS, compute_metrics, nearest_power_of_two
+from throughput import supports
+
+# Objectives as (column, sense); "{operation}" is replaced by the operation compared
+DEFAULT_OBJECTIVES = (
+    ("{operation}_performance", "max"),
+    ("luts_util_percent", "min"),
+    ("registers_util_percent", "min"),
+    ("bram_util_percent", "min"),
+    ("power", "min"),
+)
+
+
+def skyline(costs, counts=False):
+    """
+    Find the non-dominated rows of a cost matrix with the sort-filter-skyline algorithm.
+
+    Rows are sorted by the sum of their min-max normalized costs. A row can only be
+    dominated by rows before it in that order, so each row is only compared against
+    the skyline found so far. Dominance counts compare each row with every row before
+    it, which is quadratic, so they are only computed on request.
+
+    Args:
+        costs (numpy.ndarray): (points, objectives) matrix, every objective minimized
+        counts (bool, optional): Also count dominance relations
+
+    Returns:
+        tuple: (non-dominated mask, dominated_by, dominates) where dominated_by counts
+            the points dominating each row and dominates the points each row dominates
+            (both zero when counts is False).
+    """
+    costs = np.asarray(costs, dtype=float)
+    count = len(costs)
+    non_dominated = np.zeros(count, dtype=bool)
+    dominated_by = np.zeros(count, dtype=int)
+    dominates = np.zeros(count, dtype=int)
+    if not count:
+        return non_dominated, dominated_by, dominates
+
+    # Monotone score: if a dominates b, score(a) < score(b)
+    finite = np.where(np.isfinite(costs), costs, np.nan)
+    low = np.nan_to_num(np.nanmin(finite, axis=0))
+    span = np.nan_to_num(np.nanmax(finite, axis=0)) - low
+    span[span == 0] = 1
+    scores = np.sum(np.clip((costs - low) / span, -1, 2), axis=1)
+    order = np.argsort(scores, kind="stable")
+
+    window = []
+    for position, row in enumerate(order):
+        if counts:
+            earlier = order[:position]
+            dominating = _dominating(costs[earlier], costs[row])
+            dominated_by[row] = np.count_nonzero(dominating)
+            dominates[earlier[dominating]] += 1
+
+        if window and np.any(_dominating(costs[window], costs[row])):
+            continue
+        window.append(row)
+        non_dominated[row] = True
+
+    return non_dominated, dominated_by, dominates
+
+
+def _dominating(candidates, point):
+    # No worse in every objective and better in at least one
+    return np.all(candidates <= point, axis=1) & np.any(candidates < point, axis=1)
+
+
+def _objective_costs(table, rows, operation, objectives):
+    columns = []
+    names = []
+    for column, sense in objectives:
+        column = column.format(operation=operation)
+        values = table[column][rows]
+        # Missing values can never make a point better
+        if sense == "max":
+            values = np.where(np.isnan(values), np.inf, -values)
+        else:
+            values = np.where(np.isnan(values), np.inf, values)
+        columns.append(values)
+        names.append(column)
+    return names, np.column_stack(columns)
+
+
+def pareto_frontier(data, operation, arch_list=None, objectives=DEFAULT_OBJECTIVES, bucket=True, counts=False):
+    """
+    Compute the Pareto frontier of architectures at every queue size for one operation.
+
+    Only architectures supporting the operation are compared.
+
+    Args:
+        data (dict, LazyResults, ResultsDataset or MetricsTable): Data for several architectures
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
+        arch_list (list, optional): Architectures to compare, all by default
+        objectives (tuple, optional): (column, "max" or "min") pairs of MetricsTable columns
+        bucket (bool, optional): Compare queue sizes rounded to the nearest power of two
+        counts (bool, optional): Also count, for every point, the points dominating it and
+            the points it dominates (compares all pairs)
+
+    Returns:
+        dict: Maps queue sizes to {"frontier": [arch keys], "points": [...]}, where every
+            point has "arch", "queue_size", "objectives" and "pareto", plus "dominated_by"
+            and "dominates" with counts.
+    """
+    if isinstance(data, MetricsTable):
+        table = data
+    elif isinstance(data, ResultsDataset):
+        table = compute_metrics(data, operations=(operation,))
+    else:
+        # Select by key first, so a LazyResults only parses those
+        keys = [k for k in (data if arch_list is None else arch_list) if k in data and supports(k, operation)]
+        table = compute_metrics({k: data[k] for k in keys}, operations=(operation,))
+
+    arch_keys = table.arch_keys.astype(str).tolist()
+    selected = np.array([supports(k, operation) and (arch_list is None or k in arch_list) for k in arch_keys], dtype=bool)
+    queue_sizes = table.queue_sizes
+    groups = nearest_power_of_two(queue_sizes) if bucket else queue_sizes
+
+    frontiers = {}
+    for group in np.unique(groups[selected]).tolist():
+        rows = np.flatnonzero(selected & (groups == group))
+        names, costs = _objective_costs(table, rows, operation, objectives)
+        non_dominated, dominated_by, dominates = skyline(costs, counts=counts)
+
+        points = []
+        for index, row in enumerate(rows):
+            point = {
+                "arch": arch_keys[row],
+                "queue_size": int(queue_sizes[row]),
+                "objectives": {name: float(table[name][row]) for name in names},
+                "pareto": bool(non_dominated[index]),
+            }
+            if counts:
+                point["dominated_by"] = int(dominated_by[index])
+                point["dominates"] = int(dominates[index])
+            points.append(point)
+        frontiers[int(group)] = {
+            "frontier": [point["arch"] for point in points if point["pareto"]],
+            "points": points,
+        }
+    return frontiers
+
+
+def pareto_frontiers(data, operations=OPERATIONS, **options):
+    """
+    Compute the Pareto frontier of every operation.
+
+    Args:
+        data (dict, LazyResults or ResultsDataset): Data for several architectures
+        operations (iterable, optional): Operations to compare on
+        **options: arch_list, objectives, bucket and counts, as for pareto_frontier
+
+    Returns:
+        dict: Maps operations to the result of pareto_frontier.
+    """
+    return {operation: pareto_frontier(data, operation, **options) for operation in operations}
@@ -4,7 +4,216 @@ Parsing functions for Vivado analysis log files/directories.
 
 import os
 import re
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Backends accepted by process_directory: the line-based parser in this module, or the
+# memory-mapped regex scanner in scanner.py
+PARSER_BACKENDS = ("python", "mmap")
+
+# Bump whenever parsing rules or the record layout change, persisted parse results
+# from other versions are then treated as stale
+PARSER_VERSION = 1
+
+# Order of the fields in every frequency record returned by parse_frequency_records
+FREQUENCY_RECORD_FIELDS = (
+    "target_frequency",
+    "achieved_frequency",
+    "wns",
+    "power",
+    "luts_used",
+    "luts_util_percent",
+    "registers_used",
+    "registers_util_percent",
+    "bram_used",
+    "bram_util_percent",
+    "synthesis_seconds",
+    "implementation_seconds",
+)
+
+# Metrics copied from the maximum-frequency record into parse_metrics output
+METRIC_FIELDS = (
+    "power",
+    "luts_used",
+    "luts_util_percent",
+    "registers_used",
+    "registers_util_percent",
+    "bram_used",
+    "bram_util_percent",
+)
+
+# Every result line looks like "Frequency: <target> MHz -> <label>: <value>"
+_FREQUENCY_LINE_RE = re.compile(r"^Frequency:\s*([0-9.]+)\s*MHz\s*->\s*([^:]+?)\s*:\s*(.*?)\s*$")
+_NUMBER_RE = re.compile(r"^<?\s*(-?[0-9]*\.?[0-9]+)")
+_SECONDS_RE = re.compile(r"->\s*([0-9]+)s$")
+_QUEUE_SIZE_RE = re.compile(r"queue_size_(\d+)")
+
+
+def _parse_number(value):
+    # "<0.01 %" is reported by Vivado for tiny utilizations, keep the bound
+    match = _NUMBER_RE.match(value)
+    if not match:
+        raise ValueError(f"Not a number: {value!r}")
+    return float(match.group(1))
+
+
+def _parse_count(value):
+    return int(value)
+
+
+def _parse_seconds(value):
+    # "1m 4s -> 64s": the value after the last arrow is the total in seconds
+    match = _SECONDS_RE.search(value)
+    if not match:
+        raise ValueError(f"Not a duration: {value!r}")
+    return int(match.group(1))
+
+
+# Maps a result line label to (record field, value converter)
+_LINE_FIELDS = {
+    "Synthesis": ("synthesis_seconds", _parse_seconds),
+    "Implementation": ("implementation_seconds", _parse_seconds),
+    "Power": ("power", _parse_number),
+    "CLB LUTs Used": ("luts_used", _parse_count),
+    "CLB LUTs Util%": ("luts_util_percent", _parse_number),
+    "CLB Registers Used": ("registers_used", _parse_count),
+    "CLB Registers Util%": ("registers_util_percent", _parse_number),
+    "BRAM Util": ("bram_used", _parse_number),
+    "BRAM Util%": ("bram_util_percent", _parse_number),
+    "WNS": ("wns", _parse_number),
+    "Achieved Frequency": ("achieved_frequency", _parse_number),
+}
+
+
+class FrequencyRecordBuilder:
+    """
+    Incrementally assembles frequency records from the lines of a Vivado log.
+
+    Lines are fed one at a time; a record is emitted when the "Achieved Frequency"
+    line closing a frequency block is seen. Fields that are missing or cannot be
+    parsed (e.g. "Power: No power report") are left as None.
+    """
+
+    def __init__(self):
+        self._current = None
+
+    def feed(self, line):
+        """
+        Consume one log line.
+
+        Args:
+            line (str): A line of the Vivado analysis log.
+
+        Returns:
+            dict or None: The completed frequency record, if this line closed one.
+        """
+        match = _FREQUENCY_LINE_RE.match(line.strip())
+        if not match:
+            return None
+
+        try:
+            target = float(match.group(1))
+        except ValueError:
+            return None
+
+        if self._current is None or self._current["target_frequency"] != target:
+            # A new block starts, drop any block that never reported its achieved frequency
+            self._current = dict.fromkeys(FREQUENCY_RECORD_FIELDS)
+            self._current["target_frequency"] = target
+
+        field = _LINE_FIELDS.get(match.group(2))
+        if field is None:
+            return None
+        key, convert = field
+
+        try:
+            self._current[key] = convert(match.group(3))
+        except (ValueError, IndexError):
+            pass
+
+        if key == "achieved_frequency":
+            record, self._current = self._current, None
+            if record["achieved_frequency"] is not None:
+                return record
+        return None
+
+
+def parse_frequency_records(file_path):
+    """
+    Parses a Vivado log file in a single pass and returns one record per target frequency.
+
+    Args:
+        file_path (str): Path to the Vivado analysis log file to parse.
+
+    Returns:
+        list[dict]: Records in file order, each with the keys in FREQUENCY_RECORD_FIELDS:
+            - target_frequency: Target clock frequency in MHz
+            - achieved_frequency: Achieved frequency in MHz after implementation
+            - wns: Worst negative slack in ns
+            - power: Total on-chip power in Watts (None if not reported)
+            - luts_used / luts_util_percent: CLB LUT usage and utilization percentage
+            - registers_used / registers_util_percent: CLB register usage and utilization percentage
+            - bram_used / bram_util_percent: BRAM tiles used and utilization percentage
+            - synthesis_seconds / implementation_seconds: Vivado run times in seconds
+    """
+    builder = FrequencyRecordBuilder()
+    records = []
+
+    with open(file_path, "r") as f:
+        for line in f:
+            record = builder.feed(line)
+            if record is not None:
+                records.append(record)
+
+    return records
+
+
+def queue_size_from_path(file_path):
+    """
+    Extracts the queue size from a "vivado_analysis_on_queue_size_<N>.txt" file name.
+
+    Args:
+        file_path (str): Path to the Vivado log file.
+
+    Returns:
+        int: The queue size, or 0 if it cannot be extracted.
+    """
+    try:
+        queue_size_match = _QUEUE_SIZE_RE.search(file_path)
+        if queue_size_match:
+            return int(queue_size_match.group(1))
+        # Fallback to simpler extraction if regex fails
+        file_name = os.path.basename(file_path)
+        return int(file_name.split("_")[-1].split(".")[0])
+    except (ValueError, IndexError):
+        return 0  # Default value if extraction fails
+
+
+def metrics_from_records(records, queue_size):
+    """
+    Selects the metrics of the frequency record with the maximum achieved frequency.
+
+    Args:
+        records (list[dict]): Records returned by parse_frequency_records.
+        queue_size (int): Queue size the records belong to.
+
+    Returns:
+        dict: Same layout as parse_metrics.
+
+    Raises:
+        ValueError: If there are no records.
+    """
+    if not records:
+        raise ValueError("No frequency records to select metrics from")
+
+    # max() keeps the first record on ties, matching the first-index lookup
+    best = max(records, key=lambda record: record["achieved_frequency"])
+
+    metrics = {"queue_size": queue_size, "max_achieved_frequency": best["achieved_frequency"]}
+    for key in METRIC_FIELDS:
+        if best[key] is not None:
+            metrics[key] = best[key]
+
+    return metrics
 
 
 def parse_achieved_frequencies(file_path):
@@ -22,29 +231,9 @@ def parse_achieved_frequencies(file_path):
     Note:
         Each index in both lists corresponds to the same implementation run.
     """
-    given_frequencies = []
-    achieved_frequencies = []
-
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-
-            # Extract given frequency
-            if "Frequency:" in line and "Achieved Frequency" in line:
-                try:
-                    # Extract given frequency
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract achieved frequency
-                    parts = line.split("Achieved Frequency:")
-                    a_freq = float(parts[1].split("MHz")[0].strip())
-
-                    given_frequencies.append(freq)
-                    achieved_frequencies.append(a_freq)
-
-                except (ValueError, IndexError):
-                    continue
+    records = parse_frequency_records(file_path)
+    given_frequencies = [record["target_frequency"] for record in records]
+    achieved_frequencies = [record["achieved_frequency"] for record in records]
 
     return given_frequencies, achieved_frequencies
 
@@ -69,198 +258,10 @@ def parse_metrics(file_path):
             - bram_used: BRAM blocks used
             - bram_util_percent: BRAM utilization percentage
     """
-    metrics = {}
+    return metrics_from_records(parse_frequency_records(file_path), queue_size_from_path(file_path))
 
-    # Find the maximum achieved freqency and the given frequency for that
-    given_frequencies, achieved_frequencies = parse_achieved_frequencies(file_path)
-    max_freq = np.max(achieved_frequencies)
-    max_freq_index = achieved_frequencies.index(max_freq)
-    max_freq_given = given_frequencies[max_freq_index]
 
-    # Extract queue size from file name
-    queue_size = None
-    try:
-        queue_size_match = re.search(r"queue_size_(\d+)", file_path)
-        if queue_size_match:
-            queue_size = int(queue_size_match.group(1))
-        else:
-            # Fallback to simpler extraction if regex fails
-            file_name = file_path.split("/")[-1]
-            parts = file_name.split("_")
-            queue_size = int(parts[-1].split(".")[0])
-    except (ValueError, IndexError):
-        queue_size = 0  # Default value if extraction fails
-
-    # Initialize metrics dictionary with queue size and max frequency
-    metrics = {"queue_size": queue_size, "max_achieved_frequency": max_freq}
-
-    # Get all metrics for this queue size when the frequency is the maximum
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-
-            # Extract Power
-            if "Frequency:" in line and "Power" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract power
-                    parts = line.split("Power:")
-                    power = float(parts[1].split("W")[0].strip())
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["power"] = power
-
-                except (ValueError, IndexError):
-                    continue
-
-            # Extract CLB LUTs Used
-            if "Frequency:" in line and "CLB LUTs Used" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract LUTs used
-                    parts = line.split("CLB LUTs Used:")
-                    luts_used = int(parts[1].strip())
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["luts_used"] = luts_used
-
-                except (ValueError, IndexError):
-                    continue
-
-            # Extract CLB LUTs Utilization
-            if "Frequency:" in line and "CLB LUTs Util%" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract LUTs utilization
-                    parts = line.split("CLB LUTs Util%:")
-                    luts_util_str = parts[1].split("%")[0].strip()
-                    
-                    # Handle "<0.01%" case
-                    if luts_util_str == "<0.01":
-                        luts_util = 0.01
-                    else:
-                        luts_util = float(luts_util_str)
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["luts_util_percent"] = luts_util
-
-                except (ValueError, IndexError):
-                    continue
-
-            # Extract CLB Registers Used
-            if "Frequency:" in line and "CLB Registers Used" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract Registers used
-                    parts = line.split("CLB Registers Used:")
-                    regs_used = int(parts[1].strip())
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["registers_used"] = regs_used
-
-                except (ValueError, IndexError):
-                    continue
-
-            # Extract CLB Registers Utilization Percentage
-            if "Frequency:" in line and "CLB Registers Util%" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract Registers utilization
-                    parts = line.split("CLB Registers Util%:")
-                    regs_util_str = parts[1].split("%")[0].strip()
-                    
-                    # Handle "<0.01%" case
-                    if regs_util_str == "<0.01":
-                        regs_util = 0.01
-                    else:
-                        regs_util = float(regs_util_str)
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["registers_util_percent"] = regs_util
-
-                except (ValueError, IndexError):
-                    continue
-
-            # Extract BRAM Used
-            if "Frequency:" in line and "BRAM Util:" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract BRAM used
-                    parts = line.split("BRAM Util:")
-                    bram_used = float(parts[1].strip())
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["bram_used"] = bram_used
-
-                except (ValueError, IndexError):
-                    continue
-
-            # Extract BRAM Utilization Percentage
-            if "Frequency:" in line and "BRAM Util%:" in line:
-                try:
-                    # Extract the frequency from the line
-                    parts = line.split("Frequency:")
-                    freq = float(parts[1].split("MHz")[0].strip())
-
-                    # Extract BRAM utilization
-                    parts = line.split("BRAM Util%:")
-                    bram_util_str = parts[1].split("%")[0].strip()
-                    
-                    # Handle "<0.01%" case
-                    if bram_util_str == "<0.01":
-                        bram_util = 0.01
-                    else:
-                        bram_util = float(bram_util_str)
-
-                    # If this frequency is equal to the max frequency, add to metrics
-                    if (
-                        abs(freq - max_freq_given) < 1e-6
-                    ):  # Using small epsilon for float comparison
-                        metrics["bram_util_percent"] = bram_util
-
-                except (ValueError, IndexError):
-                    continue
-
-    return metrics
-
-
-def process_directory(log_dir):
+def process_directory(log_dir, workers=1, chunksize=8, cache=None, backend="python"):
     """
     Process Vivado analysis log files to extract performance metrics for various queue sizes.
 
@@ -270,6 +271,12 @@ def process_directory(log_dir):
 
     Args:
         log_dir (str): Path to directory containing Vivado analysis log files.
+        workers (int, optional): Number of worker processes used to parse files.
+            1 parses serially in this process, None uses every available core.
+        chunksize (int, optional): Number of files handed to a worker at a time.
+        cache (cache.ParseCache, optional): Persistent cache consulted before parsing a
+            file; only new or changed files are parsed and then stored back.
+        backend (str, optional): Parser used for each file, one of PARSER_BACKENDS.
 
     Returns:
         dict or tuple: If no subdirectories are found, returns a dictionary mapping 
@@ -281,41 +288,185 @@ def process_directory(log_dir):
         Files must follow the naming convention that includes "vivado_analysis_on_queue_size"
         and end with the queue size (e.g., "vivado_analysis_on_queue_size_64.txt").
     """
+    return process_directories([log_dir], workers=workers, chunksize=chunksize, cache=cache, backend=backend)[log_dir]
+
+
+def process_directories(log_dirs, workers=1, chunksize=8, cache=None, backend="python"):
+    """
+    Process several result directories at once, sharing one pool of workers across
+    all of their log files.
+
+    Args:
+        log_dirs (list[str]): Directories accepted by process_directory.
+        workers (int, optional): Number of worker processes used to parse files.
+            1 parses serially in this process, None uses every available core.
+        chunksize (int, optional): Number of files handed to a worker at a time.
+        cache (cache.ParseCache, optional): Persistent cache of parsed log files.
+        backend (str, optional): Parser used for each file, one of PARSER_BACKENDS.
+
+    Returns:
+        dict: Maps each log directory to the result process_directory would return for it.
+    """
+    # Collect every file first so that a single pool spans all directories
+    layouts = {log_dir: directory_layout(log_dir) for log_dir in log_dirs}
+    file_paths = [
+        file_path
+        for file_dirs in layouts.values()
+        for file_dir in file_dirs
+        for file_path in list_log_files(file_dir)
+    ]
+    records_by_path = load_records(file_paths, workers=workers, chunksize=chunksize, cache=cache, backend=backend)
+    metrics_by_path = {
+        file_path: metrics_from_records(records, queue_size_from_path(file_path))
+        for file_path, records in records_by_path.items()
+    }
+
+    results = {}
+    for log_dir, file_dirs in layouts.items():
+        data = tuple(_process_files(file_dir, metrics_by_path) for file_dir in file_dirs)
+        results[log_dir] = data if len(data) == 2 else data[0]
+    return results
+
+
+def directory_layout(log_dir):
+    """
+    Find the directories holding the log files of a results directory.
+
+    Args:
+        log_dir (str): Path to a results directory.
+
+    Returns:
+        list[str]: [enqueue_0, enqueue_1] subdirectories if both exist, otherwise [log_dir].
+    """
     # Check if this directory has enqueue_0/enqueue_1 subdirectories
     contents = os.listdir(log_dir)
     if "enqueue_0" in contents and "enqueue_1" in contents:
-        # Process both subdirectories
-        enqueue_disabled_data = _process_files(os.path.join(log_dir, "enqueue_0"))
-        enqueue_enabled_data = _process_files(os.path.join(log_dir, "enqueue_1"))
-        return (enqueue_disabled_data, enqueue_enabled_data)
-    else:
-        # Process files in the main directory
-        return _process_files(log_dir)
+        return [os.path.join(log_dir, "enqueue_0"), os.path.join(log_dir, "enqueue_1")]
+    return [log_dir]
+
+
+def list_log_files(log_dir):
+    """
+    List the Vivado analysis log files in a directory.
+
+    Args:
+        log_dir (str): Path to directory containing log files.
+
+    Returns:
+        list[str]: Paths of the log files, sorted by file name.
+    """
+    return [
+        os.path.join(log_dir, file_name)
+        for file_name in sorted(os.listdir(log_dir))
+        if file_name.endswith(".txt") and "vivado_analysis_on_queue_size" in file_name
+    ]
+
+
+def load_records(file_paths, workers=1, chunksize=8, cache=None, backend="python"):
+    """
+    Get the frequency records of many log files, from the cache where possible.
 
+    Args:
+        file_paths (list[str]): Log files to load.
+        workers (int, optional): Number of worker processes, 1 for serial, None for all cores.
+        chunksize (int, optional): Number of files handed to a worker at a time.
+        cache (cache.ParseCache, optional): Persistent cache of parsed log files.
+        backend (str, optional): Parser used for each file, one of PARSER_BACKENDS.
+
+    Returns:
+        dict: Maps each file path to its list of frequency records.
+    """
+    records_by_path = {}
+    stats = {}
+
+    if cache is not None:
+        for file_path in file_paths:
+            # Stat before parsing so a file that changes meanwhile is stale next run
+            stats[file_path] = os.stat(file_path)
+            records = cache.get(file_path, stats[file_path])
+            if records is not None:
+                records_by_path[file_path] = records
+
+    missing = [file_path for file_path in file_paths if file_path not in records_by_path]
+    parsed = _parse_files(missing, workers, chunksize, backend)
+    records_by_path.update(zip(missing, parsed))
+
+    if cache is not None and missing:
+        cache.put_many((file_path, records, stats[file_path]) for file_path, records in zip(missing, parsed))
+
+    return records_by_path
 
-def _process_files(log_dir):
+
+def _parse_files(file_paths, workers=1, chunksize=8, backend="python"):
+    """
+    Helper function to parse the frequency records of many files, optionally in a process pool.
+
+    Args:
+        file_paths (list[str]): Log files to parse.
+        workers (int, optional): Number of worker processes, 1 for serial, None for all cores.
+        chunksize (int, optional): Number of files handed to a worker at a time.
+        backend (str, optional): Parser used for each file, one of PARSER_BACKENDS.
+
+    Returns:
+        list[list[dict]]: Frequency records for each file, in the order of file_paths.
+    """
+    parse = _backend_parser(backend)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(file_paths) <= 1:
+        return [parse(file_path) for file_path in file_paths]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+        return list(executor.map(parse, file_paths, chunksize=max(1, chunksize)))
+
+
+def _backend_parser(backend):
+    """
+    Helper function to get the function parsing one file for a backend.
+
+    Args:
+        backend (str): One of PARSER_BACKENDS.
+
+    Returns:
+        callable: Maps a file path to its list of frequency records.
+    """
+    if backend == "python":
+        return parse_frequency_records
+    if backend == "mmap":
+        # Imported here since the scanner builds on this module
+        import scanner
+
+        return scanner.scan_file
+    raise ValueError(f"Unknown parser backend {backend!r}, expected one of {PARSER_BACKENDS}")
+
+
+def _process_files(log_dir, metrics_by_path=None):
     """
     Helper function to process files in a directory.
     
     Args:
         log_dir (str): Path to directory containing log files.
+        metrics_by_path (dict, optional): Already parsed metrics keyed by file path.
         
     Returns:
         dict: Dictionary mapping queue sizes to metrics.
     """
     data_dict = {}
-    for file_name in os.listdir(log_dir):
-        if file_name.endswith(".txt") and "vivado_analysis_on_queue_size" in file_name:
-            file_path = os.path.join(log_dir, file_name)
+    for file_path in list_log_files(log_dir):
+        file_name = os.path.basename(file_path)
 
-            # Extract queue size from filename
-            queue_size = int(file_name.split("_")[-1].split(".")[0])
+        # Extract queue size from filename
+        queue_size = int(file_name.split("_")[-1].split(".")[0])
 
-            # Get other metrics
+        # Get other metrics
+        if metrics_by_path is not None and file_path in metrics_by_path:
+            metrics = metrics_by_path[file_path]
+        else:
             metrics = parse_metrics(file_path)
 
-            # Store metrics in dictionary
-            data_dict[queue_size] = metrics
+        # Store metrics in dictionary
+        data_dict[queue_size] = metrics
 
     return data_dict
-
@@ -2,12 +2,25 @@
 Plotting functions for hardware queue performance analysis.
 """
 
+import argparse
 import os
+import threading
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import matplotlib.pyplot as plt
-import parsers
+from matplotlib.colors import ListedColormap
+import numpy as np
 import data_processor as dp
-from config import OUTPUT_DIR
+from fmax_stats import frequency_bands
+from metrics_engine import METRICS_CACHE, OPERATIONS
+from throughput import ops_per_cycle, supports
+from workload import mix_sweep
+from pareto import pareto_frontier
+from cache import ParseCache
+from dataset import LazyResults, as_data_dicts, prefetch_together
+from config import OUTPUT_DIR, CACHE_FILE, PLOT_STORE_DIR
+from render_cache import RenderStore
 
 # Define consistent architecture styles
 ARCHITECTURE_STYLES = {
@@ -101,6 +114,11 @@ def get_arch_style(arch_name):
     }
 
 
+# Resolution of final figures, and of previews and figures shown on screen while iterating on an analysis
+FINAL_DPI = 300
+PREVIEW_DPI = 72
+
+
 def setup_plot_style(
     font_size=None, figsize=None, dpi=None, grid=None, grid_alpha=None
 ):
@@ -110,535 +128,461 @@ def setup_plot_style(
     Args:
         font_size (int, optional): Base font size. Defaults to PLOT_FONT_SIZE.
         figsize (tuple, optional): Figure size as (width, height). Defaults to (12, 8).
-        dpi (int, optional): Figure resolution in dots per inch. Defaults to 300.
+        dpi (int, optional): Resolution of figures shown on screen, in dots per inch.
+            Defaults to PREVIEW_DPI; saved figures use the resolution of their job.
         grid (bool, optional): Whether to show grid lines. Defaults to True.
         grid_alpha (float, optional): Transparency of grid lines (0-1). Defaults to 0.3.
     """
     params = {
         "font.size": font_size if font_size is not None else 16,
         "figure.figsize": figsize if figsize is not None else (12, 8),
-        "figure.dpi": dpi if dpi is not None else 300,
+        "figure.dpi": dpi if dpi is not None else PREVIEW_DPI,
         "axes.grid": grid if grid is not None else True,
         "grid.alpha": grid_alpha if grid_alpha is not None else 0.3,
     }
     plt.rcParams.update(params)
 
 
-def plot_frequency_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+# Settings applied by setup_plot_style that change saved figures; figures are saved at
+# the resolution of their job, but their layout is measured at figure.dpi
+STYLE_PARAMS = ("font.size", "figure.figsize", "figure.dpi", "axes.grid", "grid.alpha")
+
+def render_style():
     """
-    Plot the maximum achieved frequency vs queue size.
+    Collect the style settings a rendered figure depends on, for render_cache digests.
 
-    Args:
-        ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
-        title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
+    Returns:
+        dict: Current style parameters and the architecture and device line styles.
     """
-    queue_sizes, frequencies = dp.get_max_achieved_frequency(data_dict)
+    return {
+        "rc": {key: plt.rcParams[key] for key in STYLE_PARAMS},
+        "architectures": ARCHITECTURE_STYLES,
+        "devices": DEVICE_LINESTYLES,
+    }
 
-    # Get architecture-specific style
-    style = (
-        get_arch_style(arch_name)
-        if arch_name
-        else {"color": "blue", "marker": "o", "display_name": "Architecture"}
-    )
 
-    ax.plot(
-        queue_sizes,
-        frequencies,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
-    )
+# Panels plotting one column of the metrics table against queue size, for every
+# architecture of the panel. "{operation}" and "{Operation}" are filled in from the
+# panel; "style" is used for data not tied to an architecture.
+PANEL_SPECS = {
+    "frequency": {
+        "column": "max_achieved_frequency",
+        "ylabel": "Maximum Achieved Frequency (MHz)",
+        "title": "Maximum Achieved Frequency vs Queue Size",
+        "yscale": "linear",
+        "style": {"color": "blue", "marker": "o"},
+    },
+    "lut_usage": {
+        "column": "luts_used",
+        "ylabel": "LUT Usage (Count)",
+        "title": "LUT Usage vs Queue Size",
+        "yscale": "linear",
+        "style": {"color": "red", "marker": "s"},
+    },
+    "lut_utilization": {
+        "column": "luts_util_percent",
+        "ylabel": "LUT Utilization (%)",
+        "title": "LUT Utilization Percentage vs Queue Size",
+        "yscale": "log",
+        "style": {"color": "green", "marker": "d"},
+    },
+    "register_usage": {
+        "column": "registers_used",
+        "ylabel": "Register Usage (Count)",
+        "title": "Register Usage vs Queue Size",
+        "yscale": "linear",
+        "style": {"color": "purple", "marker": "^"},
+    },
+    "register_utilization": {
+        "column": "registers_util_percent",
+        "ylabel": "Register Utilization (%)",
+        "title": "Register Utilization Percentage vs Queue Size",
+        "yscale": "log",
+        "style": {"color": "orange", "marker": "*"},
+    },
+    "bram_usage": {
+        "column": "bram_used",
+        "ylabel": "BRAM Usage (Count)",
+        "title": "BRAM Usage vs Queue Size",
+        "yscale": "linear",
+        "style": {"color": "brown", "marker": "D"},
+    },
+    "bram_utilization": {
+        "column": "bram_util_percent",
+        "ylabel": "BRAM Utilization (%)",
+        "title": "BRAM Utilization Percentage vs Queue Size",
+        "yscale": "log",
+        "style": {"color": "teal", "marker": "v"},
+    },
+    "resource_utilization": {
+        "column": "resource_utilization",
+        "ylabel": "FPGA Resource Utilization (%)",
+        "title": "FPGA Resource Utilization vs Queue Size",
+        "yscale": "log",
+        "style": {"color": "gray", "marker": "."},
+    },
+    "performance": {
+        "column": "{operation}_performance",
+        "ylabel": "Performance (MOPS/s)",
+        "title": "{Operation} Performance",
+        "yscale": "linear",
+        "style": {"color": "blue", "marker": "o"},
+        # Sustainable Fmax and its confidence interval, scaled like the column
+        "band": "performance",
+    },
+    "efficiency": {
+        "column": "{operation}_efficiency",
+        "ylabel": "Performance / Resource",
+        "title": "{Operation} Resource Efficiency",
+        "yscale": "log",
+        "style": {"color": "blue", "marker": "o"},
+        "band": "efficiency",
+        "legend": {"fontsize": 12},
+    },
+    "energy": {
+        "column": "{operation}_energy",
+        "ylabel": "Energy per Operation (nJ/op)",
+        "title": "{Operation} Energy per Operation",
+        "yscale": "log",
+        "style": {"color": "blue", "marker": "o"},
+        "legend": {"fontsize": 12},
+    },
+    "performance_per_watt": {
+        "column": "{operation}_performance_per_watt",
+        "ylabel": "Performance per Watt (MOPS/W)",
+        "title": "{Operation} Performance per Watt",
+        "yscale": "log",
+        "style": {"color": "blue", "marker": "o"},
+        "legend": {"fontsize": 12},
+    },
+}
 
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("Maximum Achieved Frequency (MHz)")
-    ax.set_title(title or "Maximum Achieved Frequency vs Queue Size")
-    # ax.set_title(title)
-    ax.set_xscale("log", base=2)
-    ax.grid(True)
 
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
+def panel_table(data, panels):
+    """
+    Compute every series a set of panels needs in one pass over the data, through the
+    metrics cache, so figures and grids over the same architectures share the table.
 
+    Args:
+        data (dict or LazyResults): Maps architecture names to their data dictionaries
+        panels (iterable): Panel dictionaries (see draw_panels), None for hidden axes
 
-def plot_lut_usage_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    Returns:
+        metrics_engine.MetricsTable: Metrics of every architecture and operation of the panels.
     """
-    Plot LUT usage vs queue size.
+    archs = {}
+    operations = {}
+    for panel in panels:
+        if panel is None:
+            continue
+        for arch_name in data if panel.get("archs") is None else panel["archs"]:
+            if arch_name in data:
+                archs[arch_name] = None
+        if panel.get("operation"):
+            operations[panel["operation"]] = None
+    return METRICS_CACHE.table({arch_name: data[arch_name] for arch_name in archs}, operations=tuple(operations))
+
+
+def draw_panel(ax, table, panel, samples=None, data=None):
+    """
+    Draw one panel from a precomputed metrics table.
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
-        title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
+        table (metrics_engine.MetricsTable): Metrics from panel_table
+        panel (dict): Panel dictionary (see draw_panels)
+        samples (LazyResults or ResultsDataset, optional): Frequency points for error bands
+        data (dict, optional): Data dictionaries of the architectures, for the Pareto overlay
     """
-    queue_sizes, luts = dp.get_lut_usage(data_dict)
-
-    # Get architecture-specific style
-    style = (
-        get_arch_style(arch_name)
-        if arch_name
-        else {"color": "red", "marker": "s", "display_name": "Architecture"}
-    )
-
-    ax.plot(
-        queue_sizes,
-        luts,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
-    )
+    spec = PANEL_SPECS[panel["spec"]]
+    operation = panel.get("operation")
+    names = {"operation": operation, "Operation": (operation or "").capitalize()}
+    column = spec["column"].format(**names)
+    archs = table.architectures() if panel.get("archs") is None else [k for k in panel["archs"] if k in table]
+
+    banded = False
+    for arch_name in archs:
+        style = get_arch_style(arch_name) if arch_name else dict(spec["style"], display_name="Architecture")
+        queue_sizes, values = table.series(arch_name, column)
+        ax.plot(
+            queue_sizes,
+            values,
+            f"{style['marker']}-",
+            color=style["color"],
+            linewidth=4,
+            label=style["display_name"],
+            markersize=14,
+        )
+        if spec.get("band") and panel.get("bands", True) and samples is not None:
+            utilization = table.series(arch_name, "resource_utilization") if spec["band"] == "efficiency" else None
+            banded = _draw_frequency_band(ax, samples, arch_name, operation, utilization) or banded
+
+    if banded:
+        # Solid lines use the peak Fmax, the dashed lines and bands the sustainable one
+        ax.plot([], [], "--", color="gray", linewidth=3, label="Sustainable Fmax, 95% CI (solid: peak)")
+
+    if panel.get("pareto"):
+        plot_pareto_overlay(ax, data, archs, operation)
 
     ax.set_xlabel("Queue Size")
-    ax.set_ylabel("LUT Usage (Count)")
-    ax.set_title(title or "LUT Usage vs Queue Size")
+    ax.set_ylabel(spec["ylabel"])
+    ax.set_title(panel.get("title") or spec["title"].format(**names))
     ax.set_xscale("log", base=2)
+    if spec["yscale"] != "linear":
+        ax.set_yscale(spec["yscale"])
     ax.grid(True)
+    if panel.get("legend", True):
+        ax.legend(**spec.get("legend", {}))
 
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
 
-
-def plot_lut_utilization_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+def draw_panels(axs, data, panels, samples=None):
     """
-    Plot LUT utilization percentage vs queue size.
+    Draw a figure or grid described by panel dictionaries, from one pass over the data.
+
+    A panel dictionary holds the "spec" (key of PANEL_SPECS) and optionally the
+    "operation", the "archs" drawn (all by default), a "title", "bands" (False to skip
+    the sustainable Fmax bands), "pareto" (True to circle the Pareto frontier) and
+    "legend" (False to leave it out).
 
     Args:
-        ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
-        title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
+        axs (matplotlib.axes.Axes or array-like): Axes, flattened in order and aligned with panels
+        data (dict, LazyResults or ResultsDataset): Maps architecture names to their data dictionaries
+        panels (iterable): Panel dictionaries, None to hide an axes
+        samples (LazyResults or ResultsDataset, optional): Frequency points for the bands,
+            when data only holds data dictionaries
     """
-    queue_sizes, lut_percentages = dp.get_lut_utilization(data_dict)
-
-    # Get architecture-specific style
-    style = (
-        get_arch_style(arch_name)
-        if arch_name
-        else {"color": "green", "marker": "d", "display_name": "Architecture"}
-    )
-
-    ax.plot(
-        queue_sizes,
-        lut_percentages,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
-    )
-
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("LUT Utilization (%)")
-    ax.set_title(title or "LUT Utilization Percentage vs Queue Size")
-    ax.set_xscale("log", base=2)
-    ax.set_yscale("log")
-    ax.grid(True)
-
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
+    samples = data if samples is None else samples
+    data = as_data_dicts(data)
+    panels = list(panels)
+    table = panel_table(data, panels)
+    for ax, panel in zip(np.ravel(axs), panels):
+        if panel is None:
+            ax.set_visible(False)
+        else:
+            draw_panel(ax, table, panel, samples, data)
 
 
-def plot_register_usage_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+def plot_metric_vs_queue_size(ax, data_dict, spec, title=None, arch_name=None):
     """
-    Plot register usage vs queue size.
+    Plot one metric of one architecture vs queue size.
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
+        data_dict (dict or ResultsDataset): Data from parsers.process_directory
+        spec (str): Key of PANEL_SPECS
         title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
+        arch_name (str, optional): Architecture name to determine plot style; a legend is
+            only added when given
     """
-    queue_sizes, registers = dp.get_register_usage(data_dict)
-
-    # Get architecture-specific style
-    style = (
-        get_arch_style(arch_name)
-        if arch_name
-        else {"color": "purple", "marker": "^", "display_name": "Architecture"}
-    )
+    draw_panels([ax], {arch_name or "": data_dict}, [{"spec": spec, "title": title, "legend": bool(arch_name)}])
 
-    ax.plot(
-        queue_sizes,
-        registers,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
-    )
 
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("Register Usage (Count)")
-    ax.set_title(title or "Register Usage vs Queue Size")
-    ax.set_xscale("log", base=2)
-    ax.grid(True)
+def plot_frequency_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot the maximum achieved frequency vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "frequency", title, arch_name)
 
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
 
+def plot_lut_usage_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot LUT usage vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "lut_usage", title, arch_name)
 
-def plot_register_utilization_vs_queue_size(ax, data_dict, title=None, arch_name=None):
-    """
-    Plot register utilization percentage vs queue size.
 
-    Args:
-        ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
-        title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
-    """
-    queue_sizes, reg_percentages = dp.get_register_utilization(data_dict)
+def plot_lut_utilization_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot LUT utilization percentage vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "lut_utilization", title, arch_name)
 
-    # Get architecture-specific style
-    style = (
-        get_arch_style(arch_name)
-        if arch_name
-        else {"color": "orange", "marker": "*", "display_name": "Architecture"}
-    )
 
-    ax.plot(
-        queue_sizes,
-        reg_percentages,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
-    )
+def plot_register_usage_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot register usage vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "register_usage", title, arch_name)
 
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("Register Utilization (%)")
-    ax.set_title(title or "Register Utilization Percentage vs Queue Size")
-    ax.set_xscale("log", base=2)
-    ax.set_yscale("log")
-    ax.grid(True)
 
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
+def plot_register_utilization_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot register utilization percentage vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "register_utilization", title, arch_name)
 
 
 def plot_bram_usage_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot BRAM usage vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "bram_usage", title, arch_name)
+
+
+def plot_bram_utilization_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    """Plot BRAM utilization percentage vs queue size, see plot_metric_vs_queue_size."""
+    plot_metric_vs_queue_size(ax, data_dict, "bram_utilization", title, arch_name)
+
+
+def plot_performance_comparison(ax, data_dict, arch_list, operation, title=None, pareto=False, bands=True, samples=None):
     """
-    Plot BRAM usage vs queue size.
+    Plot performance comparison across different architectures for a specific operation.
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
+        data_dict (dict or ResultsDataset): Dictionary of data dictionaries for each architecture
+        arch_list (list): List of architecture names
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
         title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
+        pareto (bool, optional): Circle the points on the throughput/area/power Pareto frontier
+        bands (bool, optional): Shade the confidence interval of the sustainable Fmax, when
+            the data holds every frequency point (LazyResults or ResultsDataset)
+        samples (LazyResults or ResultsDataset, optional): Frequency points for the bands,
+            when data_dict only holds data dictionaries
     """
-    queue_sizes, brams = dp.get_bram_usage(data_dict)
-
-    # Get architecture-specific style
-    style = (
-        get_arch_style(arch_name)
-        if arch_name
-        else {"color": "brown", "marker": "D", "display_name": "Architecture"}
-    )
+    panel = {"spec": "performance", "operation": operation, "archs": arch_list, "title": title, "pareto": pareto, "bands": bands}
+    draw_panels([ax], data_dict, [panel], samples)
 
-    ax.plot(
-        queue_sizes,
-        brams,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
-    )
 
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("BRAM Usage (Count)")
-    ax.set_title(title or "BRAM Usage vs Queue Size")
-    ax.set_xscale("log", base=2)
-    ax.grid(True)
-
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
+def plot_frequency_band(ax, samples, data_dict, arch_name, operation, per_resource=False):
+    """
+    Draw the sustainable Fmax as a dashed line in its shaded confidence interval, scaled to
+    performance or efficiency.
 
+    Args:
+        ax (matplotlib.axes.Axes): The axes to plot on
+        samples (LazyResults or ResultsDataset): Frequency points of the architectures
+        data_dict (dict): Data dictionary of the architecture
+        arch_name (str): Architecture key
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
+        per_resource (bool, optional): Divide by resource utilization, as efficiency plots do
 
-def plot_bram_utilization_vs_queue_size(ax, data_dict, title=None, arch_name=None):
+    Returns:
+        bool: Whether the samples had a band for the architecture.
+    """
+    utilization = dp.compute_resource_utilization(data_dict) if per_resource else None
+    return _draw_frequency_band(ax, samples, arch_name, operation, utilization)
+
+
+def _draw_frequency_band(ax, samples, arch_name, operation, utilization=None):
+    # utilization is ([queue sizes], [resource utilization]) for efficiency bands
+    band = frequency_bands(samples, arch_name)
+    if band is None:
+        return False
+    queue_sizes, sustainable, lower, upper = band
+    factors = ops_per_cycle(arch_name, operation, queue_sizes)
+    sustainable, lower, upper = sustainable * factors, lower * factors, upper * factors
+    if utilization is not None:
+        util_sizes, utilization = utilization
+        present = np.isin(queue_sizes, util_sizes)
+        utilization = utilization[np.searchsorted(util_sizes, queue_sizes[present])]
+        queue_sizes = queue_sizes[present]
+        sustainable, lower, upper = (values[present] / utilization for values in (sustainable, lower, upper))
+
+    color = get_arch_style(arch_name)["color"]
+    ax.plot(queue_sizes, sustainable, "--", color=color, linewidth=2)
+    ax.fill_between(queue_sizes, lower, upper, color=color, alpha=0.2, linewidth=0)
+    return True
+
+
+def plot_pareto_overlay(ax, data_dict, arch_list, operation):
     """
-    Plot BRAM utilization percentage vs queue size.
+    Circle the performance points on the Pareto frontier of throughput, area and power.
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Data from parsers.process_directory
-        title (str, optional): Custom title for the plot
-        arch_name (str, optional): Architecture name to determine plot style
+        data_dict (dict or ResultsDataset): Dictionary of data dictionaries for each architecture
+        arch_list (list): List of architecture names
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
     """
-    # Check if data_dict is a dictionary before calling get_bram_utilization
-    if not isinstance(data_dict, dict):
+    points = [
+        point
+        for frontier in pareto_frontier(data_dict, operation, arch_list=arch_list).values()
+        for point in frontier["points"]
+        if point["pareto"]
+    ]
+    if not points:
         return
-    queue_sizes, bram_percentages = dp.get_bram_utilization(data_dict)
-
-    # Get architecture-specific style
-    style = get_arch_style(arch_name)
-
-    ax.plot(
-        queue_sizes,
-        bram_percentages,
-        f"{style['marker']}-",
-        color=style["color"],
-        linewidth=4,
-        label=style["display_name"],
-        markersize=14,
+    ax.scatter(
+        [point["queue_size"] for point in points],
+        [point["objectives"][f"{operation}_performance"] for point in points],
+        s=900,
+        facecolors="none",
+        edgecolors="black",
+        linewidths=2.5,
+        zorder=5,
+        label="Pareto Frontier",
     )
 
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("BRAM Utilization (%)")
-    # ax.set_xlabel("Queue Size", fontsize=32)
-    # ax.set_ylabel("BRAM Utilization (%)", fontsize=32)
-    ax.set_title(title or "BRAM Utilization Percentage vs Queue Size")
-    # ax.set_title(title)
-    ax.set_xscale("log", base=2)
-    ax.set_yscale("log")
-    ax.grid(True)
-
-    # Add legend if plotting multiple architectures
-    if arch_name:
-        ax.legend()
 
-    # Make axis scales larger
-    # ax.tick_params(axis='both', which='major', labelsize=24)
-    # ax.tick_params(axis='both', which='minor', labelsize=24)
-
-
-def plot_performance_comparison(ax, data_dict, arch_list, operation, title=None):
+def plot_performance_comparison_nolegend(ax, data_dict, arch_list, operation, title=None):
     """
-    Plot performance comparison across different architectures for a specific operation.
+    Plot performance comparison across different architectures for a specific operation,
+    without a legend and in the large fonts of presentation figures.
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Dictionary of data dictionaries for each architecture
+        data_dict (dict or ResultsDataset): Dictionary of data dictionaries for each architecture
         arch_list (list): List of architecture names
         operation (str): Operation type ('enqueue', 'dequeue', 'replace')
         title (str, optional): Custom title for the plot
     """
-    for arch_name in arch_list:
-        if arch_name in data_dict:
-            # Get architecture-specific style
-            style = get_arch_style(arch_name)
+    panel = {"spec": "performance", "operation": operation, "archs": arch_list, "title": title, "bands": False, "legend": False}
+    draw_panels([ax], data_dict, [panel])
+    for text in (ax.xaxis.label, ax.yaxis.label, ax.title):
+        text.set_fontsize(32)
+    ax.tick_params(axis="both", which="both", labelsize=24)
 
-            # Check if data_dict[arch_name] is a dictionary before calling compute_performance
-            if isinstance(data_dict[arch_name], dict):
-                queue_sizes, performance = dp.compute_performance(
-                    data_dict[arch_name], arch_name, operation
-                )
-            else:
-                continue
-            
-            # Plot line with markers
-            ax.plot(
-                queue_sizes,
-                performance,
-                f"{style['marker']}-",
-                color=style["color"],
-                label=style["display_name"],
-                linewidth=4,
-                markersize=14,
-            )
 
-            # if len(queue_sizes) > 0 and (arch_name.startswith("hybrid")):
-
-            #     ax.annotate(
-            #         f"{queue_sizes[0]}",
-            #         (queue_sizes[0], performance[0]),
-            #         textcoords="offset points",
-            #         xytext=(10, 10),
-            #         ha='center',
-            #         fontsize=18
-            #     )
-
-            #     ax.annotate(
-            #         f"{queue_sizes[1]}",
-            #         (queue_sizes[1], performance[1]),
-            #         textcoords="offset points",
-            #         xytext=(10, 10),
-            #         ha='center',
-            #         fontsize=18
-            #     )
-
-            #     ax.annotate(
-            #         f"{queue_sizes[2]}",
-            #         (queue_sizes[2], performance[2]),
-            #         textcoords="offset points",
-            #         xytext=(10, 10),
-            #         ha='center',
-            #         fontsize=18
-            #     )
-
-            #     ax.annotate(
-            #         f"{queue_sizes[3]}",
-            #         (queue_sizes[3], performance[3]),
-            #         textcoords="offset points",
-            #         xytext=(10, 10),
-            #         ha='center',
-            #         fontsize=18
-            #     )
-
-    # ax.set_xlabel("Queue Size", fontsize=32)
-    # ax.set_ylabel("Performance (MHz * ops/cycle)", fontsize=32)
-    # ax.set_title(title or f"{operation.capitalize()} Performance", fontsize=32)
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("Performance (MOPS/s)")
-    ax.set_title(title or f"{operation.capitalize()} Performance")
-    # ax.set_title(title)
-    # ax.set_title(title, fontsize=32)
-    ax.set_xscale("log", base=2)
-    ax.grid(True)
-    ax.legend()
-    # ax.legend(fontsize=14)
-    # Make axis scales larger
-    # ax.tick_params(axis='both', which='major', labelsize=24)
-    # ax.tick_params(axis='both', which='minor', labelsize=24)
+def plot_resource_comparison(ax, data_dict, arch_list, title=None):
+    draw_panels([ax], data_dict, [{"spec": "resource_utilization", "archs": arch_list, "title": title}])
 
 
-def plot_performance_comparison_nolegend(ax, data_dict, arch_list, operation, title=None):
+def plot_efficiency_comparison(ax, data_dict, arch_list, operation, title=None, bands=True, samples=None):
     """
-    Plot performance comparison across different architectures for a specific operation.
+    Plot resource utilization efficiency comparison across architectures.
+    Lower values are better (less resources per performance unit).
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Dictionary of data dictionaries for each architecture
+        data_dict (dict or ResultsDataset): Dictionary of data dictionaries for each architecture
         arch_list (list): List of architecture names
         operation (str): Operation type ('enqueue', 'dequeue', 'replace')
         title (str, optional): Custom title for the plot
+        bands (bool, optional): Shade the confidence interval of the sustainable Fmax, when
+            the data holds every frequency point (LazyResults or ResultsDataset)
+        samples (LazyResults or ResultsDataset, optional): Frequency points for the bands,
+            when data_dict only holds data dictionaries
     """
-    for arch_name in arch_list:
-        if arch_name in data_dict:
-            # Get architecture-specific style
-            style = get_arch_style(arch_name)
-
-            # Check if data_dict[arch_name] is a dictionary before calling compute_performance
-            if isinstance(data_dict[arch_name], dict):
-                queue_sizes, performance = dp.compute_performance(
-                    data_dict[arch_name], arch_name, operation
-                )
-            else:
-                continue
-            
-            # Plot line with markers
-            ax.plot(
-                queue_sizes,
-                performance,
-                f"{style['marker']}-",
-                color=style["color"],
-                label=style["display_name"],
-                linewidth=4,
-                # linewidth=2,
-                markersize=16,
-            )
-
-            # Add queue size labels at each marker
-            # for i, (x, y) in enumerate(zip(queue_sizes, performance)):
-            #     ax.annotate(
-            #         f"{x}",
-            #         (x, y),
-            #         textcoords="offset points",
-            #         xytext=(10, 10),
-            #         ha='center',
-            #         fontsize=18
-            #     )
-
-    ax.set_xlabel("Queue Size", fontsize=32)
-    ax.set_ylabel("Performance (MHz * ops/cycle)", fontsize=32)
-    # ax.set_title(title or f"{operation.capitalize()} Performance", fontsize=32)
-    # ax.set_xlabel("Queue Size")
-    # ax.set_ylabel("Performance (MHz * ops/cycle)")
-    # ax.set_title(title or f"{operation.capitalize()} Performance")
-    ax.set_title(title, fontsize=32)
-    ax.set_xscale("log", base=2)
-    ax.grid(True)
-    # Make axis scales larger
-    ax.tick_params(axis='both', which='major', labelsize=24)
-    ax.tick_params(axis='both', which='minor', labelsize=24)
+    panel = {"spec": "efficiency", "operation": operation, "archs": arch_list, "title": title, "bands": bands}
+    draw_panels([ax], data_dict, [panel], samples)
 
 
-def plot_resource_comparison(ax, data_dict, arch_list, title=None):
-    for arch_name in arch_list:
-        if arch_name in data_dict:
-            # Get architecture-specific style
-            style = get_arch_style(arch_name)
-
-            # Check if data_dict[arch_name] is a dictionary before calling compute_resource_utilization
-            if isinstance(data_dict[arch_name], dict):
-                queue_sizes, resource_utilization = dp.compute_resource_utilization(
-                    data_dict[arch_name]
-                )
-            else:
-                continue
-            ax.plot(
-                queue_sizes,
-                resource_utilization,
-                f"{style['marker']}-",
-                color=style["color"],
-                label=style["display_name"],
-                linewidth=4,
-                markersize=14,
-            )
-
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("FPGA Resource Utilization (%)")
-    ax.set_title(title or "FPGA Resource Utilization vs Queue Size")
-    ax.set_xscale("log", base=2)
-    ax.set_yscale("log")
-    ax.grid(True)
-    ax.legend()
-
-
-def plot_efficiency_comparison(ax, data_dict, arch_list, operation, title=None):
+def plot_energy_comparison(ax, data_dict, arch_list, operation, title=None, per_watt=False):
     """
-    Plot resource utilization efficiency comparison across architectures.
-    Lower values are better (less resources per performance unit).
+    Plot energy per operation, or throughput per watt, across architectures.
+    Energy: lower is better. Throughput per watt: higher is better.
 
     Args:
         ax (matplotlib.axes.Axes): The axes to plot on
-        data_dict (dict): Dictionary of data dictionaries for each architecture
+        data_dict (dict or ResultsDataset): Dictionary of data dictionaries for each architecture
         arch_list (list): List of architecture names
         operation (str): Operation type ('enqueue', 'dequeue', 'replace')
         title (str, optional): Custom title for the plot
+        per_watt (bool, optional): Plot MOPS/W instead of nJ/op
     """
-    for arch_name in arch_list:
-        if arch_name in data_dict:
-            # Get architecture-specific style
-            style = get_arch_style(arch_name)
+    panel = {"spec": "performance_per_watt" if per_watt else "energy", "operation": operation, "archs": arch_list, "title": title}
+    draw_panels([ax], data_dict, [panel])
 
-            # Check if data_dict[arch_name] is a dictionary before calling compute_resource_utilization_efficiency
-            if isinstance(data_dict[arch_name], dict):
-                queue_sizes, efficiency = dp.compute_resource_utilization_efficiency(
-                    data_dict[arch_name], arch_name, operation
-                )
-            else:
-                continue
-
-            ax.plot(
-                queue_sizes,
-                efficiency,
-                f"{style['marker']}-",
-                color=style["color"],
-                label=style["display_name"],
-                linewidth=4,
-                markersize=14,
-            )
 
-    ax.set_xlabel("Queue Size")
-    ax.set_ylabel("Performance / Resource")
-    ax.set_title(title or f"{operation.capitalize()} Resource Efficiency")
-    ax.set_xscale("log", base=2)
-    ax.set_yscale("log")
-    ax.grid(True)
-    ax.legend(fontsize=12)
+def write_energy_ranking(data_dict, arch_list, operation, output_path):
+    """
+    Write the ranking of architectures by throughput per watt at every queue size.
+
+    Args:
+        data_dict (dict or LazyResults): Dictionary of data dictionaries for each architecture
+        arch_list (list): List of architecture names
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
+        output_path (str): Path of the text file
+    """
+    with open(output_path, "w") as f:
+        f.write(f"{operation.capitalize()} ranking by performance per watt\n")
+        for bucket, ranking in dp.rank_energy_efficiency(as_data_dicts(data_dict), operation, arch_list).items():
+            f.write(f"\nQueue size ~{bucket}\n")
+            for rank, entry in enumerate(ranking, 1):
+                f.write(
+                    f"  {rank:2d}. {entry['arch']:40s} N={entry['queue_size']:<7d} {entry['performance']:8.1f} MOPS "
+                    f"{entry['power']:6.3f} W {entry['energy']:8.2f} nJ/op {entry['performance_per_watt']:8.1f} MOPS/W\n"
+                )
+    print(f"Saved energy ranking to {output_path}")
 
 
 def create_summary_plots(data_dict, architecture, output_path=None, enqueue_option=None):
@@ -646,7 +590,7 @@ def create_summary_plots(data_dict, architecture, output_path=None, enqueue_opti
     Create a summary of plots for a specific architecture.
 
     Args:
-        data_dict (dict): Data from parsers.process_directory
+        data_dict (dict or ResultsDataset): Data from parsers.process_directory
         architecture (str): Name of the architecture being analyzed
         output_path (str, optional): Path to save the figure to
         enqueue_option (str, optional): "enabled", "disabled", or None for architectures without enqueue variants
@@ -670,28 +614,21 @@ def create_summary_plots(data_dict, architecture, output_path=None, enqueue_opti
     if enqueue_option:
         arch_key += f"_enq_{enqueue_option}"
 
-    # Row 1: Basic metrics
-    plot_frequency_vs_queue_size(axs[0, 0], data_dict, arch_name=arch_key)
-    plot_lut_usage_vs_queue_size(axs[0, 1], data_dict, arch_name=arch_key)
-    plot_register_usage_vs_queue_size(axs[0, 2], data_dict, arch_name=arch_key)
-
-    # Row 2: Utilization percentages and BRAM
-    plot_lut_utilization_vs_queue_size(axs[1, 0], data_dict, arch_name=arch_key)
-    plot_register_utilization_vs_queue_size(axs[1, 1], data_dict, arch_name=arch_key)
-    plot_bram_usage_vs_queue_size(axs[1, 2], data_dict, arch_name=arch_key)
-
-    # Row 3: Performance for different operations
-    operations = ["enqueue", "dequeue", "replace"]
-    for idx, operation in enumerate(operations):
-        # Skip enqueue plot if enqueue is disabled
-        if operation == "enqueue" and enqueue_option == "disabled":
-            axs[2, idx].set_visible(False)
-            continue
-            
-        # Create dummy comparison with just this architecture
-        arch_list = [arch_key]
-        dummy_dict = {arch_key: data_dict}
-        plot_performance_comparison(axs[2, idx], dummy_dict, arch_list, operation)
+    panels = [
+        # Row 1: Basic metrics
+        {"spec": "frequency"},
+        {"spec": "lut_usage"},
+        {"spec": "register_usage"},
+        # Row 2: Utilization percentages and BRAM
+        {"spec": "lut_utilization"},
+        {"spec": "register_utilization"},
+        {"spec": "bram_usage"},
+    ]
+    # Row 3: Performance for different operations, skipping enqueue if it is disabled
+    for operation in OPERATIONS:
+        hidden = operation == "enqueue" and enqueue_option == "disabled"
+        panels.append(None if hidden else {"spec": "performance", "operation": operation})
+    draw_panels(axs, {arch_key: data_dict}, panels)
 
     # Adjust layout
     plt.tight_layout(rect=(0, 0, 1, 0.97))  # Leave space for suptitle
@@ -711,13 +648,14 @@ def create_architecture_variant_comparison(variant_data_dict, base_architecture,
     different options like cycled, enqueue enabled/disabled).
 
     Args:
-        variant_data_dict (dict): Dictionary mapping variant names to their data dictionaries
+        variant_data_dict (dict or ResultsDataset): Dictionary mapping variant names to their data dictionaries
         base_architecture (str): Base name of the architecture (e.g., "RegisterArray")
         output_path (str, optional): Path to save the figure to
 
     Returns:
         matplotlib.figure.Figure: The figure containing the comparison plots
     """
+    variant_data_dict = as_data_dicts(variant_data_dict)
     # Create a 5x3 grid to match the style of create_comparison_plots
     # fig, axs = plt.subplots(5, 3, figsize=(32, 40))
     fig, axs = plt.subplots(1, 2, figsize=(24, 10))
@@ -801,12 +739,13 @@ def create_comparison_plots(data_dict_dict, output_path=None):
     Create a comparison of all architectures.
 
     Args:
-        data_dict_dict (dict): Dictionary mapping architecture names to their data dictionaries
+        data_dict_dict (dict or ResultsDataset): Dictionary mapping architecture names to their data dictionaries
         output_path (str, optional): Path to save the figure to
 
     Returns:
         matplotlib.figure.Figure: The figure containing all comparison plots
     """
+    data_dict_dict = as_data_dicts(data_dict_dict)
     # Get available architecture names from the data
     arch_list = list(data_dict_dict.keys())
 
@@ -816,79 +755,32 @@ def create_comparison_plots(data_dict_dict, output_path=None):
         "Hardware Queue Architecture Comparison", fontsize=32, y=0.97
     )  # Adjusted y position
 
-    # Row 1: Maximum achieved frequency comparison
-    # Plot 1: Maximum achieved frequency comparison
-    for arch_name, data_dict in data_dict_dict.items():
-        plot_frequency_vs_queue_size(axs[0, 0], data_dict, arch_name=arch_name)
-
-    axs[0, 1].set_visible(False)  # Empty plot for layout balance
-    axs[0, 2].set_visible(False)  # Empty plot for layout balance
-
-    # Row 2: Resource utilization comparisons
-    # Plot 2: LUT utilization comparison
-    for arch_name, data_dict in data_dict_dict.items():
-        plot_lut_utilization_vs_queue_size(axs[1, 0], data_dict, arch_name=arch_name)
-
-    # Plot 3: Register utilization comparison
-    for arch_name, data_dict in data_dict_dict.items():
-        plot_register_utilization_vs_queue_size(axs[1, 1], data_dict, arch_name=arch_name)
-
-    # Plot 4: BRAM utilization comparison
-    for arch_name, data_dict in data_dict_dict.items():
-        plot_bram_utilization_vs_queue_size(axs[1, 2], data_dict, arch_name=arch_name)
-
-    # Row 2 and 3: Performance and efficiency comparisons
-    operations = ["enqueue", "dequeue", "replace"]
-
-    # Performance comparisons for different operations
-    # Create filtered arch_list for enqueue operation 
-    # Exclude BRAM trees and hybrid trees which don't support enqueue
-    # Also exclude architectures with enqueue disabled
-    enqueue_arch_list = [
-        arch for arch in arch_list 
-        if "bram_tree" not in arch.lower() 
-        and "hybrid_tree" not in arch.lower()
-        and "enq_disabled" not in arch.lower()
+    # Filtered list for enqueue operations, with the architectures that support it
+    enqueue_arch_list = [arch for arch in arch_list if supports(arch, "enqueue")]
+
+    panels = [
+        # Row 1: Maximum achieved frequency comparison
+        {"spec": "frequency"},
+        None,
+        None,
+        # Row 2: Resource utilization comparisons
+        {"spec": "lut_utilization"},
+        {"spec": "register_utilization"},
+        {"spec": "bram_utilization"},
+        # Row 3: Performance, with dequeue and replace combined
+        {"spec": "performance", "operation": "enqueue", "archs": enqueue_arch_list},
+        {"spec": "performance", "operation": "replace", "title": "Dequeue and Replace Performance"},
+        None,
+        # Row 4: Resource efficiency, with dequeue and replace combined
+        {"spec": "efficiency", "operation": "enqueue", "archs": enqueue_arch_list},
+        {"spec": "efficiency", "operation": "replace", "title": "Dequeue and Replace Efficiency"},
+        None,
+        # Row 5: Resource utilization comparison
+        {"spec": "resource_utilization"},
+        None,
+        None,
     ]
-    enqueue_data_dict = {
-        arch: data
-        for arch, data in data_dict_dict.items()
-        if "bram_tree" not in arch.lower() 
-        and "hybrid_tree" not in arch.lower()
-        and "enq_disabled" not in arch.lower() 
-    }
-
-    # Use filtered lists for enqueue operations
-    plot_performance_comparison(
-        axs[2, 0], enqueue_data_dict, enqueue_arch_list, operations[0]
-    )  # Enqueue performance
-    
-    # Combined Dequeue and Replace Performance plot
-    plot_performance_comparison(
-        axs[2, 1], data_dict_dict, arch_list, operations[2], title="Dequeue and Replace Performance"
-    )  # Combined Dequeue and Replace performance
-    
-    # Empty plot for layout balance
-    axs[2, 2].set_visible(False)
-
-    # Resource efficiency comparisons for different operations
-    plot_efficiency_comparison(
-        axs[3, 0], enqueue_data_dict, enqueue_arch_list, operations[0]
-    )  # Enqueue efficiency
-    
-    # Combined Dequeue and Replace Efficiency plot
-    plot_efficiency_comparison(
-        axs[3, 1], data_dict_dict, arch_list, operations[2], title="Dequeue and Replace Efficiency"
-    )  # Combined Dequeue and Replace efficiency
-    
-    # Empty plot for layout balance
-    axs[3, 2].set_visible(False)
-
-    # Row 4: Resource utilization comparisons
-    plot_resource_comparison(axs[4, 0], data_dict_dict, arch_list)
-
-    axs[4, 1].set_visible(False)  # Empty plot for layout balance
-    axs[4, 2].set_visible(False)  # Empty plot for layout balance
+    draw_panels(axs, data_dict_dict, panels)
 
     # Adjust layout
     plt.tight_layout(rect=(0, 0, 1, 0.97))  # Modified to a more moderate top margin
@@ -910,7 +802,7 @@ def create_multi_arch_plot(
 
     Args:
         plot_function (function): The plotting function to use
-        data_dict_dict (dict): Dictionary mapping architecture names to their data dictionaries
+        data_dict_dict (dict or ResultsDataset): Dictionary mapping architecture names to their data dictionaries
         operation (str, optional): Operation type for performance/efficiency plots
         title (str, optional): Custom title for the plot
         output_path (str, optional): Path to save the figure to
@@ -918,6 +810,7 @@ def create_multi_arch_plot(
     Returns:
         matplotlib.figure.Figure: The figure containing the plot
     """
+    data_dict_dict = as_data_dicts(data_dict_dict)
     # Create figure and axes
     fig, ax = plt.subplots(figsize=(12, 8))
 
@@ -947,15 +840,16 @@ def create_focused_comparison(data_dict_dict, output_path=None):
     and register tree (enqueue enabled) architectures.
 
     Args:
-        data_dict_dict (dict): Dictionary mapping architecture names to their data dictionaries
+        data_dict_dict (dict, LazyResults or ResultsDataset): Dictionary mapping architecture names to their data dictionaries
         output_path (str, optional): Path to save the figure to
 
     Returns:
         matplotlib.figure.Figure: The figure containing the comparison plots
     """
-    # Filter to only include the specified architectures
+    data_dict_dict = as_data_dicts(data_dict_dict)
+    # Filter to only include the specified architectures, by key so a LazyResults only parses those
     focused_archs = {
-        k: v for k, v in data_dict_dict.items() 
+        k: data_dict_dict[k] for k in data_dict_dict
         # if k in ["register_tree_enq_enabled", "register_tree_cycled_enq_enabled", "register_tree_enq_disabled", "register_tree_cycled_enq_disabled", "register_array_enq_enabled", "register_array_cycled_enq_enabled", "register_array_enq_disabled", "register_array_cycled_enq_disabled"]
         # if k in ["hybrid_tree", "bram_tree", "bram_tree_pipelined"]
         # if k in ["systolic_array", "register_array_enq_enabled", "register_tree_enq_enabled"] # register-based architectures
@@ -1008,211 +902,645 @@ def create_focused_comparison(data_dict_dict, output_path=None):
     return fig
 
 
-def process_and_plot_all(base_dir, output_dir=None):
+# Individual figures written by process_and_plot_all
+INDIVIDUAL_FIGURES = (
+    "frequency_comparison",
+    "lut_utilization_comparison",
+    "register_utilization_comparison",
+    "bram_utilization_comparison",
+    "lut_usage_comparison",
+    "register_usage_comparison",
+    "enqueue_performance_comparison",
+    "enqueue_efficiency_comparison",
+    "dequeue_performance_comparison",
+    "dequeue_efficiency_comparison",
+    "replace_performance_comparison",
+    "replace_efficiency_comparison",
+    "resource_comparison",
+    "enqueue_energy_comparison",
+    "enqueue_performance_per_watt_comparison",
+    "dequeue_energy_comparison",
+    "dequeue_performance_per_watt_comparison",
+    "replace_energy_comparison",
+    "replace_performance_per_watt_comparison",
+)
+
+# Architectures that store queue entries in BRAM
+BRAM_ARCHITECTURES = ["hybrid_tree", "bram_tree", "bram_tree_pipelined"]
+
+
+def figure_architectures(figure, arch_keys):
     """
-    Process all directories and create plots for each architecture.
+    Select the architectures an individual figure plots, without loading their data.
 
     Args:
-        base_dir (str): Base directory containing subdirectories for each architecture
-        output_dir (str, optional): Directory to save plots to
+        figure (str): Name of the figure, one of INDIVIDUAL_FIGURES
+        arch_keys (iterable): Available architecture keys
+
+    Returns:
+        list: Architecture keys drawn in the figure.
     """
-    # Create output directory if not provided
-    if not output_dir:
-        output_dir = os.path.join(base_dir, "plots")
+    if figure == "bram_utilization_comparison":
+        return [k for k in arch_keys if k in BRAM_ARCHITECTURES]
+    for operation in OPERATIONS:
+        if figure.startswith(f"{operation}_"):
+            # Only architectures that support the operation
+            return [k for k in arch_keys if supports(k, operation)]
+    return list(arch_keys)
 
-    # Setup plot style
-    setup_plot_style()
 
-    # Dictionary to collect data for comparison plots
-    all_data = {}
+# Figure comparing the devices, written by process_and_plot_all when several are plotted
+CROSS_DEVICE_FIGURE = "cross_device_comparison"
 
-    # Process each architecture directory
-    for arch_dir in os.listdir(base_dir):
-        arch_path = os.path.join(base_dir, arch_dir)
+# Line style of each device in cross-device plots, in device order
+DEVICE_LINESTYLES = ["-", "--", ":", "-."]
 
-        # Skip if not a directory or doesn't contain vivado_analysis_results
-        if not os.path.isdir(arch_path):
-            continue
-        
-        # NOTE - Only process xcau25p architectures - you can change "xcau25p" to different FPGA device
-        results_dirs = [
-            d for d in os.listdir(arch_path) if "vivado_analysis_results" in d and "xcau25p" in d
-            # NOTE - Uncomment to process data collected from xcvu19p architectures
-            # d for d in os.listdir(arch_path) if "vivado_analysis_results" in d and "xcvu19p" in d
-        ]
-
-        if not results_dirs:
-            continue
 
-        # Process each results directory
-        for results_dir in results_dirs:
-            log_dir = os.path.join(arch_path, results_dir)
+def create_cross_device_comparison(data_by_device, output_path=None, dpi=300):
+    """
+    Compare architectures implemented on several FPGA devices. Achieved frequency is
+    plotted as is, LUT and register utilization normalized against each device's totals.
 
-            # Skip if not a directory
-            if not os.path.isdir(log_dir):
-                continue
+    Args:
+        data_by_device (dict): Maps devices to dictionaries (or LazyResults) mapping
+            architecture names to their data dictionaries
+        output_path (str, optional): Path to save the figure to
+        dpi (int, optional): Resolution of the saved figure
 
-            # Process data
-            result = parsers.process_directory(log_dir)
+    Returns:
+        matplotlib.figure.Figure: The figure, or None if no architecture was implemented on two devices
+    """
+    data_by_device = {device: as_data_dicts(data_dicts) for device, data_dicts in data_by_device.items()}
 
-            # Handle special case for architectures with enqueue variants
-            if isinstance(result, tuple) and len(result) == 2:
-                enq_disabled_data, enq_enabled_data = result
-                
-                # Skip if no data
-                if not enq_disabled_data or not enq_enabled_data:
-                    print(f"No data found in {log_dir}")
-                    continue
-                
-                # Store both variants with different keys
-                if arch_dir == "register_array":
-                    all_data["register_array_enq_disabled"] = enq_disabled_data
-                    all_data["register_array_enq_enabled"] = enq_enabled_data
-                elif arch_dir == "register_array_pipelined":
-                    all_data["register_array_pipelined_enq_disabled"] = enq_disabled_data
-                    all_data["register_array_pipelined_enq_enabled"] = enq_enabled_data
-                elif arch_dir == "register_tree":
-                    all_data["register_tree_enq_disabled"] = enq_disabled_data
-                    all_data["register_tree_enq_enabled"] = enq_enabled_data
-                elif arch_dir == "register_tree_pipelined":
-                    all_data["register_tree_pipelined_enq_disabled"] = enq_disabled_data
-                    all_data["register_tree_pipelined_enq_enabled"] = enq_enabled_data
-                elif arch_dir == "systolic_array":
-                    # Systolic array doesn't have enqueue variants in the same way
-                    all_data["systolic_array"] = enq_enabled_data  # Systolic array always enables enqueue
-                else:
-                    # Generic handling for other architectures with enqueue variants
-                    all_data[f"{arch_dir.lower()}_enq_disabled"] = enq_disabled_data
-                    all_data[f"{arch_dir.lower()}_enq_enabled"] = enq_enabled_data
-            else: # Regular case for other architectures
-                data_dict = result
-
-                # Skip if no data
-                if not data_dict:
-                    print(f"No data found in {log_dir}")
+    # Select shared architectures by key first, so a LazyResults only parses those
+    shared = shared_architectures(data_by_device)
+    joined = dp.join_devices(
+        {device: {k: data_dicts[k] for k in shared if k in data_dicts} for device, data_dicts in data_by_device.items()}
+    )
+    if not joined:
+        print("No architecture was implemented on more than one device")
+        return None
+
+    panels = [
+        ("max_achieved_frequency", "Maximum Achieved Frequency (MHz)", "Maximum Achieved Frequency vs Queue Size"),
+        ("luts_device_percent", "LUT Utilization (% of device)", "LUT Utilization vs Queue Size"),
+        ("registers_device_percent", "Register Utilization (% of device)", "Register Utilization vs Queue Size"),
+    ]
+    fig, axs = plt.subplots(1, len(panels), figsize=(36, 10))
+    for ax, (metric, ylabel, title) in zip(axs, panels):
+        for arch_name, by_size in joined.items():
+            style = get_arch_style(arch_name)
+            for idx, device in enumerate(data_by_device):
+                # Plot each device against its own queue sizes
+                points = [
+                    (by_device[device]["queue_size"], by_device[device][metric])
+                    for by_device in by_size.values()
+                    if device in by_device and metric in by_device[device]
+                ]
+                if not points:
                     continue
+                queue_sizes, values = zip(*points)
+                ax.plot(
+                    queue_sizes,
+                    values,
+                    marker=style["marker"],
+                    linestyle=DEVICE_LINESTYLES[idx % len(DEVICE_LINESTYLES)],
+                    color=style["color"],
+                    linewidth=4,
+                    label=f"{style['display_name']} ({device})",
+                    markersize=14,
+                )
 
-                # Store data for comparison
-                all_data[arch_dir] = data_dict
-
-    # Create individual plots if we have data for multiple architectures
-    if len(all_data) > 1:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Create directory for individual plots
-        individual_plots_dir = os.path.join(output_dir, f"individual_plots_{timestamp}")
-        os.makedirs(individual_plots_dir, exist_ok=True)
-        
-        # Generate individual plots for frequency comparison
-        fig, ax = plt.subplots(figsize=(30, 10))
-        for arch_name, data_dict in all_data.items():
-            plot_frequency_vs_queue_size(ax, data_dict, arch_name=arch_name)
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])  # Adjust the right margin to make room for the legend
-        plot_path = os.path.join(individual_plots_dir, "frequency_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-        plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
-        # Generate individual plots for LUT utilization
-        fig, ax = plt.subplots(figsize=(30, 10))
-        for arch_name, data_dict in all_data.items():
-            plot_lut_utilization_vs_queue_size(ax, data_dict, arch_name=arch_name)
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plot_path = os.path.join(individual_plots_dir, "lut_utilization_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-        plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
-        # Generate individual plots for register utilization
-        fig, ax = plt.subplots(figsize=(30, 10))
-        for arch_name, data_dict in all_data.items():
-            plot_register_utilization_vs_queue_size(ax, data_dict, arch_name=arch_name)
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plot_path = os.path.join(individual_plots_dir, "register_utilization_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-        plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
-        # Generate individual plots for BRAM utilization (only for BRAM-based architectures)
-        fig, ax = plt.subplots(figsize=(30, 10))
-        bram_archs = {k: v for k, v in all_data.items() if k in ['hybrid_tree', 'bram_tree', 'bram_tree_pipelined']}
-        for arch_name, data_dict in bram_archs.items():
-            plot_bram_utilization_vs_queue_size(ax, data_dict, arch_name=arch_name)
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plot_path = os.path.join(individual_plots_dir, "bram_utilization_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-        plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
-        # Generate individual plots for LUT usage
-        fig, ax = plt.subplots(figsize=(30, 10))
-        for arch_name, data_dict in all_data.items():
-            plot_lut_usage_vs_queue_size(ax, data_dict, arch_name=arch_name)
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plot_path = os.path.join(individual_plots_dir, "lut_usage_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-        plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
-        # Generate individual plots for register usage
-        fig, ax = plt.subplots(figsize=(30, 10))
-        for arch_name, data_dict in all_data.items():
-            plot_register_usage_vs_queue_size(ax, data_dict, arch_name=arch_name)
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plot_path = os.path.join(individual_plots_dir, "register_usage_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-        plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
-        # Generate individual plots for operations
-        operations = ["enqueue", "dequeue", "replace"]
-        for operation in operations:
-            # Filter architectures that support this operation
-            if operation == "enqueue":
-                valid_archs = {k: v for k, v in all_data.items() if "enq_disabled" not in k and not ("bram_tree" in k or "hybrid_tree" in k)}
-            else:
-                valid_archs = all_data
-                
-            if valid_archs:
-                fig, ax = plt.subplots(figsize=(30, 10))
-                plot_performance_comparison(ax, valid_archs, list(valid_archs.keys()), operation)
-                ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-                plt.tight_layout(rect=[0, 0, 0.85, 1])
-                plot_path = os.path.join(individual_plots_dir, f"{operation}_performance_comparison.png")
-                plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-                plt.close(fig)
-                print(f"Saved individual plot to {plot_path}")
-                
-                # Also generate efficiency plots for each operation
-                fig, ax = plt.subplots(figsize=(30, 10))
-                plot_efficiency_comparison(ax, valid_archs, list(valid_archs.keys()), operation)
-                ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-                plt.tight_layout(rect=[0, 0, 0.85, 1])
-                plot_path = os.path.join(individual_plots_dir, f"{operation}_efficiency_comparison.png")
-                plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
-                plt.close(fig)
-                print(f"Saved individual plot to {plot_path}")
-        
-        # Generate resource comparison plot
-        fig, ax = plt.subplots(figsize=(30, 10))
-        plot_resource_comparison(ax, all_data, list(all_data.keys()))
-        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plot_path = os.path.join(individual_plots_dir, "resource_comparison.png")
-        plt.savefig(plot_path, dpi=300, bbox_inches="tight", format="png")
+        ax.set_xlabel("Queue Size")
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.set_xscale("log", base=2)
+        if metric != "max_achieved_frequency":
+            # Devices differ in size by more than an order of magnitude
+            ax.set_yscale("log")
+        ax.grid(True)
+
+    axs[-1].legend(loc='upper left', bbox_to_anchor=(1.02, 1))
+    plt.tight_layout(rect=[0, 0, 0.85, 1])
+
+    # Save if output path provided
+    if output_path:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        plt.savefig(output_path, dpi=dpi, bbox_inches="tight")
+        print(f"Saved cross-device comparison to {output_path}")
+
+    return fig
+
+
+def create_mix_heatmap(data_dict_dict, queue_size, output_path=None, step=0.1, arch_list=None):
+    """
+    Map the best architecture for every enqueue/dequeue/replace mix at one queue size.
+    Each cell is colored by the winning architecture and labeled with its sustained MOPS.
+
+    Args:
+        data_dict_dict (dict or LazyResults): Maps architecture names to their data dictionaries
+        queue_size (int): Queue size compared, matched by nearest power of two
+        output_path (str, optional): Path to save the figure to
+        step (float, optional): Grid spacing of the enqueue and replace shares
+        arch_list (list, optional): Architectures compared, all by default
+
+    Returns:
+        matplotlib.figure.Figure: The figure, or None if no architecture has that queue size
+    """
+    sweep = mix_sweep(data_dict_dict, queue_size, step=step, arch_list=arch_list)
+    winners = sorted(set(sweep["best"][sweep["best"] >= 0].tolist()))
+    if not winners:
+        print(f"No architecture was implemented with about {queue_size} entries")
+        return None
+
+    # Register variants share colors, so winners get distinct ones
+    colors = plt.get_cmap("tab10" if len(winners) <= 10 else "tab20").colors
+    rank = np.full(len(sweep["architectures"]) + 1, np.nan)
+    rank[winners] = np.arange(len(winners))
+    cells = rank[sweep["best"]]
+
+    fig, ax = plt.subplots(figsize=(16, 14))
+    ax.imshow(
+        np.ma.masked_invalid(cells),
+        origin="lower",
+        cmap=ListedColormap(colors[: len(winners)]),
+        vmin=-0.5,
+        vmax=len(winners) - 0.5,
+        extent=(-step / 2, 1 + step / 2, -step / 2, 1 + step / 2),
+    )
+    for row, replace in enumerate(sweep["replace"]):
+        for column, enqueue in enumerate(sweep["enqueue"]):
+            if sweep["best"][row, column] >= 0:
+                label = f"{sweep['best_throughput'][row, column]:.0f}"
+                ax.text(enqueue, replace, label, ha="center", va="center", fontsize=11)
+
+    handles = [
+        plt.Rectangle((0, 0), 1, 1, color=colors[idx], label=get_arch_style(sweep["architectures"][arch])["display_name"])
+        for idx, arch in enumerate(winners)
+    ]
+    ax.legend(handles=handles, loc="upper right")
+    ax.set_xlabel("Enqueue Share")
+    ax.set_ylabel("Replace Share")
+    ax.set_title(f"Best Architecture by Operation Mix, Queue Size ~{queue_size} (sustained MOPS; rest is dequeue)")
+    ax.grid(False)
+
+    # Save if output path provided
+    if output_path:
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        plt.savefig(output_path, dpi=300, bbox_inches="tight")
+        print(f"Saved workload mix heatmap to {output_path}")
+
+    return fig
+
+
+def shared_architectures(data_by_device):
+    """
+    Get the architectures present on more than one device, without loading their data.
+
+    Args:
+        data_by_device (dict): Maps devices to dictionaries (or LazyResults) keyed by architecture
+
+    Returns:
+        list: Architecture keys, in order of first appearance.
+    """
+    counts = {}
+    for data_dicts in data_by_device.values():
+        for arch_name in data_dicts:
+            counts[arch_name] = counts.get(arch_name, 0) + 1
+    return [arch_name for arch_name, count in counts.items() if count > 1]
+
+
+# Subplot parameters reset before every layout
+SUBPLOT_PARAMS = ("left", "right", "bottom", "top", "wspace", "hspace")
+
+
+class FigureTemplate:
+    """
+    A figure and axes reused across outputs of the same size.
+
+    Creating a 30x10 inch canvas, its fonts, grid and log axis for every figure costs
+    more than drawing a few lines on it, so between outputs only the plotted artists,
+    legend, labels and title are swapped and the canvas is kept. The layout is redone
+    from the default subplot parameters for every output, so an image only depends on
+    its own content, not on the outputs saved before it.
+
+    Args:
+        figsize (tuple, optional): Figure size as (width, height) in inches
+    """
+
+    def __init__(self, figsize=(30, 10)):
+        self.fig, self.ax = plt.subplots(figsize=figsize)
+        self.ax.set_xscale("log", base=2)
+        self.outputs = 0
+
+    def axes(self):
+        """
+        Get the axes, cleared of the previous output.
+
+        Returns:
+            matplotlib.axes.Axes: Axes with no data, a log2 x axis and a linear y axis.
+        """
+        ax = self.ax
+        for artist in [*ax.lines, *ax.collections, *ax.patches, *ax.texts, *ax.images]:
+            artist.remove()
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+        ax.set_title("")
+        ax.set_xlabel("")
+        ax.set_ylabel("")
+        if ax.get_yscale() != "linear":
+            ax.set_yscale("linear")
+        ax.set_prop_cycle(None)
+        # Limits follow the next data only
+        ax.ignore_existing_data_limits = True
+        ax.set_autoscale_on(True)
+        return ax
+
+    def save(self, plot_path, dpi=300, draft=False):
+        """
+        Save the current output, with the legend outside the axes.
+
+        Args:
+            plot_path (str): Path of the PNG file
+            dpi (int, optional): Resolution of the saved figure
+            draft (bool, optional): Skip fitting the bounding box to the content, which
+                lays out every label a second time
+        """
+        self.ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
+        # Start from a fresh figure's axes box, then leave room for the legend outside it
+        self.fig.subplots_adjust(**{name: plt.rcParams[f"figure.subplot.{name}"] for name in SUBPLOT_PARAMS})
+        self.fig.tight_layout(rect=[0, 0, 0.85, 1])
+        self.fig.savefig(plot_path, dpi=dpi, bbox_inches=None if draft else "tight", format="png")
+        self.outputs += 1
+
+    def close(self):
+        """Release the figure."""
+        plt.close(self.fig)
+
+
+# Templates of the current process, by figure size
+_TEMPLATES = {}
+
+
+def figure_template(figsize=(30, 10)):
+    """
+    Get the template of a figure size, created on first use in each process.
+
+    Args:
+        figsize (tuple, optional): Figure size as (width, height) in inches
+
+    Returns:
+        FigureTemplate: The shared template.
+    """
+    if figsize not in _TEMPLATES:
+        _TEMPLATES[figsize] = FigureTemplate(figsize)
+    return _TEMPLATES[figsize]
+
+
+# Panel spec of every individual figure, by figure name without the "<operation>_" prefix
+FIGURE_PANELS = {
+    "frequency_comparison": "frequency",
+    "lut_utilization_comparison": "lut_utilization",
+    "register_utilization_comparison": "register_utilization",
+    "bram_utilization_comparison": "bram_utilization",
+    "lut_usage_comparison": "lut_usage",
+    "register_usage_comparison": "register_usage",
+    "resource_comparison": "resource_utilization",
+    "performance_comparison": "performance",
+    "efficiency_comparison": "efficiency",
+    "energy_comparison": "energy",
+    "performance_per_watt_comparison": "performance_per_watt",
+}
+
+
+def figure_panel(figure):
+    """
+    Get the panel dictionary of an individual figure.
+
+    Args:
+        figure (str): Name from INDIVIDUAL_FIGURES
+
+    Returns:
+        dict: Panel dictionary for draw_panels.
+    """
+    operation, _, kind = figure.partition("_")
+    if operation in OPERATIONS:
+        return {"spec": FIGURE_PANELS[kind], "operation": operation}
+    return {"spec": FIGURE_PANELS[figure]}
+
+
+# Figures whose error bands need every frequency point, not only the maximum
+BANDED_FIGURES = ("performance_comparison", "efficiency_comparison")
+
+
+def figure_jobs(all_data, figures, individual_plots_dir):
+    """
+    Describe the individual figures of one device as independent rendering jobs.
+
+    Each job only carries the data of the architectures its figure draws, as plain
+    dictionaries (and a ResultsDataset for error bands), so it can be sent to another process.
+
+    Args:
+        all_data (dict or LazyResults): Maps architecture names to their data dictionaries
+        figures (iterable): Names from INDIVIDUAL_FIGURES to create
+        individual_plots_dir (str): Directory the figures are saved to
+
+    Returns:
+        list: Job dictionaries for render_figure, in INDIVIDUAL_FIGURES order.
+    """
+    jobs = []
+    for figure in INDIVIDUAL_FIGURES:
+        if figure not in figures:
+            continue
+        archs = list(all_data) if figure == "resource_comparison" else figure_architectures(figure, all_data)
+        if not archs:
+            continue
+        operation, _, kind = figure.partition("_")
+        banded = operation in OPERATIONS and kind in BANDED_FIGURES and isinstance(all_data, LazyResults)
+        jobs.append(
+            {
+                "figure": figure,
+                "data": {arch_name: all_data[arch_name] for arch_name in archs},
+                "samples": all_data.dataset(archs) if banded else None,
+                "dpi": FINAL_DPI,
+                "draft": False,
+                "path": os.path.join(individual_plots_dir, f"{figure}.png"),
+            }
+        )
+    return jobs
+
+
+def render_figure(job):
+    """
+    Render one figure job from figure_jobs, or the cross-device comparison.
+
+    Args:
+        job (dict): "figure" name, "data" slice, "samples" for error bands (or None),
+            "dpi", "draft" flag (see FigureTemplate.save) and output "path"
+
+    Returns:
+        str: Path of the saved figure.
+    """
+    figure, data, path = job["figure"], job["data"], job["path"]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written aside and renamed, so a preview is replaced in one step and never read half-written
+    partial_path = os.path.join(os.path.dirname(path), f".{os.getpid()}.{os.path.basename(path)}")
+    if figure == CROSS_DEVICE_FIGURE:
+        fig = create_cross_device_comparison(data, partial_path, dpi=job["dpi"])
+        if fig is None:
+            return path
         plt.close(fig)
-        print(f"Saved individual plot to {plot_path}")
-        
+        os.replace(partial_path, path)
+        return path
+
+    template = figure_template()
+    ax = template.axes()
+    draw_panels([ax], data, [figure_panel(figure)], samples=job["samples"])
+    template.save(partial_path, dpi=job["dpi"], draft=job["draft"])
+    os.replace(partial_path, path)
+    print(f"Saved individual plot to {path}")
+
+    operation, _, kind = figure.partition("_")
+    if kind == "performance_per_watt_comparison":
+        # Ranking next to the plot, as power budgets decide between close curves
+        ranking_path = os.path.join(os.path.dirname(path), f"{operation}_energy_ranking.txt")
+        write_energy_ranking(data, list(data), operation, ranking_path)
+    return path
+
+
+def close_templates():
+    """Release the figure templates of the current process."""
+    for template in _TEMPLATES.values():
+        template.close()
+    _TEMPLATES.clear()
+
+
+def _init_render_worker():
+    # Workers draw off-screen with the style of the parent run, on templates of their own
+    _TEMPLATES.clear()
+    plt.switch_backend("Agg")
+    setup_plot_style(dpi=FINAL_DPI)
+
+
+def render_figures(jobs, workers=1):
+    """
+    Render figure jobs, in parallel processes when workers > 1.
+
+    Rasterizing large canvases is single-threaded, so independent figures are spread
+    over a process pool using the headless Agg backend.
+
+    Args:
+        jobs (list): Jobs from figure_jobs, or cross-device comparison jobs
+        workers (int, optional): Worker processes, None for all cores; each reuses one
+            FigureTemplate for all its figures
+
+    Returns:
+        list: Paths of the saved figures, in job order.
+    """
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(jobs) <= 1:
+        try:
+            return [render_figure(job) for job in jobs]
+        finally:
+            close_templates()
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_render_worker) as pool:
+        return list(pool.map(render_figure, jobs))
+
+
+def preview_jobs(jobs):
+    """
+    Turn figure jobs into quick previews: low resolution drafts without bootstrap error bands.
+
+    Args:
+        jobs (list): Jobs from figure_jobs, or cross-device comparison jobs
+
+    Returns:
+        list: Preview jobs writing to the same paths.
+    """
+    return [dict(job, samples=None, dpi=PREVIEW_DPI, draft=True) for job in jobs]
+
+
+def _render_final(job, render_store=None, style=None):
+    if render_store is None:
+        render_figure(job)
+        return {}
+    return render_store.build([job], style, lambda jobs: [render_figure(job) for job in jobs])
+
+
+def _write_final_manifest(futures, render_store, run_dir):
+    outputs = {}
+    for future in futures:
+        outputs.update(future.result())
+    render_store.write_manifest(run_dir, outputs)
+
+
+def defer_render(jobs, workers=1, render_store=None, style=None, run_dir=None):
+    """
+    Render figure jobs in background processes, each output replacing its preview when done.
+
+    The interpreter waits for the renders before exiting, so a script can return
+    while they finish.
+
+    Args:
+        jobs (list): Jobs from figure_jobs, or cross-device comparison jobs
+        workers (int, optional): Worker processes, None for all cores
+        render_store (render_cache.RenderStore, optional): Store the outputs are rendered into
+        style (dict, optional): Style settings keying the store, from render_style
+        run_dir (str, optional): Run directory whose manifest is rewritten once every render is done
+
+    Returns:
+        list: Futures of the renders, in job order.
+    """
+    if not jobs:
+        return []
+    workers = os.cpu_count() if workers is None else workers
+    pool = ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs))), initializer=_init_render_worker)
+    futures = [pool.submit(_render_final, job, render_store, style) for job in jobs]
+    pool.shutdown(wait=False)
+    if render_store is not None and run_dir is not None:
+        threading.Thread(target=_write_final_manifest, args=(futures, render_store, run_dir)).start()
+    return futures
+
+
+def process_and_plot_all(
+    base_dir,
+    output_dir=None,
+    workers=1,
+    chunksize=8,
+    cache=None,
+    architectures=None,
+    figures=None,
+    devices=None,
+    render_workers=None,
+    render_store=None,
+    preview=False,
+):
+    """
+    Process all directories and create plots for each architecture, on every FPGA device.
+
+    Log files are only parsed for the architectures the selected figures draw, and
+    the files of all devices are parsed in one pass. Each device gets its own
+    subdirectory of plots; with several devices a cross-device comparison is added.
+    Figures are independent jobs, rendered in parallel processes. With a render store,
+    only figures whose data, style or plotting code changed are rendered again; the
+    others are linked from the store. In preview mode, low-resolution figures are saved
+    first and the final ones rendered in the background, replacing them as they finish.
+
+    Args:
+        base_dir (str): Base directory containing subdirectories for each architecture
+        output_dir (str, optional): Directory to save plots to
+        workers (int, optional): Worker processes used to parse log files, None for all cores
+        chunksize (int, optional): Number of log files handed to a worker at a time
+        cache (cache.ParseCache, optional): Persistent cache so unchanged logs are not re-parsed
+        architectures (list, optional): Architecture keys to plot, all by default
+        figures (list, optional): Names from INDIVIDUAL_FIGURES, or CROSS_DEVICE_FIGURE, to create,
+            all by default
+        devices (list, optional): FPGA devices to plot, all found by default
+        render_workers (int, optional): Worker processes rendering figures, the parsing
+            workers by default
+        render_store (render_cache.RenderStore, optional): Store of rendered figures for
+            incremental runs, everything is rendered by default
+        preview (bool, optional): Save previews at PREVIEW_DPI without error bands first,
+            deferring the final figures to background processes
+
+    Returns:
+        list: Futures of the deferred final renders, empty unless previewing.
+
+    Raises:
+        ValueError: If an unknown figure is requested.
+    """
+    figures = list(INDIVIDUAL_FIGURES) + [CROSS_DEVICE_FIGURE] if figures is None else list(figures)
+    unknown = set(figures) - set(INDIVIDUAL_FIGURES) - {CROSS_DEVICE_FIGURE}
+    if unknown:
+        raise ValueError(f"Unknown figures: {', '.join(sorted(unknown))}")
+
+    # Create output directory if not provided
+    if not output_dir:
+        output_dir = os.path.join(base_dir, "plots")
+
+    # Setup plot style, laying out saved figures at their final resolution
+    setup_plot_style(dpi=FINAL_DPI)
+
+    # Data for comparison plots, parsed when a figure first touches an architecture
+    data_by_device = LazyResults.by_device(base_dir, devices, workers=workers, chunksize=chunksize, cache=cache)
+    if architectures is not None:
+        data_by_device = {device: all_data.subset(architectures) for device, all_data in data_by_device.items()}
+
+    # Create individual plots if we have data for multiple architectures, or for the selected ones
+    plotted = {
+        device: all_data
+        for device, all_data in data_by_device.items()
+        if len(all_data) > 1 or (architectures is not None and all_data)
+    }
+    cross_device = CROSS_DEVICE_FIGURE in figures and len(plotted) > 1
+
+    # Parse everything the selected figures need on every device in one pass, so workers are shared
+    shared = shared_architectures(plotted) if cross_device else []
+    requests = []
+    for all_data in plotted.values():
+        needed = {k for k in shared if k in all_data}
+        for figure in set(figures) & set(INDIVIDUAL_FIGURES):
+            needed.update(figure_architectures(figure, all_data))
+        requests.append((all_data, needed))
+    prefetch_together(requests)
+
+    if not plotted:
+        return []
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Create directory for individual plots
+    individual_plots_dir = os.path.join(output_dir, f"individual_plots_{timestamp}")
+    jobs = []
+    if cross_device:
+        # The largest canvas first, so it does not finish last on its own
+        jobs.append(
+            {
+                "figure": CROSS_DEVICE_FIGURE,
+                "data": {
+                    device: {k: all_data[k] for k in shared if k in all_data} for device, all_data in plotted.items()
+                },
+                "samples": None,
+                "dpi": FINAL_DPI,
+                "draft": False,
+                "path": os.path.join(individual_plots_dir, f"{CROSS_DEVICE_FIGURE}.png"),
+            }
+        )
+    for device, all_data in plotted.items():
+        jobs.extend(figure_jobs(all_data, figures, os.path.join(individual_plots_dir, device)))
+    render_workers = workers if render_workers is None else render_workers
+    foreground = preview_jobs(jobs) if preview else jobs
+    if render_store is None:
+        render_figures(foreground, render_workers)
+    else:
+        outputs = render_store.build(foreground, render_style(), partial(render_figures, workers=render_workers))
+        render_store.write_manifest(individual_plots_dir, outputs)
+        print(f"Rendered {render_store.rendered} figures, reused {render_store.reused} unchanged")
+
+    if not preview:
         print(f"All individual plots saved to {individual_plots_dir}")
+        return []
+    print(f"Previews saved to {individual_plots_dir}, rendering final figures in the background")
+    return defer_render(jobs, render_workers, render_store, render_style(), individual_plots_dir)
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot every architecture and device of the hwpq results.")
+    parser.add_argument(
+        "--preview", action="store_true", help="Save low-resolution previews first, final figures in the background"
+    )
+    args = parser.parse_args()
+
     base_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "hwpq")
     output_dir = os.path.join(base_dir, OUTPUT_DIR)
     os.makedirs(output_dir, exist_ok=True)
-    process_and_plot_all(base_dir, output_dir)
+    with ParseCache(os.path.join(output_dir, CACHE_FILE)) as cache:
+        process_and_plot_all(
+            base_dir,
+            output_dir,
+            workers=os.cpu_count(),
+            cache=cache,
+            render_store=RenderStore(os.path.join(output_dir, PLOT_STORE_DIR)),
+            preview=args.preview,
+        )
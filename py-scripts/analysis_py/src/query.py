@@ -0,0 +1,358 @@
+"""
+Design-space queries: rank the architectures meeting a queue size, throughput and
+device budget, from an index of every variant precomputed once.
+"""
+
+import argparse
+import os
+import sys
+import numpy as np
+from cache import ParseCache
+from config import INDEX_FILE, OUTPUT_DIR
+from dataset import LazyResults, find_results_dirs, prefetch_together, sweep_files
+from metrics_engine import OPERATIONS, compute_metrics
+from workload import harmonic_throughput, normalize_mix, operation_performance, parse_mix
+
+# Per-entry columns kept in the index
+INDEX_COLUMNS = (
+    "max_achieved_frequency",
+    "power",
+    "luts_util_percent",
+    "registers_util_percent",
+    "bram_util_percent",
+    "resource_utilization",
+)
+
+# Ranking keys: (column, True if larger is better)
+RANKINGS = {
+    "throughput": ("throughput", True),
+    "frequency": ("max_achieved_frequency", True),
+    "luts": ("luts_util_percent", False),
+    "registers": ("registers_util_percent", False),
+    "bram": ("bram_util_percent", False),
+    "resources": ("resource_utilization", False),
+    "power": ("power", False),
+}
+
+
+def source_signature(base_dir, devices=None):
+    """
+    Get the size and modification time of every log an index of a hwpq tree reads.
+
+    Args:
+        base_dir (str): Directory containing one subdirectory per architecture
+        devices (iterable, optional): Only include these devices, all found by default
+
+    Returns:
+        dict: Maps log paths, relative to base_dir, to (size, mtime_ns) pairs.
+    """
+    signature = {}
+    for _, file_path in sweep_files(find_results_dirs(base_dir, devices)):
+        stat = os.stat(file_path)
+        signature[os.path.relpath(file_path, base_dir)] = (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+class DesignSpaceIndex:
+    """
+    Every (device, architecture, queue size) entry as aligned arrays, sorted by device,
+    architecture and queue size, with the throughput of every operation precomputed.
+
+    Queries are vectorized masks over these arrays, so they take milliseconds however
+    many variants were synthesized.
+
+    Args:
+        devices (numpy.ndarray): Device of every entry
+        arch_keys (numpy.ndarray): Architecture of every entry
+        queue_sizes (numpy.ndarray): Queue size of every entry
+        columns (dict): Maps INDEX_COLUMNS and "<operation>_performance" to float arrays,
+            performance being NaN for operations an architecture does not support
+        sources (dict, optional): source_signature of the logs the index was built from
+    """
+
+    def __init__(self, devices, arch_keys, queue_sizes, columns, sources=None):
+        self.sources = sources
+        order = np.lexsort((queue_sizes, arch_keys, devices))
+        self.devices = devices[order]
+        self.arch_keys = arch_keys[order]
+        self.queue_sizes = queue_sizes[order]
+        self.columns = {name: values[order] for name, values in columns.items()}
+
+        # One group per (device, architecture), contiguous and sorted by queue size
+        boundaries = np.r_[True, (self.devices[1:] != self.devices[:-1]) | (self.arch_keys[1:] != self.arch_keys[:-1])]
+        self._groups = np.cumsum(boundaries) - 1 if len(order) else np.zeros(0, dtype=np.int64)
+
+        self._performance = np.vstack([self.columns[f"{operation}_performance"] for operation in OPERATIONS])
+
+    def __len__(self):
+        return len(self.queue_sizes)
+
+    @classmethod
+    def from_data(cls, data_by_device, sources=None):
+        """
+        Build the index from parsed results.
+
+        Args:
+            data_by_device (dict): Maps devices to {arch_key: data_dict} mappings, e.g. LazyResults
+            sources (dict, optional): source_signature of the logs the results were parsed from
+
+        Returns:
+            DesignSpaceIndex: The index over every variant.
+        """
+        devices, arch_keys, queue_sizes = [], [], []
+        columns = {name: [] for name in INDEX_COLUMNS + tuple(f"{op}_performance" for op in OPERATIONS)}
+        for device, data_dicts in data_by_device.items():
+            table = compute_metrics(data_dicts)
+            keys = table.arch_keys.astype(str)
+            devices.append(np.full(len(table), device))
+            arch_keys.append(keys)
+            queue_sizes.append(table.queue_sizes)
+            for name in INDEX_COLUMNS:
+                columns[name].append(table[name])
+            for operation, performance in zip(OPERATIONS, operation_performance(table)):
+                columns[f"{operation}_performance"].append(performance)
+
+        if not devices:
+            empty = np.zeros(0)
+            return cls(
+                empty.astype(str), empty.astype(str), empty.astype(np.int64), {name: empty for name in columns}, sources
+            )
+        return cls(
+            np.concatenate(devices),
+            np.concatenate(arch_keys),
+            np.concatenate(queue_sizes).astype(np.int64),
+            {name: np.concatenate(values).astype(float) for name, values in columns.items()},
+            sources,
+        )
+
+    @classmethod
+    def from_results_tree(cls, base_dir, devices=None, **options):
+        """
+        Parse every variant process_and_plot_all knows about and build the index.
+
+        The logs are signed before they are parsed, so a log rewritten meanwhile makes
+        the index stale rather than silently half up to date.
+
+        Args:
+            base_dir (str): Directory containing one subdirectory per architecture
+            devices (iterable, optional): Only include these devices, all found by default
+            **options: data_width, workers, chunksize, cache and backend, as for LazyResults
+
+        Returns:
+            DesignSpaceIndex: The index over every variant.
+        """
+        sources = source_signature(base_dir, devices)
+        data_by_device = LazyResults.by_device(base_dir, devices, **options)
+        prefetch_together([(all_data, list(all_data)) for all_data in data_by_device.values()])
+        return cls.from_data(data_by_device, sources)
+
+    def save(self, path):
+        """Save the index, with the signature of its logs, to a NumPy .npz file."""
+        sources = {}
+        if self.sources is not None:
+            sources["source_paths"] = np.array(list(self.sources), dtype=str)
+            sources["source_stats"] = np.array(list(self.sources.values()), dtype=np.int64).reshape(-1, 2)
+        np.savez(
+            path,
+            devices=self.devices,
+            arch_keys=self.arch_keys,
+            queue_sizes=self.queue_sizes,
+            **{f"column_{name}": values for name, values in self.columns.items()},
+            **sources,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with save."""
+        with np.load(path, allow_pickle=False) as arrays:
+            columns = {name[len("column_"):]: arrays[name] for name in arrays.files if name.startswith("column_")}
+            sources = None
+            if "source_paths" in arrays.files:
+                stats = arrays["source_stats"].tolist()
+                sources = dict(zip(arrays["source_paths"].tolist(), map(tuple, stats)))
+            return cls(arrays["devices"], arrays["arch_keys"], arrays["queue_sizes"], columns, sources)
+
+    def is_stale(self, base_dir):
+        """
+        Check whether logs were added, changed or removed since the index was built.
+
+        An index built for some devices only, or from results not read from base_dir,
+        is always stale, so it is never mistaken for the whole tree.
+
+        Args:
+            base_dir (str): Directory containing one subdirectory per architecture
+
+        Returns:
+            bool: True if the index no longer reflects every log under base_dir.
+        """
+        return self.sources is None or self.sources != source_signature(base_dir)
+
+    def mix_throughput(self, mix):
+        """
+        Get the sustained throughput of every entry under an operation mix.
+
+        Args:
+            mix (dict): Maps operations to relative weights
+
+        Returns:
+            numpy.ndarray: Million operations per second of every entry (see
+                workload.harmonic_throughput), NaN where an operation of the mix is not supported.
+        """
+        return harmonic_throughput(normalize_mix(mix), self._performance)
+
+    def query(
+        self,
+        queue_size=1,
+        mix=None,
+        min_throughput=None,
+        max_luts_percent=None,
+        max_registers_percent=None,
+        max_bram_percent=None,
+        max_power=None,
+        devices=None,
+        rank_by="throughput",
+        top=None,
+    ):
+        """
+        Rank the architectures meeting every constraint.
+
+        Each (device, architecture) is represented by its smallest synthesized queue size
+        holding at least queue_size entries and meeting the constraints.
+
+        Args:
+            queue_size (int, optional): Entries the queue must hold
+            mix (dict, optional): Operation mix, e.g. {"enqueue": 1, "dequeue": 1}; dequeue only by default
+            min_throughput (float, optional): Minimum throughput under the mix, in MOPS
+            max_luts_percent (float, optional): Maximum LUT utilization, in percent of the device
+            max_registers_percent (float, optional): Maximum register utilization, in percent of the device
+            max_bram_percent (float, optional): Maximum BRAM utilization, in percent of the device
+            max_power (float, optional): Maximum power, in W
+            devices (iterable, optional): Only consider these devices
+            rank_by (str, optional): Key of RANKINGS
+            top (int, optional): Number of results kept, all by default
+
+        Returns:
+            list: Dictionaries with "device", "arch", "queue_size", "throughput" and the
+                INDEX_COLUMNS, best first.
+
+        Raises:
+            ValueError: If rank_by is unknown.
+        """
+        if rank_by not in RANKINGS:
+            raise ValueError(f"Unknown ranking: {rank_by}")
+
+        throughput = self.mix_throughput(mix or {"dequeue": 1.0})
+        mask = (self.queue_sizes >= queue_size) & ~np.isnan(throughput)
+        limits = (
+            ("luts_util_percent", max_luts_percent),
+            ("registers_util_percent", max_registers_percent),
+            ("bram_util_percent", max_bram_percent),
+            ("power", max_power),
+        )
+        for name, limit in limits:
+            if limit is not None:
+                mask &= self.columns[name] <= limit
+        if min_throughput is not None:
+            mask &= throughput >= min_throughput
+        if devices is not None:
+            mask &= np.isin(self.devices, list(devices))
+
+        # First matching row of every group is its smallest queue size
+        rows = np.flatnonzero(mask)
+        _, first = np.unique(self._groups[rows], return_index=True)
+        rows = rows[first]
+
+        column, larger_is_better = RANKINGS[rank_by]
+        values = throughput[rows] if column == "throughput" else self.columns[column][rows]
+        order = np.lexsort((-throughput[rows], -values if larger_is_better else values))
+        rows = rows[order][:top]
+
+        return [
+            {
+                "device": str(self.devices[row]),
+                "arch": str(self.arch_keys[row]),
+                "queue_size": int(self.queue_sizes[row]),
+                "throughput": float(throughput[row]),
+                **{name: float(self.columns[name][row]) for name in INDEX_COLUMNS},
+            }
+            for row in rows.tolist()
+        ]
+
+
+def load_index(path, base_dir):
+    """
+    Load a saved index if it is still up to date with the logs of a hwpq tree.
+
+    Args:
+        path (str): Index file written by DesignSpaceIndex.save
+        base_dir (str): Directory containing one subdirectory per architecture
+
+    Returns:
+        DesignSpaceIndex or None: The index, None if the file is missing or stale.
+    """
+    if not os.path.exists(path):
+        return None
+    index = DesignSpaceIndex.load(path)
+    if index.is_stale(base_dir):
+        print(f"{path} is out of date with the logs, rebuilding it", file=sys.stderr)
+        return None
+    return index
+
+
+def print_results(results):
+    """Print ranked query results as a table."""
+    print(f"{'device':10s} {'architecture':40s} {'N':>8s} {'MOPS':>9s} {'Fmax':>8s} {'LUT %':>7s} {'REG %':>7s} {'BRAM %':>7s} {'W':>6s}")
+    for result in results:
+        print(
+            f"{result['device']:10s} {result['arch']:40s} {result['queue_size']:8d} {result['throughput']:9.2f} "
+            f"{result['max_achieved_frequency']:8.1f} {result['luts_util_percent']:7.2f} "
+            f"{result['registers_util_percent']:7.2f} {result['bram_util_percent']:7.2f} {result['power']:6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank architectures meeting a queue size, throughput and device budget.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--queue-size", type=int, default=1, help="Entries the queue must hold")
+    parser.add_argument("--mix", type=parse_mix, default={"dequeue": 1.0}, help='Operation mix, e.g. "enqueue=1,dequeue=1"')
+    parser.add_argument("--min-mops", type=float, help="Minimum throughput under the mix, in MOPS")
+    parser.add_argument("--max-luts", type=float, help="Maximum LUT utilization, in percent")
+    parser.add_argument("--max-registers", type=float, help="Maximum register utilization, in percent")
+    parser.add_argument("--max-bram", type=float, help="Maximum BRAM utilization, in percent")
+    parser.add_argument("--max-power", type=float, help="Maximum power, in W")
+    parser.add_argument("--device", action="append", help="Only include this device (repeatable)")
+    parser.add_argument("--rank-by", choices=sorted(RANKINGS), default="throughput", help="Ranking order")
+    parser.add_argument("--top", type=int, help="Number of results shown")
+    parser.add_argument(
+        "--index",
+        default=os.path.join(OUTPUT_DIR, INDEX_FILE),
+        help="Index file (.npz) reused across queries, built if missing or stale",
+    )
+    parser.add_argument("--cache", help="Parse cache (.sqlite3) used when building the index")
+    args = parser.parse_args()
+
+    index = load_index(args.index, args.base_dir)
+    if index is None:
+        cache = ParseCache(args.cache) if args.cache else None
+        try:
+            index = DesignSpaceIndex.from_results_tree(args.base_dir, workers=os.cpu_count(), cache=cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        os.makedirs(os.path.dirname(os.path.abspath(args.index)), exist_ok=True)
+        index.save(args.index)
+
+    print_results(
+        index.query(
+            queue_size=args.queue_size,
+            mix=args.mix,
+            min_throughput=args.min_mops,
+            max_luts_percent=args.max_luts,
+            max_registers_percent=args.max_registers,
+            max_bram_percent=args.max_bram,
+            max_power=args.max_power,
+            devices=args.device,
+            rank_by=args.rank_by,
+            top=args.top,
+        )
+    )
@@ -0,0 +1,203 @@
+"""
+Content-addressed store of rendered figures, so a plot run only rasterizes the figures
+whose inputs changed.
+
+Each figure job is keyed by a digest of its data slice, the plot style and the source of
+the modules drawing it. Outputs are kept once per digest and hard-linked (or copied)
+into every run directory that uses them, so with hard links the store takes no space
+beyond the run directories; deleting it only forces the next run to render everything.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+import matplotlib
+import numpy as np
+
+# Module drawing the figures; its source and that of every analysis module it imports decide how they look
+RENDER_ENTRY = "plotter"
+
+# Name of the manifest written into every run directory
+MANIFEST_FILE = "manifest.json"
+
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def render_modules(entry=RENDER_ENTRY):
+    """
+    Find the analysis modules a module imports, directly or through other analysis modules.
+
+    Args:
+        entry (str, optional): Module name under the analysis src directory
+
+    Returns:
+        tuple: Sorted names of the entry and every analysis module it depends on.
+    """
+    found = set()
+    pending = [entry]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(_SRC_DIR, f"{name}.py")
+        if name in found or not os.path.exists(path):
+            continue
+        found.add(name)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+        # Imports inside functions count too, they run while rendering
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.partition(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.partition(".")[0])
+    return tuple(sorted(found))
+
+
+def code_version(modules=None):
+    """
+    Digest the source of the rendering modules and the library versions.
+
+    Args:
+        modules (iterable, optional): Module names under the analysis src directory,
+            from render_modules by default
+
+    Returns:
+        str: Hex digest, changing whenever any of the sources changes.
+    """
+    hasher = hashlib.sha256(f"matplotlib {matplotlib.__version__} numpy {np.__version__}".encode())
+    for name in render_modules() if modules is None else modules:
+        with open(os.path.join(_SRC_DIR, f"{name}.py"), "rb") as f:
+            hasher.update(name.encode() + b"\0" + f.read())
+    return hasher.hexdigest()
+
+
+def _feed(hasher, value):
+    # Canonical encoding: dictionaries by sorted key, arrays by dtype, shape and bytes
+    if isinstance(value, dict):
+        hasher.update(b"{")
+        for key in sorted(value, key=repr):
+            _feed(hasher, key)
+            _feed(hasher, value[key])
+        hasher.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"[")
+        for item in value:
+            _feed(hasher, item)
+        hasher.update(b"]")
+    elif isinstance(value, np.ndarray):
+        hasher.update(f"array {value.dtype.descr} {value.shape}".encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, "rows"):
+        # ResultsDataset
+        _feed(hasher, value.rows)
+    else:
+        hasher.update(f"{type(value).__name__} {value!r};".encode())
+
+
+def job_digest(job, style, version):
+    """
+    Digest everything a figure job's output depends on.
+
+    Args:
+        job (dict): Job from plotter.figure_jobs; its output path is left out, so moving
+            the output directory does not invalidate anything
+        style (dict): Plot style settings
+        version (str): Code version from code_version
+
+    Returns:
+        str: Hex digest of the job.
+    """
+    hasher = hashlib.sha256(version.encode())
+    _feed(hasher, {key: value for key, value in job.items() if key != "path"})
+    _feed(hasher, style)
+    return hasher.hexdigest()
+
+
+class RenderStore:
+    """
+    Directory of rendered outputs, one subdirectory per job digest.
+
+    Args:
+        store_dir (str): Directory of the store, created if missing
+        version (str, optional): Code version, from code_version by default
+    """
+
+    def __init__(self, store_dir, version=None):
+        self.store_dir = store_dir
+        self.version = code_version() if version is None else version
+        self.rendered = 0
+        self.reused = 0
+        os.makedirs(store_dir, exist_ok=True)
+
+    def __contains__(self, digest):
+        return os.path.isdir(os.path.join(self.store_dir, digest))
+
+    def build(self, jobs, style, render):
+        """
+        Produce the outputs of figure jobs, rendering only those missing from the store.
+
+        Args:
+            jobs (list): Figure jobs, each writing to its own "path"
+            style (dict): Plot style settings
+            render (callable): Renders a list of jobs, e.g. plotter.render_figures
+
+        Returns:
+            dict: Maps the output path of every job to its digest.
+        """
+        digests = [job_digest(job, style, self.version) for job in jobs]
+        pending = []
+        for job, digest in zip(jobs, digests):
+            if digest not in self:
+                staging = os.path.join(self.store_dir, f"{digest}.tmp-{os.getpid()}")
+                os.makedirs(staging, exist_ok=True)
+                pending.append((digest, staging, dict(job, path=os.path.join(staging, os.path.basename(job["path"])))))
+
+        try:
+            # Render into staging directories, so an interrupted run never leaves a partial entry
+            render([job for _, _, job in pending])
+            for digest, staging, _ in pending:
+                os.replace(staging, os.path.join(self.store_dir, digest))
+        finally:
+            for _, staging, _ in pending:
+                shutil.rmtree(staging, ignore_errors=True)
+        self.rendered += len(pending)
+        self.reused += len(jobs) - len(pending)
+
+        for job, digest in zip(jobs, digests):
+            self.link(digest, os.path.dirname(job["path"]))
+        return {job["path"]: digest for job, digest in zip(jobs, digests)}
+
+    def link(self, digest, output_dir):
+        """
+        Hard-link the outputs of a digest into a directory, copying where links are not possible.
+
+        Args:
+            digest (str): Digest of a stored job
+            output_dir (str): Directory receiving the outputs
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        entry = os.path.join(self.store_dir, digest)
+        for name in os.listdir(entry):
+            # Linked aside and renamed, so an existing output (e.g. a preview) is replaced in one step
+            partial = os.path.join(output_dir, f".{os.getpid()}.{name}")
+            try:
+                os.link(os.path.join(entry, name), partial)
+            except OSError:
+                shutil.copy2(os.path.join(entry, name), partial)
+            os.replace(partial, os.path.join(output_dir, name))
+
+    def write_manifest(self, run_dir, outputs):
+        """
+        Record which stored output every figure of a run came from.
+
+        Args:
+            run_dir (str): Run directory the outputs were linked into
+            outputs (dict): Output paths and digests, as returned by build
+        """
+        manifest = {
+            "version": self.version,
+            "figures": {os.path.relpath(path, run_dir): digest for path, digest in sorted(outputs.items())},
+        }
+        with open(os.path.join(run_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
@@ -0,0 +1,245 @@
+"""
+Scaling laws fitted per architecture, to estimate achieved frequency and resources at
+queue sizes that were never synthesized.
+
+Achieved frequency is fitted as a line in log2(N); LUTs, registers and BRAM as a power
+law in N, which is a line in (log N, log y). Predictions come with 95% prediction intervals.
+"""
+
+import argparse
+import numpy as np
+from config import DEFAULT_DEVICE
+from dataset import LazyResults, as_data_dict
+
+# Metric fitted for each quantity and the form of its scaling law
+SCALING_LAWS = {
+    "max_achieved_frequency": "log_linear",
+    "luts_used": "power_law",
+    "registers_used": "power_law",
+    "bram_used": "power_law",
+}
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+    11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093,
+    20: 2.086, 25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def _t_critical(dof):
+    if dof < 1:
+        return np.nan
+    # Use the nearest tabulated value at or below dof, which is conservative
+    tabulated = [value for value in _T_95 if value <= dof]
+    return _T_95[max(tabulated)] if dof <= 120 else 1.960
+
+
+class ScalingFit:
+    """
+    Least-squares scaling law of one metric of one architecture.
+
+    Args:
+        metric (str): Metric fitted
+        kind (str): "log_linear", "power_law", "linear" or "constant"
+        queue_sizes (array-like): Queue sizes the fit was trained on
+        values (array-like): Measured metric at those queue sizes
+    """
+
+    def __init__(self, metric, kind, queue_sizes, values):
+        self.metric = metric
+        self.kind = kind
+        self.queue_sizes = np.asarray(queue_sizes, dtype=float)
+        values = np.asarray(values, dtype=float)
+
+        if kind == "constant":
+            self.coefficients = np.array([values.mean(), 0.0])
+            self.residual_std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+            self.r_squared = 1.0
+            self.dof = len(values) - 1
+            self._xtx_inv = None
+            return
+
+        design = self._design(self.queue_sizes)
+        target = self._transform(values)
+        self.coefficients, *_ = np.linalg.lstsq(design, target, rcond=None)
+
+        residuals = target - design @ self.coefficients
+        total = np.sum((target - target.mean()) ** 2)
+        self.dof = len(target) - design.shape[1]
+        self.residual_std = float(np.sqrt(np.sum(residuals**2) / self.dof)) if self.dof > 0 else np.nan
+        self.r_squared = float(1 - np.sum(residuals**2) / total) if total > 0 else 1.0
+        self._xtx_inv = np.linalg.pinv(design.T @ design)
+
+    def __repr__(self):
+        return f"ScalingFit({self.metric}, {self.kind}, R^2={self.r_squared:.3f})"
+
+    def _design(self, queue_sizes):
+        if self.kind == "log_linear":
+            x = np.log2(queue_sizes)
+        elif self.kind == "power_law":
+            x = np.log(queue_sizes)
+        else:
+            x = queue_sizes
+        return np.column_stack([np.ones_like(x), x])
+
+    def _transform(self, values):
+        return np.log(values) if self.kind == "power_law" else values
+
+    def _inverse(self, values):
+        if self.kind == "power_law":
+            return np.exp(values)
+        # Frequencies must stay positive and resource counts non-negative: beyond that the
+        # law no longer holds and there is no estimate
+        valid = values > 0 if self.kind == "log_linear" else values >= 0
+        return np.where(valid, values, np.nan)
+
+    def predict(self, queue_sizes):
+        """
+        Predict the metric with a 95% prediction interval.
+
+        Args:
+            queue_sizes (array-like): Queue sizes to predict
+
+        Returns:
+            tuple: (estimates, lower bounds, upper bounds) as arrays; power laws have
+                asymmetric bounds, fits without residual degrees of freedom NaN bounds.
+                Where a linear law goes non-positive (negative for resource counts) the
+                estimate is NaN, as are its bounds, and lower bounds stop at zero.
+        """
+        queue_sizes = np.atleast_1d(np.asarray(queue_sizes, dtype=float))
+        if self.kind == "constant":
+            estimate = np.full(len(queue_sizes), self.coefficients[0])
+            margin = _t_critical(self.dof) * self.residual_std * np.sqrt(1 + 1 / max(len(self.queue_sizes), 1))
+            return estimate, estimate - margin, estimate + margin
+
+        design = self._design(queue_sizes)
+        estimate = design @ self.coefficients
+        leverage = np.einsum("ij,jk,ik->i", design, self._xtx_inv, design)
+        margin = _t_critical(self.dof) * self.residual_std * np.sqrt(1 + leverage)
+        lower, upper = self._inverse(estimate - margin), self._inverse(estimate + margin)
+        estimate = self._inverse(estimate)
+        invalid = np.isnan(estimate)
+        return estimate, np.where(invalid, np.nan, np.fmax(lower, 0)), np.where(invalid, np.nan, upper)
+
+    def extrapolates(self, queue_sizes):
+        """Whether each queue size lies outside the range the fit was trained on."""
+        queue_sizes = np.atleast_1d(np.asarray(queue_sizes, dtype=float))
+        return (queue_sizes < self.queue_sizes.min()) | (queue_sizes > self.queue_sizes.max())
+
+
+def fit_metric(data_dict, metric, kind=None):
+    """
+    Fit the scaling law of one metric of one architecture.
+
+    Power laws need positive values: metrics that are zero everywhere get a constant
+    fit, metrics that are only zero at some sizes a line in N.
+
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        metric (str): Metric to fit, e.g. a key of SCALING_LAWS
+        kind (str, optional): Form of the law, SCALING_LAWS[metric] by default
+
+    Returns:
+        ScalingFit: The fitted law.
+
+    Raises:
+        ValueError: If fewer than two queue sizes have the metric.
+    """
+    data_dict = as_data_dict(data_dict)
+    points = sorted((queue_size, metrics[metric]) for queue_size, metrics in data_dict.items() if metric in metrics)
+    if len(points) < 2:
+        raise ValueError(f"Need at least two queue sizes with {metric} to fit a scaling law")
+
+    queue_sizes, values = (np.array(column, dtype=float) for column in zip(*points))
+    kind = kind or SCALING_LAWS.get(metric, "linear")
+    if kind == "power_law" and np.any(values <= 0):
+        kind = "constant" if np.all(values == 0) else "linear"
+    return ScalingFit(metric, kind, queue_sizes, values)
+
+
+def fit_architecture(data_dict, metrics=SCALING_LAWS):
+    """
+    Fit every scaling law of one architecture.
+
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        metrics (iterable, optional): Metrics to fit
+
+    Returns:
+        dict: Maps metrics to ScalingFit, skipping metrics with too few points.
+    """
+    data_dict = as_data_dict(data_dict)
+    fits = {}
+    for metric in metrics:
+        try:
+            fits[metric] = fit_metric(data_dict, metric)
+        except ValueError:
+            continue
+    return fits
+
+
+def predict_points(data_dict, queue_sizes, metrics=SCALING_LAWS):
+    """
+    Predict data dictionary entries at queue sizes that were not synthesized.
+
+    Args:
+        data_dict (dict or ResultsDataset): Data for one architecture
+        queue_sizes (iterable): Queue sizes to predict
+        metrics (iterable, optional): Metrics to predict
+
+    Returns:
+        dict: Maps queue sizes to metrics dictionaries flagged with "predicted": True and
+            "extrapolated", holding every metric with "<metric>_lower" and "<metric>_upper" bounds;
+            a metric whose law has no valid estimate at a queue size is NaN there.
+    """
+    queue_sizes = [int(queue_size) for queue_size in queue_sizes]
+    predicted = {
+        queue_size: {"queue_size": queue_size, "predicted": True, "extrapolated": False} for queue_size in queue_sizes
+    }
+    for metric, fit in fit_architecture(data_dict, metrics).items():
+        estimates, lower, upper = fit.predict(queue_sizes)
+        for index, queue_size in enumerate(queue_sizes):
+            point = predicted[queue_size]
+            point[metric] = float(estimates[index])
+            point[f"{metric}_lower"] = float(lower[index])
+            point[f"{metric}_upper"] = float(upper[index])
+            point["extrapolated"] = point["extrapolated"] or bool(fit.extrapolates(queue_size)[0])
+    return predicted
+
+
+def print_report(data_dicts, queue_sizes=()):
+    """
+    Print the goodness of fit of every architecture, and predictions at some queue sizes.
+
+    Args:
+        data_dicts (dict or LazyResults): Maps architecture keys to data dictionaries
+        queue_sizes (iterable, optional): Queue sizes to predict
+    """
+    for arch_name in data_dicts:
+        fits = fit_architecture(data_dicts[arch_name])
+        summary = "  ".join(f"{metric} {fit.kind} R^2={fit.r_squared:.3f}" for metric, fit in fits.items())
+        print(f"{arch_name:40s} {summary}")
+        for queue_size, point in predict_points(data_dicts[arch_name], queue_sizes).items():
+            state = "extrapolated" if point["extrapolated"] else "interpolated"
+            values = "  ".join(
+                f"{metric}=n/a (law out of range)"
+                if np.isnan(point[metric])
+                else f"{metric}={point[metric]:.1f} [{point[metric + '_lower']:.1f}, {point[metric + '_upper']:.1f}]"
+                for metric in fits
+            )
+            print(f"    N={queue_size:<8d} ({state}) {values}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit scaling laws and predict unsynthesized queue sizes.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--device", default=DEFAULT_DEVICE, help="FPGA device")
+    parser.add_argument("--arch", action="append", help="Only include this architecture key (repeatable)")
+    parser.add_argument("--queue-size", type=int, action="append", default=[], help="Queue size to predict (repeatable)")
+    args = parser.parse_args()
+
+    results = LazyResults(args.base_dir, device=args.device)
+    if args.arch:
+        results = results.subset(args.arch)
+    print_report(results, args.queue_size)
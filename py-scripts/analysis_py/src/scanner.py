@@ -0,0 +1,171 @@
+"""
+Memory-mapped bulk scanner for large corpora of Vivado analysis log files.
+
+Instead of iterating over lines in Python, one compiled multi-field regex is run
+over the raw bytes of each log (or of a packed concatenation of logs) and every
+match yields a full frequency record, identical to parsers.parse_frequency_records.
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import re
+import tempfile
+import time
+
+import parsers
+
+_NUMBER = rb"[0-9]*\.?[0-9]+"
+_LINE = rb"Frequency:[ \t]*(?P=target)[ \t]*MHz[ \t]*->[ \t]*"
+_EOL = rb"[ \t]*\r?\n"
+
+# One frequency block as written by synth_design_param_sweep_parallel.tcl
+_BLOCK_RE = re.compile(
+    rb"^Frequency:[ \t]*(?P<target>[0-9.]+)[ \t]*MHz[ \t]*->[ \t]*"
+    rb"(?:Synthesis:[^\n]*?->[ \t]*(?P<synthesis_seconds>[0-9]+)s" + _EOL + _LINE + rb")?"
+    rb"(?:Implementation:[^\n]*?->[ \t]*(?P<implementation_seconds>[0-9]+)s" + _EOL + _LINE + rb")?"
+    rb"Power:[ \t]*(?:(?P<power>[0-9.]+)[ \t]*W|[^\n]*?)" + _EOL
+    + _LINE + rb"CLB LUTs Used:[ \t]*(?P<luts_used>[0-9]+)" + _EOL
+    + _LINE + rb"CLB LUTs Util%:[ \t]*<?[ \t]*(?P<luts_util_percent>" + _NUMBER + rb")[ \t]*%" + _EOL
+    + _LINE + rb"CLB Registers Used:[ \t]*(?P<registers_used>[0-9]+)" + _EOL
+    + _LINE + rb"CLB Registers Util%:[ \t]*<?[ \t]*(?P<registers_util_percent>" + _NUMBER + rb")[ \t]*%" + _EOL
+    + _LINE + rb"BRAM Util:[ \t]*(?P<bram_used>" + _NUMBER + rb")" + _EOL
+    + _LINE + rb"BRAM Util%:[ \t]*<?[ \t]*(?P<bram_util_percent>" + _NUMBER + rb")[ \t]*%" + _EOL
+    + _LINE + rb"WNS:[ \t]*(?P<wns>-?" + _NUMBER + rb")[ \t]*ns" + _EOL
+    + _LINE + rb"Achieved Frequency:[ \t]*(?P<achieved_frequency>" + _NUMBER + rb")[ \t]*MHz",
+    re.MULTILINE,
+)
+
+# Header preceding every log in a packed file
+_PACKED_HEADER_RE = re.compile(rb"^==> (.+) <==\r?$", re.MULTILINE)
+
+_INT_FIELDS = ("luts_used", "registers_used", "synthesis_seconds", "implementation_seconds")
+
+
+def _record_from_match(match):
+    groups = match.groupdict()
+    record = dict.fromkeys(parsers.FREQUENCY_RECORD_FIELDS)
+    record["target_frequency"] = float(groups.pop("target"))
+    for key, value in groups.items():
+        if value is not None:
+            record[key] = int(value) if key in _INT_FIELDS else float(value)
+    return record
+
+
+def _scan(buffer, start=0, end=None):
+    end = len(buffer) if end is None else end
+    return [_record_from_match(match) for match in _BLOCK_RE.finditer(buffer, start, end)]
+
+
+def scan_file(file_path):
+    """
+    Extract the frequency records of one log file through a memory map.
+
+    Args:
+        file_path (str): Path to the Vivado analysis log file.
+
+    Returns:
+        list[dict]: Same records as parsers.parse_frequency_records.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _scan(buffer)
+
+
+def pack_logs(file_paths, packed_path):
+    """
+    Concatenate log files into one packed file readable by scan_packed.
+
+    Each log is preceded by a "==> <path> <==" header line.
+
+    Args:
+        file_paths (list[str]): Log files to pack.
+        packed_path (str): Destination file.
+    """
+    with open(packed_path, "wb") as out:
+        for file_path in file_paths:
+            out.write(b"==> " + os.fsencode(file_path) + b" <==\n")
+            with open(file_path, "rb") as f:
+                data = f.read()
+            out.write(data if data.endswith(b"\n") else data + b"\n")
+
+
+def scan_packed(packed_path):
+    """
+    Extract the frequency records of every log in a packed file.
+
+    Args:
+        packed_path (str): File written by pack_logs.
+
+    Returns:
+        dict: Maps each original file path to its list of frequency records.
+    """
+    with open(packed_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            headers = list(_PACKED_HEADER_RE.finditer(buffer))
+            bounds = [header.start() for header in headers[1:]] + [len(buffer)]
+            return {
+                os.fsdecode(header.group(1)): _scan(buffer, header.end(), end)
+                for header, end in zip(headers, bounds)
+            }
+
+
+def benchmark(file_paths, repeat=3):
+    """
+    Time the line-based parser against the memory-mapped scanner.
+
+    Args:
+        file_paths (list[str]): Log files to parse.
+        repeat (int, optional): Number of runs per backend, the best is reported.
+
+    Returns:
+        dict: Best wall-clock seconds for "python", "mmap" and "mmap_packed".
+
+    Raises:
+        ValueError: If the backends disagree on any file.
+    """
+    handle, packed_path = tempfile.mkstemp(suffix=".packed")
+    os.close(handle)
+    timings = {}
+    try:
+        pack_logs(file_paths, packed_path)
+        backends = {
+            "python": lambda: [parsers.parse_frequency_records(path) for path in file_paths],
+            "mmap": lambda: [scan_file(path) for path in file_paths],
+            "mmap_packed": lambda: list(scan_packed(packed_path).values()),
+        }
+        results = {}
+        for name, run in backends.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results[name] = run()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+    finally:
+        os.remove(packed_path)
+
+    if not results["python"] == results["mmap"] == results["mmap_packed"]:
+        raise ValueError("Scanner disagrees with the line-based parser")
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the memory-mapped log scanner.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend")
+    args = parser.parse_args()
+
+    pattern = os.path.join(args.base_dir, "*", "vivado_analysis_results_*", "**", "vivado_analysis_on_queue_size_*.txt")
+    file_paths = sorted(glob.glob(pattern, recursive=True))
+    timings = benchmark(file_paths, repeat=args.repeat)
+
+    print(f"{len(file_paths)} log files, best of {args.repeat}")
+    for name, seconds in timings.items():
+        speedup = timings["python"] / seconds if seconds else float("inf")
+        print(f"{name:12s} {seconds * 1000:9.2f} ms  ({speedup:.2f}x)")
@@ -0,0 +1,291 @@
+"""
+Parameter-sweep orchestrator: runs one Vivado batch job per (enqueue, queue size)
+configuration of an architecture, as many at a time as the cores allow.
+
+Jobs are managed subprocesses, so the next one starts the moment one exits instead of
+on the next poll. A job succeeded when Vivado exits cleanly and its log holds the
+completion line printed by the Tcl script.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import DEFAULT_DEVICE, DEVICE_PARTS
+
+# Printed by synth_design_param_sweep_parallel.tcl once every frequency was analyzed
+COMPLETION_MARKER = "Analysis completed for ENQ"
+
+# Queue sizes swept for tree-based and array-based architectures
+TREE_QUEUE_SIZES = (3, 7, 15, 31, 63, 127, 255, 511, 1023, 2047)
+ARRAY_QUEUE_SIZES = (4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+ENQUEUE_VALUES = (0, 1)
+
+# Cores each Vivado job keeps busy, bounding how many jobs share the machine
+CORES_PER_JOB = 4
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SYNTH_SCRIPT = os.path.join("vivado-synthesis_tcl", "synth_design_param_sweep_parallel.tcl")
+
+
+def sweep_queue_sizes(architecture):
+    """
+    Get the queue sizes swept for an architecture.
+
+    Args:
+        architecture (str): Architecture name, e.g. "register_tree"
+
+    Returns:
+        tuple: Queue sizes, 2^k - 1 for trees and 2^k for arrays.
+
+    Raises:
+        ValueError: If the name contains neither "tree" nor "array".
+    """
+    if "tree" in architecture:
+        return TREE_QUEUE_SIZES
+    if "array" in architecture:
+        return ARRAY_QUEUE_SIZES
+    raise ValueError(f"Architecture name '{architecture}' must contain either 'tree' or 'array'")
+
+
+def available_cores():
+    """Get the number of cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_parallel_jobs(cores_per_job=CORES_PER_JOB):
+    """
+    Size the number of concurrent Vivado jobs from the available cores.
+
+    Args:
+        cores_per_job (int, optional): Cores each job keeps busy
+
+    Returns:
+        int: Number of jobs run at once, at least one.
+    """
+    return max(1, available_cores() // cores_per_job)
+
+
+def sweep_jobs(
+    architecture,
+    project_root=PROJECT_ROOT,
+    vivado="vivado",
+    data_width=16,
+    device=DEFAULT_DEVICE,
+    queue_sizes=None,
+    enqueue_values=ENQUEUE_VALUES,
+    log_dir="parallel_logs",
+):
+    """
+    Describe every configuration of an architecture's sweep as a job.
+
+    Args:
+        architecture (str): Architecture name, e.g. "register_tree"
+        project_root (str, optional): Repository root holding hwpq/ and vivado-synthesis_tcl/
+        vivado (str, optional): Vivado executable
+        data_width (int, optional): Data width of the queue entries
+        device (str, optional): FPGA device implemented on, a key of DEVICE_PARTS
+        queue_sizes (iterable, optional): Queue sizes, from sweep_queue_sizes by default
+        enqueue_values (iterable, optional): ENQ_ENA values
+        log_dir (str, optional): Directory of the Vivado console logs
+
+    Returns:
+        list: Job dictionaries with "name", "command", "log" and "result" paths.
+
+    Raises:
+        ValueError: If the architecture name selects no queue sizes or the device is unknown.
+    """
+    if device not in DEVICE_PARTS:
+        raise ValueError(f"Unknown device '{device}', expected one of {', '.join(DEVICE_PARTS)}")
+    queue_sizes = sweep_queue_sizes(architecture) if queue_sizes is None else queue_sizes
+    results_dir = os.path.join(project_root, "hwpq", architecture, f"vivado_analysis_results_{data_width}bit_{device}")
+    script = os.path.join(project_root, SYNTH_SCRIPT)
+
+    jobs = []
+    for enq_ena in enqueue_values:
+        for queue_size in queue_sizes:
+            name = f"ENQ{enq_ena}_QS{queue_size}"
+            jobs.append(
+                {
+                    "name": name,
+                    "command": [
+                        vivado, "-mode", "batch", "-nolog", "-nojournal", "-source", script,
+                        "-tclargs", architecture, str(enq_ena), str(data_width), str(queue_size), DEVICE_PARTS[device],
+                    ],
+                    "log": os.path.join(log_dir, f"vivado_{name}.log"),
+                    "result": os.path.join(results_dir, f"enqueue_{enq_ena}", f"vivado_analysis_on_queue_size_{queue_size}.txt"),
+                }
+            )
+    return jobs
+
+
+def job_completed(job):
+    """
+    Check whether a job already ran to completion.
+
+    Args:
+        job (dict): Job from sweep_jobs
+
+    Returns:
+        bool: True if its result file exists and its log holds the completion line.
+    """
+    if not (os.path.exists(job["result"]) and os.path.exists(job["log"])):
+        return False
+    with open(job["log"], errors="replace") as f:
+        return any(COMPLETION_MARKER in line for line in f)
+
+
+def format_duration(seconds):
+    """Format seconds as e.g. "2h05m", "12m03s" or "41s"."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class SweepRunner:
+    """
+    Run sweep jobs as subprocesses, a fixed number at a time.
+
+    Each job runs on a thread blocked in wait(), so the next job starts as soon as a
+    Vivado process exits. Every job gets a process group of its own, so interrupting the
+    run terminates Vivado itself and not only the wrapper script that launched it.
+
+    Args:
+        parallel (int, optional): Jobs run at once, from default_parallel_jobs by default
+        report (callable, optional): Receives every progress line, print by default
+    """
+
+    def __init__(self, parallel=None, report=print):
+        self.parallel = default_parallel_jobs() if parallel is None else parallel
+        self.report = report
+        self._processes = set()
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def run_job(self, job):
+        """
+        Run one job to completion, its console output going to its log.
+
+        Args:
+            job (dict): Job from sweep_jobs
+
+        Returns:
+            dict: "name", "ok", "returncode" and "seconds" of the job.
+        """
+        os.makedirs(os.path.dirname(job["log"]) or ".", exist_ok=True)
+        os.makedirs(os.path.dirname(job["result"]), exist_ok=True)
+        start = time.perf_counter()
+        with self._lock:
+            # A job that never starts keeps the log of its previous run
+            if self._stopping:
+                return {"name": job["name"], "ok": False, "returncode": None, "seconds": 0.0}
+            with open(job["log"], "w") as log:
+                process = subprocess.Popen(
+                    job["command"], stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+                )
+            self._processes.add(process)
+        self.report(f"Started {job['name']}")
+        try:
+            returncode = process.wait()
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+        seconds = time.perf_counter() - start
+        return {"name": job["name"], "ok": returncode == 0 and job_completed(job), "returncode": returncode, "seconds": seconds}
+
+    def run(self, jobs, force=False):
+        """
+        Run every job not completed yet, reporting progress and the ETA as jobs finish.
+
+        Args:
+            jobs (list): Jobs from sweep_jobs
+            force (bool, optional): Also rerun jobs that already completed
+
+        Returns:
+            list: Outcomes of the jobs run, in completion order (see run_job).
+        """
+        pending = [job for job in jobs if force or not job_completed(job)]
+        for job in jobs:
+            if job not in pending:
+                self.report(f"Skipping {job['name']}, already completed")
+        if not pending:
+            return []
+
+        self.report(f"Running {len(pending)} jobs, {min(self.parallel, len(pending))} at a time")
+        start = time.perf_counter()
+        outcomes = []
+        with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            futures = [pool.submit(self.run_job, job) for job in pending]
+            try:
+                for future in as_completed(futures):
+                    outcome = future.result()
+                    outcomes.append(outcome)
+                    self.report(self._progress(outcome, len(outcomes), len(pending), time.perf_counter() - start))
+            except BaseException:
+                self.stop()
+                raise
+
+        failed = [outcome["name"] for outcome in outcomes if not outcome["ok"]]
+        self.report(
+            f"Sweep finished in {format_duration(time.perf_counter() - start)}: "
+            f"{len(outcomes) - len(failed)} completed, {len(failed)} failed" + (f" ({', '.join(failed)})" if failed else "")
+        )
+        return outcomes
+
+    def _progress(self, outcome, done, total, elapsed):
+        status = "done" if outcome["ok"] else f"FAILED (exit code {outcome['returncode']})"
+        line = f"[{done}/{total}] {outcome['name']} {status} in {format_duration(outcome['seconds'])}"
+        if done < total:
+            # Completed jobs per wall-clock second already reflect the parallelism
+            line += f", ETA {format_duration(elapsed * (total - done) / done)}"
+        return line
+
+    def stop(self):
+        """Terminate the running jobs and start no new ones."""
+        with self._lock:
+            self._stopping = True
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                continue
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Vivado parameter sweep of an architecture.")
+    parser.add_argument("architecture", help="Architecture name, e.g. register_tree")
+    parser.add_argument("--parallel", type=int, help="Jobs run at once, available cores / --cores-per-job by default")
+    parser.add_argument("--cores-per-job", type=int, default=CORES_PER_JOB, help="Cores each Vivado job keeps busy")
+    parser.add_argument("--queue-size", type=int, action="append", help="Only sweep this queue size (repeatable)")
+    parser.add_argument("--data-width", type=int, default=16, help="Data width of the queue entries")
+    parser.add_argument("--device", default=DEFAULT_DEVICE, choices=sorted(DEVICE_PARTS), help="FPGA device")
+    parser.add_argument("--vivado", default="vivado", help="Vivado executable")
+    parser.add_argument("--log-dir", default="parallel_logs", help="Directory of the Vivado console logs")
+    parser.add_argument("--force", action="store_true", help="Rerun configurations that already completed")
+    args = parser.parse_args()
+
+    try:
+        jobs = sweep_jobs(
+            args.architecture,
+            vivado=args.vivado,
+            data_width=args.data_width,
+            device=args.device,
+            queue_sizes=args.queue_size,
+            log_dir=args.log_dir,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    parallel = args.parallel or default_parallel_jobs(args.cores_per_job)
+    outcomes = SweepRunner(parallel).run(jobs, force=args.force)
+    raise SystemExit(0 if all(outcome["ok"] for outcome in outcomes) else 1)
@@ -0,0 +1,199 @@
+"""
+Vivado compute cost of parameter sweeps, from the synthesis and implementation
+run times recorded in every frequency block.
+"""
+
+import argparse
+import numpy as np
+from dataset import KEY_FIELDS, SWEEP_FIELDS, ResultsDataset
+
+# Columns identifying one architecture variant on one device and data width
+VARIANT_FIELDS = SWEEP_FIELDS[:-1]
+
+# One frequency point with its cost, see point_costs
+POINT_COST_DTYPE = [
+    ("architecture", "U32"),
+    ("variant", "U12"),
+    ("device", "U12"),
+    ("data_width", "i4"),
+    ("queue_size", "i8"),
+    ("target_frequency", "f8"),
+    ("achieved_frequency", "f8"),
+    ("synthesis_seconds", "f8"),
+    ("implementation_seconds", "f8"),
+    ("cost_seconds", "f8"),
+    ("raises_fmax", "?"),
+]
+
+
+def cost_seconds(dataset):
+    """
+    Get the Vivado wall-clock time of every row.
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+
+    Returns:
+        numpy.ndarray: Synthesis plus implementation seconds, NaN if neither was recorded.
+    """
+    synthesis = dataset["synthesis_seconds"]
+    implementation = dataset["implementation_seconds"]
+    cost = np.nan_to_num(synthesis) + np.nan_to_num(implementation)
+    return np.where(np.isnan(synthesis) & np.isnan(implementation), np.nan, cost)
+
+
+def point_costs(dataset):
+    """
+    Get the cost of every frequency point and whether it raised the max achieved frequency.
+
+    A point raises the max achieved frequency if it beats every earlier point of its
+    sweep, in the order the sweep ran them (the order of the log file).
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+
+    Returns:
+        numpy.ndarray: Structured array with dtype POINT_COST_DTYPE, grouped by sweep.
+    """
+    costs = np.zeros(len(dataset), dtype=POINT_COST_DTYPE)
+    if not len(dataset):
+        return costs
+
+    _, inverse = dataset._group_index(SWEEP_FIELDS)
+    order = np.argsort(inverse, kind="stable")
+    rows = dataset.rows[order]
+    for field in KEY_FIELDS + ("achieved_frequency", "synthesis_seconds", "implementation_seconds"):
+        costs[field] = rows[field]
+    costs["cost_seconds"] = cost_seconds(ResultsDataset(rows))
+
+    # Running maximum within each sweep
+    bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(rows)]))):
+        frequencies = np.nan_to_num(rows["achieved_frequency"][start:end], nan=-np.inf)
+        previous_max = np.maximum.accumulate(np.concatenate(([-np.inf], frequencies[:-1])))
+        costs["raises_fmax"][start:end] = frequencies > previous_max
+
+    return costs
+
+
+def sweep_costs(dataset):
+    """
+    Sum the cost of every sweep, i.e. of every log file.
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+
+    Returns:
+        list[dict]: One entry per sweep with its SWEEP_FIELDS, "points", "cost_seconds"
+            and "wasted_seconds" (cost of points that did not raise the max achieved frequency).
+    """
+    costs = point_costs(dataset)
+    summary = []
+    for key, subset in ResultsDataset(costs).group_by(*SWEEP_FIELDS):
+        rows = subset.rows
+        entry = dict(zip(SWEEP_FIELDS, key))
+        entry["points"] = len(rows)
+        entry["cost_seconds"] = float(np.nansum(rows["cost_seconds"]))
+        entry["wasted_seconds"] = float(np.nansum(rows["cost_seconds"][~rows["raises_fmax"]]))
+        summary.append(entry)
+    return summary
+
+
+def fit_cost_scaling(dataset):
+    """
+    Fit sweep cost against queue size as a power law, cost = coefficient * N^exponent.
+
+    The fit is a least-squares line through (log N, log cost) of the sweeps of each
+    architecture variant; variants with fewer than two queue sizes are skipped.
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+
+    Returns:
+        dict: Maps (architecture, variant, device, data_width) to a dictionary with
+            "coefficient", "exponent", "r_squared" and "queue_sizes".
+    """
+    sweeps = {}
+    for entry in sweep_costs(dataset):
+        if entry["cost_seconds"] > 0:
+            key = tuple(entry[field] for field in VARIANT_FIELDS)
+            sweeps.setdefault(key, []).append((entry["queue_size"], entry["cost_seconds"]))
+
+    fits = {}
+    for key, points in sweeps.items():
+        if len(points) < 2:
+            continue
+        log_sizes = np.log([queue_size for queue_size, _ in points])
+        log_costs = np.log([cost for _, cost in points])
+        exponent, intercept = np.polyfit(log_sizes, log_costs, 1)
+
+        residuals = log_costs - (exponent * log_sizes + intercept)
+        total = np.sum((log_costs - log_costs.mean()) ** 2)
+        fits[key] = {
+            "coefficient": float(np.exp(intercept)),
+            "exponent": float(exponent),
+            "r_squared": float(1 - np.sum(residuals**2) / total) if total > 0 else 1.0,
+            "queue_sizes": sorted(queue_size for queue_size, _ in points),
+        }
+    return fits
+
+
+def costly_points(dataset, top=20):
+    """
+    Find the most expensive frequency points that did not raise the max achieved frequency.
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+        top (int, optional): Number of points to return, None for all
+
+    Returns:
+        numpy.ndarray: Rows of point_costs, most expensive first.
+    """
+    costs = point_costs(dataset)
+    wasted = costs[~costs["raises_fmax"] & ~np.isnan(costs["cost_seconds"])]
+    wasted = wasted[np.argsort(-wasted["cost_seconds"], kind="stable")]
+    return wasted if top is None else wasted[:top]
+
+
+def print_report(dataset, top=20):
+    """
+    Print where Vivado time went: totals, cost scaling per variant and the costliest wasted points.
+
+    Args:
+        dataset (ResultsDataset): Frequency points
+        top (int, optional): Number of costly points to list
+    """
+    costs = point_costs(dataset)
+    total = np.nansum(costs["cost_seconds"])
+    wasted = np.nansum(costs["cost_seconds"][~costs["raises_fmax"]])
+    print(f"{len(costs)} frequency points, {total / 3600:.1f} h of Vivado time")
+    if total > 0:
+        print(f"{wasted / 3600:.1f} h ({100 * wasted / total:.1f}%) spent on points that did not raise Fmax")
+
+    print("\nCost scaling (cost = a * N^b)")
+    for (architecture, variant, device, data_width), fit in sorted(fit_cost_scaling(dataset).items()):
+        name = f"{architecture} {variant}".strip()
+        print(
+            f"{name:40s} {device:8s} {data_width:3d}bit a={fit['coefficient']:10.2f}s "
+            f"b={fit['exponent']:5.2f} R^2={fit['r_squared']:.3f}"
+        )
+
+    print("\nCostliest points that did not raise Fmax")
+    for row in costly_points(dataset, top):
+        name = f"{row['architecture']} {row['variant']}".strip()
+        print(
+            f"{name:40s} {row['device']:8s} N={row['queue_size']:<7d} target={row['target_frequency']:7.1f} MHz "
+            f"achieved={row['achieved_frequency']:8.3f} MHz cost={row['cost_seconds']:8.0f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the Vivado compute cost of parameter sweeps.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--device", action="append", help="Only include this device (repeatable)")
+    parser.add_argument("--arch", action="append", help="Only include this architecture (repeatable)")
+    parser.add_argument("--top", type=int, default=20, help="Number of costly points to list")
+    args = parser.parse_args()
+
+    dataset = ResultsDataset.from_results_tree(args.base_dir, devices=args.device, architectures=args.arch)
+    print_report(dataset, args.top)
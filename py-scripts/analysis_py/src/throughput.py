@@ -0,0 +1,120 @@
+"""
+Registry of throughput models: the operations per cycle of each architecture and
+operation, as a vectorized function of queue size.
+
+Constant factors come from config.PERFORMANCE_FACTORS; architectures whose throughput
+depends on the queue size register a model here instead.
+"""
+
+import numpy as np
+from config import PERFORMANCE_FACTORS
+
+# (architecture, operation) -> model, see register_throughput_model
+_MODELS = {}
+
+# Bumped on every registration, so caches of derived metrics can tell models changed
+_version = 0
+
+
+def register_throughput_model(arch, operation, model):
+    """
+    Declare the operations per cycle of an architecture for one operation.
+
+    Args:
+        arch (str): Architecture key, case-insensitive
+        operation (str): Operation type ('enqueue', 'dequeue', 'replace')
+        model (callable or float): Constant ops/cycle, or a function called with a NumPy
+            array of queue sizes plus keyword parameters, returning ops/cycle for every size
+    """
+    global _version
+    _MODELS[(arch.lower(), operation)] = model
+    _version += 1
+
+
+def unregister_throughput_model(arch, operation):
+    """Remove a registered model, falling back to PERFORMANCE_FACTORS."""
+    global _version
+    if _MODELS.pop((arch.lower(), operation), None) is not None:
+        _version += 1
+
+
+def models_version():
+    """Get a number that changes whenever a model is registered or removed."""
+    return _version
+
+
+def supports(arch, operation):
+    """
+    Whether an architecture supports an operation, i.e. declares a throughput for it.
+
+    Args:
+        arch (str): Architecture key
+        operation (str): Operation type
+
+    Returns:
+        bool: True if a model is registered or PERFORMANCE_FACTORS has a factor.
+    """
+    arch = arch.lower()
+    return (arch, operation) in _MODELS or arch in PERFORMANCE_FACTORS.get(operation, {})
+
+
+def ops_per_cycle(arch, operation, queue_sizes, **params):
+    """
+    Evaluate the throughput of one architecture over an array of queue sizes.
+
+    Architectures without a model or factor are assumed to complete one operation per cycle.
+
+    Args:
+        arch (str): Architecture key, case-insensitive
+        operation (str): Operation type
+        queue_sizes (array-like): Queue sizes
+        **params: Extra parameters passed to the model, e.g. data_width
+
+    Returns:
+        numpy.ndarray: Operations per cycle for every queue size.
+    """
+    arch = arch.lower()
+    queue_sizes = np.asarray(queue_sizes)
+    model = _MODELS.get((arch, operation), PERFORMANCE_FACTORS.get(operation, {}).get(arch, 1))
+    if callable(model):
+        with np.errstate(divide="ignore"):
+            factors = model(queue_sizes.astype(float), **params)
+    else:
+        factors = model
+    return np.broadcast_to(np.asarray(factors, dtype=float), queue_sizes.shape).copy()
+
+
+def ops_per_cycle_by_arch(arch_keys, queue_sizes, operation, **params):
+    """
+    Evaluate the throughput of entries of several architectures at once.
+
+    Args:
+        arch_keys (numpy.ndarray): Architecture of every entry
+        queue_sizes (numpy.ndarray): Queue size of every entry
+        operation (str): Operation type
+        **params: Extra parameters passed to the models
+
+    Returns:
+        numpy.ndarray: Operations per cycle of every entry.
+    """
+    names, inverse = np.unique(np.char.lower(np.asarray(arch_keys).astype(str)), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    factors = np.ones(len(inverse))
+    for index, name in enumerate(names.tolist()):
+        rows = inverse == index
+        factors[rows] = ops_per_cycle(name, operation, queue_sizes[rows], **params)
+    return factors
+
+
+def _register_tree_enqueue(queue_sizes, **_):
+    # An enqueue walks the tree, one level per cycle
+    return 1 / np.log2(queue_sizes)
+
+
+def _register_tree_pipelined_enqueue(queue_sizes, **_):
+    # Pipelining adds one cycle to the walk
+    return 1 / (np.log2(queue_sizes) + 1)
+
+
+register_throughput_model("register_tree_enq_enabled", "enqueue", _register_tree_enqueue)
+register_throughput_model("register_tree_pipelined_enq_enabled", "enqueue", _register_tree_pipelined_enqueue)
@@ -0,0 +1,227 @@
+"""
+Workload-mix throughput model: the sustained MOPS of an architecture running a mix of
+enqueue, dequeue and replace operations.
+
+Operations are issued back to back, so the time per operation is the weighted sum of
+each operation's time and the sustained throughput is the weighted harmonic mean of the
+per-operation throughputs. Pipeline restrictions (e.g. the 1/2 op/cycle of the pipelined
+register array) enter through the throughput registry; a mix using an operation the
+architecture does not support is infeasible.
+"""
+
+import argparse
+import os
+import numpy as np
+from config import DEFAULT_DEVICE
+from dataset import LazyResults
+from metrics_engine import OPERATIONS, compute_metrics, nearest_power_of_two
+from throughput import supports
+
+
+def parse_mix(text):
+    """
+    Parse an operation mix such as "enqueue=3,dequeue=1".
+
+    Args:
+        text (str): Comma-separated operation=weight pairs; a bare operation has weight 1
+
+    Returns:
+        dict: Maps operations to weights.
+
+    Raises:
+        ValueError: If an operation is unknown or a weight is negative.
+    """
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        operation, _, weight = item.partition("=")
+        mix[operation] = float(weight) if weight else 1.0
+    normalize_mix(mix)
+    return mix
+
+
+def normalize_mix(mix):
+    """
+    Turn an operation mix into fractions aligned with OPERATIONS.
+
+    Args:
+        mix (dict): Maps operations to relative weights, e.g. {"replace": 6, "enqueue": 3, "dequeue": 1}
+
+    Returns:
+        numpy.ndarray: Fraction of every operation in OPERATIONS, summing to one.
+
+    Raises:
+        ValueError: If an operation is unknown, a weight negative, or no weight positive.
+    """
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operation: {', '.join(sorted(unknown))}")
+    weights = np.array([mix.get(operation, 0.0) for operation in OPERATIONS], dtype=float)
+    if np.any(weights < 0):
+        raise ValueError("Operation weights must not be negative")
+    if weights.sum() <= 0:
+        raise ValueError("Operation mix has no positive weight")
+    return weights / weights.sum()
+
+
+def harmonic_throughput(fractions, performance):
+    """
+    Compute the sustained throughput of many mixes and entries at once.
+
+    Args:
+        fractions (numpy.ndarray): (..., operations) fractions aligned with OPERATIONS
+        performance (numpy.ndarray): (operations, entries) MOPS of every operation, NaN or
+            non-positive where an entry cannot perform it
+
+    Returns:
+        numpy.ndarray: (..., entries) sustained MOPS, NaN where a mix uses an operation
+            an entry cannot perform.
+    """
+    fractions = np.asarray(fractions, dtype=float)
+    performance = np.asarray(performance, dtype=float)
+    unusable = ~(performance > 0)
+    with np.errstate(divide="ignore"):
+        seconds_per_op = np.where(unusable, 0.0, 1 / np.where(unusable, 1.0, performance))
+
+    seconds = fractions @ seconds_per_op
+    infeasible = (fractions > 0).astype(float) @ unusable.astype(float) > 0
+    with np.errstate(divide="ignore"):
+        return np.where(infeasible, np.nan, 1 / seconds)
+
+
+def operation_performance(table, arch_keys=None):
+    """
+    Get the MOPS of every operation of every table entry, NaN where unsupported.
+
+    Args:
+        table (metrics_engine.MetricsTable): Metrics computed for every operation
+        arch_keys (numpy.ndarray, optional): Architecture of every entry, the table's by default
+
+    Returns:
+        numpy.ndarray: (operations, entries) matrix aligned with OPERATIONS.
+    """
+    keys = (table.arch_keys if arch_keys is None else arch_keys).astype(str).tolist()
+    rows = []
+    for operation in OPERATIONS:
+        supported = np.array([supports(key, operation) for key in keys], dtype=bool)
+        rows.append(np.where(supported, table[f"{operation}_performance"], np.nan))
+    return np.vstack(rows) if rows else np.zeros((0, len(keys)))
+
+
+def mix_throughput(data, mix, arch_list=None):
+    """
+    Compute the sustained MOPS of every architecture and queue size under one mix.
+
+    Args:
+        data (dict, LazyResults or ResultsDataset): Data for several architectures
+        mix (dict): Maps operations to relative weights
+        arch_list (list, optional): Architectures to evaluate, all by default
+
+    Returns:
+        dict: Maps architecture keys to ([queue sizes], [sustained MOPS]), skipping
+            architectures that cannot run the mix.
+    """
+    fractions = normalize_mix(mix)
+    if isinstance(data, (dict, LazyResults)):
+        keys = [key for key in (data if arch_list is None else arch_list) if key in data]
+        data = {key: data[key] for key in keys}
+    table = compute_metrics(data)
+    throughput = harmonic_throughput(fractions, operation_performance(table))
+
+    results = {}
+    for arch_name in table.architectures():
+        if arch_list is not None and arch_name not in arch_list:
+            continue
+        rows = (table.arch_keys == arch_name) & ~np.isnan(throughput)
+        if rows.any():
+            results[arch_name] = (table.queue_sizes[rows], throughput[rows])
+    return results
+
+
+def mix_grid(step=0.1):
+    """
+    Enumerate the mixes of a regular grid over the enqueue/replace shares.
+
+    Args:
+        step (float, optional): Grid spacing of each share
+
+    Returns:
+        tuple: (enqueue shares, replace shares, fractions) where fractions is a
+            (replace, enqueue, operations) array, NaN outside the simplex.
+    """
+    shares = np.round(np.arange(0, 1 + step / 2, step), 10)
+    enqueue, replace = np.meshgrid(shares, shares)
+    dequeue = 1 - enqueue - replace
+    fractions = np.stack(
+        [{"enqueue": enqueue, "dequeue": dequeue, "replace": replace}[operation] for operation in OPERATIONS], axis=-1
+    )
+    fractions[dequeue < -1e-9] = np.nan
+    return shares, shares, np.clip(fractions, 0, None)
+
+
+def mix_sweep(data, queue_size, step=0.1, arch_list=None):
+    """
+    Find the best architecture for every mix of a grid, at one queue size.
+
+    Queue sizes are matched by their nearest power of two (see nearest_power_of_two).
+
+    Args:
+        data (dict, LazyResults or ResultsDataset): Data for several architectures
+        queue_size (int): Queue size compared
+        step (float, optional): Grid spacing of the enqueue and replace shares
+        arch_list (list, optional): Architectures compared, all by default
+
+    Returns:
+        dict: "enqueue" and "replace" shares (the remainder is dequeue), "architectures"
+            compared, "throughput" as a (replace, enqueue, architectures) array and "best"
+            (index into architectures, -1 where no architecture can run the mix) and
+            "best_throughput" as (replace, enqueue) arrays.
+    """
+    if isinstance(data, (dict, LazyResults)):
+        keys = [key for key in (data if arch_list is None else arch_list) if key in data]
+        data = {key: data[key] for key in keys}
+    table = compute_metrics(data)
+    rows = np.flatnonzero(nearest_power_of_two(table.queue_sizes) == nearest_power_of_two(queue_size))
+    architectures = table.arch_keys[rows].astype(str).tolist()
+    if arch_list is not None:
+        rows = rows[[arch in arch_list for arch in architectures]]
+        architectures = table.arch_keys[rows].astype(str).tolist()
+
+    enqueue, replace, fractions = mix_grid(step)
+    throughput = harmonic_throughput(np.nan_to_num(fractions), operation_performance(table)[:, rows])
+    throughput[np.isnan(fractions[..., 0])] = np.nan
+
+    sweep = {"enqueue": enqueue, "replace": replace, "architectures": architectures, "throughput": throughput}
+    if not rows.size:
+        # No architecture has that queue size, so no mix can run
+        return {**sweep, "best": np.full(throughput.shape[:-1], -1), "best_throughput": np.full(throughput.shape[:-1], np.nan)}
+
+    feasible = ~np.all(np.isnan(throughput), axis=-1)
+    best = np.where(feasible, np.argmax(np.nan_to_num(throughput, nan=-np.inf), axis=-1), -1)
+    best_throughput = np.where(feasible, np.nanmax(np.where(feasible[..., None], throughput, 0), axis=-1), np.nan)
+    return {**sweep, "best": best, "best_throughput": best_throughput}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep operation mixes and plot the best architecture of each.")
+    parser.add_argument("base_dir", help="hwpq directory containing the architecture directories")
+    parser.add_argument("--queue-size", type=int, required=True, help="Queue size compared")
+    parser.add_argument("--device", default=DEFAULT_DEVICE, help="FPGA device")
+    parser.add_argument("--step", type=float, default=0.1, help="Grid spacing of the enqueue and replace shares")
+    parser.add_argument(
+        "--mix", type=parse_mix, help='Also print the sustained MOPS of one mix, e.g. "replace=6,enqueue=3,dequeue=1"'
+    )
+    parser.add_argument("--output", help="Heatmap path, workload_mix_<N>.png by default")
+    args = parser.parse_args()
+
+    results = LazyResults(args.base_dir, device=args.device)
+    results.prefetch(list(results))
+    if args.mix:
+        for arch_name, (queue_sizes, mops) in mix_throughput(results, args.mix).items():
+            print(f"{arch_name:40s} " + "  ".join(f"{q}:{m:.1f}" for q, m in zip(queue_sizes.tolist(), mops.tolist())))
+
+    # Imported here so the model itself does not need matplotlib
+    from plotter import FINAL_DPI, create_mix_heatmap, setup_plot_style
+
+    setup_plot_style(dpi=FINAL_DPI)
+    output = args.output or os.path.join(os.getcwd(), f"workload_mix_{args.queue_size}.png")
+    create_mix_heatmap(results, args.queue_size, output, step=args.step)
@@ -0,0 +1,90 @@
+"""
+Unit tests for cache.py
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cache as cache_module
+from cache import ParseCache
+from parsers import parse_frequency_records, process_directory
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_dir = os.path.join(self.tmp_dir, "logs")
+        shutil.copytree(os.path.join(HWPQ_DIR, "bram_tree/vivado_analysis_results_16bit_xcau25p"), self.log_dir)
+        self.log_file = os.path.join(self.log_dir, "vivado_analysis_on_queue_size_15.txt")
+        self.db_path = os.path.join(self.tmp_dir, "out", "cache.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        """Test that stored records come back unchanged."""
+        records = parse_frequency_records(self.log_file)
+        with ParseCache(self.db_path) as cache:
+            self.assertIsNone(cache.get(self.log_file))
+            cache.put(self.log_file, records)
+            self.assertEqual(cache.get(self.log_file), records)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_process_directory_only_parses_changed_files(self):
+        """Test that a second ingest is served from the cache except for modified logs."""
+        with ParseCache(self.db_path) as cache:
+            first = process_directory(self.log_dir, cache=cache)
+            self.assertEqual(len(cache), len(first))
+
+        # Append a faster frequency point to one log
+        with open(self.log_file, "a") as f:
+            f.write("Frequency: 900 MHz -> Achieved Frequency: 999.000 MHz\n")
+
+        with ParseCache(self.db_path) as cache:
+            second = process_directory(self.log_dir, cache=cache)
+            self.assertEqual(cache.misses, 1)
+            self.assertEqual(cache.hits, len(first) - 1)
+
+        self.assertEqual(second[15]["max_achieved_frequency"], 999.0)
+        del first[15], second[15]
+        self.assertEqual(first, second)
+
+    def test_parser_version_invalidates(self):
+        """Test that entries written by another parser version are stale."""
+        with ParseCache(self.db_path) as cache:
+            cache.put(self.log_file, parse_frequency_records(self.log_file))
+            with mock.patch.object(cache_module, "PARSER_VERSION", -1):
+                self.assertIsNone(cache.get(self.log_file))
+                self.assertEqual(cache.prune(), 1)
+            self.assertEqual(len(cache), 0)
+
+    def test_prune_and_clear(self):
+        """Test removal of entries for deleted files and clearing the cache."""
+        with ParseCache(self.db_path) as cache:
+            process_directory(self.log_dir, cache=cache)
+            count = len(cache)
+
+            os.remove(self.log_file)
+            self.assertEqual(cache.prune(), 1)
+            self.assertEqual(len(cache), count - 1)
+
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+    def test_corrupt_database_is_recreated(self):
+        """Test that an unreadable cache file is replaced rather than failing."""
+        os.makedirs(os.path.dirname(self.db_path))
+        with open(self.db_path, "w") as f:
+            f.write("not a database" * 100)
+
+        with ParseCache(self.db_path) as cache:
+            self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
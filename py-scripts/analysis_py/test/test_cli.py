@@ -0,0 +1,79 @@
+"""
+Unit tests for cli.py
+"""
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from cli import main, startup_time
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+class TestCli(unittest.TestCase):
+    def test_query_does_not_load_matplotlib(self):
+        """Test that ingest then query run in a fresh interpreter without importing matplotlib."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = os.path.join(temp_dir, "index.npz")
+            code = (
+                f"import sys; sys.path.insert(0, {SRC_DIR!r}); import cli; "
+                f"cli.main(['--base-dir', {HWPQ_DIR!r}, 'ingest', '--no-cache', '--workers', '1', '--index', {index!r}]); "
+                f"cli.main(['--base-dir', {HWPQ_DIR!r}, 'query', '--index', {index!r}, '--queue-size', '64', '--top', '2']); "
+                "print('matplotlib' in sys.modules)"
+            )
+            output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+            lines = output.strip().splitlines()
+            self.assertTrue(lines[0].startswith("Indexed"))
+            self.assertEqual(len(lines), 5)
+            self.assertEqual(lines[-1], "False")
+
+    def test_device_filter_keeps_the_whole_index(self):
+        """Test that a query filtered by device still builds and saves the index of every device."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = os.path.join(temp_dir, "index.npz")
+            args = ["--base-dir", HWPQ_DIR, "query", "--index", index, "--no-cache", "--workers", "1"]
+            with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                main(args + ["--device", "xcvu19p"])
+            rows = stdout.getvalue().splitlines()[1:]
+            self.assertTrue(rows and all(row.startswith("xcvu19p ") for row in rows))
+
+            with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                main(args)
+            self.assertIn("xcau25p ", stdout.getvalue())
+
+    def test_export_csv(self):
+        """Test that export writes one row per sweep, with missing values left empty."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "results.csv")
+            main(["--base-dir", HWPQ_DIR, "export", path, "--no-cache", "--workers", "1", "--device", "xcau25p"])
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+
+        sweeps = {(row["architecture"], row["variant"], row["queue_size"]) for row in rows}
+        self.assertEqual(len(sweeps), len(rows))
+        self.assertEqual({row["device"] for row in rows}, {"xcau25p"})
+        self.assertEqual({row["variant"] for row in rows if row["architecture"] == "bram_tree"}, {""})
+        float(rows[0]["achieved_frequency"])
+
+    def test_invalid_mix_is_a_usage_error(self):
+        """Test that an unknown operation in --mix exits with a usage error, not a traceback."""
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr, self.assertRaises(SystemExit) as exit:
+            main(["--base-dir", HWPQ_DIR, "query", "--mix", "peek=1"])
+        self.assertEqual(exit.exception.code, 2)
+        self.assertIn("argument --mix: Unknown operation: peek", stderr.getvalue())
+
+    def test_startup_time(self):
+        """Test that the CLI alone loads no heavy library and query loads NumPy only."""
+        self.assertEqual(startup_time(None, repeat=1)[1], "")
+        self.assertEqual(startup_time("query", repeat=1)[1], "numpy")
+
+
+if __name__ == "__main__":
+    unittest.main()
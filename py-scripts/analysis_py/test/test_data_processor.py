@@ -29,5 +29,46 @@ class TestDataProcessor(unittest.TestCase):
         self.sample_log_file = os.path.join(self.test_log_dir, log_files[0])
 
 
+class TestDeviceNormalization(unittest.TestCase):
+
+    def test_device_utilization(self):
+        """Test utilization computed from absolute counts against each device's totals"""
+        data_dict = {8: {"queue_size": 8, "luts_used": 1410, "registers_used": 2820}}
+        _, small = data_processor.get_device_utilization(data_dict, "xcau25p")
+        _, large = data_processor.get_device_utilization(data_dict, "xcvu19p", "registers")
+        self.assertAlmostEqual(small[0], 100 * 1410 / TOTAL_LUTS)
+        self.assertAlmostEqual(large[0], 100 * 2820 / 8171520)
+
+    def test_join_devices(self):
+        """Test joining queue sizes of 2^k and 2^k - 1 entries across devices"""
+        joined = data_processor.join_devices({
+            "xcau25p": {"register_array_enq_enabled": {4: {"queue_size": 4, "luts_used": 141}}, "bram_tree": {4: {"queue_size": 4}}},
+            "xcvu19p": {"register_array_enq_enabled": {3: {"queue_size": 3, "luts_used": 141}, 127: {"queue_size": 127}}},
+        })
+        self.assertEqual(list(joined), ["register_array_enq_enabled"])
+        self.assertEqual(list(joined["register_array_enq_enabled"]), [4])
+        by_device = joined["register_array_enq_enabled"][4]
+        self.assertEqual(by_device["xcvu19p"]["queue_size"], 3)
+        self.assertAlmostEqual(by_device["xcau25p"]["luts_device_percent"], 0.1)
+
+        exact = data_processor.join_devices({
+            "xcau25p": {"register_array_enq_enabled": {4: {"queue_size": 4}}},
+            "xcvu19p": {"register_array_enq_enabled": {3: {"queue_size": 3}}},
+        }, match_power_of_two=False)
+        self.assertEqual(exact, {})
+
+
+class TestResourceCounts(unittest.TestCase):
+
+    def test_counts_are_integers(self):
+        """Test that LUT and register counts keep their integer type, skipping missing entries"""
+        data_dict = {8: {"queue_size": 8, "luts_used": 141, "registers_used": 282}, 4: {"queue_size": 4}}
+        for get_usage, expected in ((data_processor.get_lut_usage, 141), (data_processor.get_register_usage, 282)):
+            queue_sizes, counts = get_usage(data_dict)
+            self.assertEqual(queue_sizes.tolist(), [8])
+            self.assertEqual(counts.dtype, np.int64)
+            self.assertEqual(counts.tolist(), [expected])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for dataset.py
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import data_processor
+from dataset import LazyResults, ResultsDataset, arch_key, prefetch_together
+from parsers import process_directory
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+class TestResultsDataset(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = ResultsDataset.from_results_tree(HWPQ_DIR, architectures=["register_tree", "bram_tree"])
+
+    def test_matches_process_directory(self):
+        """Test that the dataset converts back to the dictionaries process_directory returns."""
+        data_dicts = self.dataset.filter(device="xcau25p").to_data_dicts()
+
+        enq_disabled_data, enq_enabled_data = process_directory(
+            os.path.join(HWPQ_DIR, "register_tree/vivado_analysis_results_16bit_xcau25p")
+        )
+        self.assertEqual(data_dicts["register_tree_enq_disabled"], enq_disabled_data)
+        self.assertEqual(data_dicts["register_tree_enq_enabled"], enq_enabled_data)
+        self.assertEqual(
+            data_dicts["bram_tree"],
+            process_directory(os.path.join(HWPQ_DIR, "bram_tree/vivado_analysis_results_16bit_xcau25p")),
+        )
+
+    def test_several_devices_must_be_filtered(self):
+        """Test that mixing devices in one data dictionary is refused."""
+        with self.assertRaises(ValueError):
+            self.dataset.to_data_dicts()
+
+    def test_filter_and_group_by(self):
+        """Test vectorized filtering and grouping."""
+        subset = self.dataset.filter(arch_key="register_tree_enq_enabled", queue_size=[7, 15])
+        self.assertTrue(np.all(subset["architecture"] == "register_tree"))
+        self.assertEqual(set(subset.unique("queue_size")), {7, 15})
+        self.assertEqual(set(subset.unique("device")), {"xcau25p", "xcvu19p"})
+
+        groups = dict(subset.group_by("device", "queue_size"))
+        self.assertEqual(len(groups), 4)
+        self.assertEqual(sum(len(group) for group in groups.values()), len(subset))
+
+        keys, values = subset.aggregate(("device", "queue_size"), "achieved_frequency", "max")
+        for key, value in zip(keys.tolist(), values):
+            self.assertEqual(value, groups[key]["achieved_frequency"].max())
+
+        fast = self.dataset.filter(achieved_frequency=lambda column: column > 500)
+        self.assertTrue(np.all(fast["achieved_frequency"] > 500))
+
+    def test_save_and_memory_map(self):
+        """Test that a saved dataset is memory-mapped back unchanged."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "results.npy")
+            self.dataset.save(path)
+            loaded = ResultsDataset.load(path)
+
+            self.assertIsInstance(loaded.rows, np.memmap)
+            np.testing.assert_array_equal(loaded.rows, self.dataset.rows)
+            self.assertEqual(
+                loaded.filter(device="xcau25p").to_data_dicts(),
+                self.dataset.filter(device="xcau25p").to_data_dicts(),
+            )
+            del loaded
+
+    def test_data_processor_accepts_dataset(self):
+        """Test that data_processor functions take a single-architecture dataset directly."""
+        subset = self.dataset.filter(device="xcau25p", architecture="bram_tree")
+        queue_sizes, frequencies = data_processor.get_max_achieved_frequency(subset)
+        expected = data_processor.get_max_achieved_frequency(subset.to_data_dict())
+
+        np.testing.assert_array_equal(queue_sizes, expected[0])
+        np.testing.assert_array_equal(frequencies, expected[1])
+
+    def test_arch_key(self):
+        """Test naming of architecture variants."""
+        self.assertEqual(arch_key("register_array", "enq_enabled"), "register_array_enq_enabled")
+        self.assertEqual(arch_key("bram_tree", ""), "bram_tree")
+        self.assertEqual(arch_key("systolic_array", "enq_enabled"), "systolic_array")
+        self.assertIsNone(arch_key("systolic_array", "enq_disabled"))
+
+
+class TestLazyResults(unittest.TestCase):
+    def test_parses_only_touched_keys(self):
+        """Test that architectures are parsed on first access and memoized."""
+        lazy = LazyResults(HWPQ_DIR)
+        self.assertIn("bram_tree", lazy)
+        self.assertIn("register_tree_enq_enabled", lazy)
+        self.assertEqual(lazy.loaded_keys(), [])
+
+        data_dict = lazy["register_tree_enq_enabled"]
+        self.assertEqual(lazy.loaded_keys(), ["register_tree_enq_enabled"])
+        self.assertIs(lazy["register_tree_enq_enabled"], data_dict)
+        self.assertEqual(
+            data_dict, process_directory(os.path.join(HWPQ_DIR, "register_tree/vivado_analysis_results_16bit_xcau25p"))[1]
+        )
+
+        with self.assertRaises(KeyError):
+            lazy["unknown_tree"]
+
+    def test_subset_shares_parsed_data(self):
+        """Test that a subset only exposes its keys and reuses parsed architectures."""
+        lazy = LazyResults(HWPQ_DIR, architectures=["register_tree", "bram_tree"])
+        subset = lazy.subset(["bram_tree", "systolic_array"])
+        self.assertEqual(list(subset), ["bram_tree"])
+
+        subset.prefetch(subset)
+        self.assertEqual(lazy.loaded_keys(), ["bram_tree"])
+        self.assertEqual(
+            lazy.dataset(["bram_tree"]).to_data_dict(),
+            ResultsDataset.from_results_tree(HWPQ_DIR, devices=["xcau25p"], architectures=["bram_tree"]).to_data_dict(),
+        )
+
+    def test_devices_prefetched_together(self):
+        """Test one lazy mapping per device, loaded in a single pass."""
+        by_device = LazyResults.by_device(HWPQ_DIR, architectures=["register_tree", "bram_tree"])
+        self.assertEqual(list(by_device), ["xcau25p", "xcvu19p"])
+        self.assertNotIn("bram_tree", by_device["xcvu19p"])
+
+        prefetch_together((results, ["register_tree_enq_disabled"]) for results in by_device.values())
+        for device, results in by_device.items():
+            self.assertEqual(results.loaded_keys(), ["register_tree_enq_disabled"])
+            self.assertEqual(
+                results["register_tree_enq_disabled"],
+                process_directory(os.path.join(HWPQ_DIR, f"register_tree/vivado_analysis_results_16bit_{device}"))[0],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for fmax_stats.py
+"""
+import unittest
+import numpy as np
+
+from dataset import DATASET_DTYPE, ResultsDataset
+from fmax_stats import frequency_bands, sustainable_fmax
+
+
+def sweep_rows(queue_size, achieved, architecture="bram_tree", targets=None):
+    # Plateau points by default: every target is above the achieved frequency
+    rows = np.zeros(len(achieved), dtype=DATASET_DTYPE)
+    rows["architecture"] = architecture
+    rows["device"] = "xcau25p"
+    rows["data_width"] = 16
+    rows["queue_size"] = queue_size
+    rows["target_frequency"] = 800 + 50 * np.arange(len(achieved)) if targets is None else targets
+    rows["achieved_frequency"] = achieved
+    return rows
+
+
+class TestSustainableFmax(unittest.TestCase):
+    def test_outlier_does_not_set_sustainable_fmax(self):
+        """Test that one lucky target raises the peak but not the sustainable Fmax."""
+        plateau = [400, 405, 410, 395, 402, 398, 404, 401]
+        dataset = ResultsDataset(np.concatenate([sweep_rows(8, plateau + [600]), sweep_rows(16, plateau)]))
+        stats = sustainable_fmax(dataset, samples=500)
+
+        self.assertEqual(stats["queue_size"].tolist(), [8, 16])
+        self.assertEqual(stats["samples"].tolist(), [9, 8])
+        self.assertEqual(stats["peak_frequency"].tolist(), [600, 410])
+        self.assertLess(stats["sustainable_frequency"][0], 410)
+        self.assertTrue(np.all(stats["sustainable_lower"] <= stats["sustainable_frequency"]))
+        self.assertTrue(np.all(stats["sustainable_frequency"] <= stats["sustainable_upper"]))
+
+    def test_only_plateau_is_sampled(self):
+        """Test that targets met with slack, where Fmax follows the target, are not sampled."""
+        targets = [100, 200, 300, 400, 450, 500, 550]
+        achieved = [292.0, 330.0, 380.0, 474.0, 440.0, 450.0, 445.0]
+        stats = sustainable_fmax(ResultsDataset(sweep_rows(64, achieved, targets=targets)), samples=200)
+        self.assertEqual(stats["samples"].tolist(), [3])
+        self.assertEqual(stats["peak_frequency"].tolist(), [474])
+        self.assertAlmostEqual(stats["sustainable_frequency"][0], np.quantile([440, 450, 445], 0.75))
+
+        # Without a missed target, the highest target stands in for the plateau
+        stats = sustainable_fmax(ResultsDataset(sweep_rows(64, [150.0, 250.0, 350.0], targets=[100, 200, 300])))
+        self.assertEqual(stats["samples"].tolist(), [1])
+        self.assertEqual(stats["sustainable_frequency"].tolist(), [350])
+
+    def test_quantile_matches_numpy(self):
+        """Test the estimate against numpy.quantile, and that repeated runs add samples."""
+        achieved = [300.0, 350.0, 320.0, 410.0, 380.0]
+        dataset = ResultsDataset(np.concatenate([sweep_rows(8, achieved), sweep_rows(8, achieved[:3])]))
+        stats = sustainable_fmax(dataset, quantile=0.6, samples=10)
+        self.assertEqual(stats["samples"].tolist(), [8])
+        self.assertAlmostEqual(stats["sustainable_frequency"][0], np.quantile(achieved + achieved[:3], 0.6))
+
+    def test_constant_samples_have_no_spread(self):
+        """Test that identical samples give a zero-width interval, and that bootstrap is seeded."""
+        dataset = ResultsDataset(sweep_rows(4, [500.0] * 6))
+        stats = sustainable_fmax(dataset)
+        self.assertEqual(stats["sustainable_lower"][0], 500)
+        self.assertEqual(stats["sustainable_upper"][0], 500)
+
+        noisy = ResultsDataset(sweep_rows(4, [500.0, 450, 520, 480, 470]))
+        np.testing.assert_array_equal(sustainable_fmax(noisy, seed=3), sustainable_fmax(noisy, seed=3))
+
+    def test_frequency_bands(self):
+        """Test bands of one architecture from a dataset, and none from plain data dictionaries."""
+        dataset = ResultsDataset(
+            np.concatenate(
+                [sweep_rows(16, [400, 420, 410]), sweep_rows(8, [500, 510, 490]), sweep_rows(8, [1, 2], "hybrid_tree")]
+            )
+        )
+        queue_sizes, sustainable, lower, upper = frequency_bands(dataset, "bram_tree")
+        self.assertEqual(queue_sizes.tolist(), [8, 16])
+        self.assertTrue(np.all(lower <= sustainable) and np.all(sustainable <= upper))
+        self.assertIsNone(frequency_bands({"bram_tree": {8: {"max_achieved_frequency": 500}}}, "bram_tree"))
+
+
+if __name__ == "__main__":
+    unittest.main()
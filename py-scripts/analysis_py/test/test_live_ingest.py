@@ -0,0 +1,118 @@
+"""
+Unit tests for live_ingest.py
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from live_ingest import LogTailer
+from parsers import parse_frequency_records, parse_metrics
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+SOURCE_LOG = os.path.join(
+    HWPQ_DIR, "register_array/vivado_analysis_results_16bit_xcau25p/enqueue_0/vivado_analysis_on_queue_size_16.txt"
+)
+
+
+class TestLogTailer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_dir = os.path.join(self.tmp_dir, "register_array/vivado_analysis_results_16bit_xcau25p")
+        for enqueue_dir in ("enqueue_0", "enqueue_1"):
+            os.makedirs(os.path.join(self.log_dir, enqueue_dir))
+        self.log_file = os.path.join(self.log_dir, "enqueue_0/vivado_analysis_on_queue_size_16.txt")
+
+        with open(SOURCE_LOG) as f:
+            self.content = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, text, mode="a"):
+        with open(self.log_file, mode) as f:
+            f.write(text)
+
+    def test_incremental_blocks(self):
+        """Test that only appended frequency blocks are parsed, including split lines."""
+        tailer = LogTailer(self.tmp_dir)
+        self.assertEqual(tailer.poll(), {})
+
+        blocks = self.content.split("\n\n\n")
+        self.write(blocks[0] + "\n\n\n", mode="w")
+        new_records = tailer.poll()
+        self.assertEqual(len(new_records[self.log_file]), 1)
+        self.assertEqual(tailer.data_dicts()["register_array_enq_disabled"][16]["max_achieved_frequency"], 233.863)
+
+        # Stop in the middle of the line closing the second block
+        second = blocks[1] + "\n\n\n"
+        split = second.index("Achieved Frequency") + 25
+        self.write(second[:split])
+        self.assertEqual(tailer.poll(), {})
+
+        self.write(second[split:] + "\n\n\n".join(blocks[2:]))
+        new_records = tailer.poll()
+        self.assertEqual(len(new_records[self.log_file]), 12)
+        self.assertTrue(tailer.is_finished(self.log_file))
+
+        self.assertEqual(len(tailer.dataset), 13)
+        self.assertEqual(tailer.data_dicts()["register_array_enq_disabled"][16], parse_metrics(SOURCE_LOG))
+
+    def test_rewritten_file_is_read_again(self):
+        """Test that a sweep re-creating its result file resets the parsed state."""
+        tailer = LogTailer(self.tmp_dir)
+        self.write(self.content, mode="w")
+        tailer.poll()
+        self.assertEqual(len(tailer.dataset), 13)
+
+        header, first_block = self.content.split("\n\n\n")[0].split("\n\n", 1)
+        os.remove(self.log_file)
+        self.write(header + "\n\n" + first_block + "\n\n\n", mode="w")
+        tailer.poll()
+
+        self.assertEqual(len(tailer.dataset), 1)
+        self.assertEqual(tailer.progress()[0]["points"], 1)
+        self.assertFalse(tailer.is_finished(self.log_file))
+
+    def test_add_file_before_it_exists(self):
+        """Test following a file the sweep has not created yet."""
+        tailer = LogTailer()
+        tailer.add_file(self.log_file, ("register_array", "enq_disabled", "xcau25p", 16, 16))
+        self.assertEqual(tailer.poll(), {})
+
+        self.write(self.content, mode="w")
+        tailer.poll()
+        self.assertEqual(tailer.progress()[0]["points"], len(parse_frequency_records(SOURCE_LOG)))
+
+    def test_finished_at_last_target_frequency(self):
+        """Test that a sweep meeting timing up to the last target finishes without the WNS line."""
+        with open(SOURCE_LOG.replace("queue_size_16", "queue_size_4")) as f:
+            content = f.read()
+        self.assertNotIn("WNS exceeded", content)
+        log_file = os.path.join(self.log_dir, "enqueue_0/vivado_analysis_on_queue_size_4.txt")
+
+        tailer = LogTailer(self.tmp_dir)
+        last_block = content.rindex("Frequency: 800 MHz")
+        with open(log_file, "w") as f:
+            f.write(content[:last_block])
+        tailer.poll()
+        self.assertFalse(tailer.is_finished(log_file))
+
+        with open(log_file, "a") as f:
+            f.write(content[last_block:])
+        tailer.watch(interval=0, until_finished=True)
+        self.assertTrue(tailer.is_finished(log_file))
+        self.assertEqual(tailer.progress()[0]["points"], 15)
+
+    def test_mark_finished(self):
+        """Test marking a file finished once the job writing it exited."""
+        tailer = LogTailer()
+        tailer.add_file(self.log_file, ("register_array", "enq_disabled", "xcau25p", 16, 16))
+        tailer.mark_finished(self.log_file)
+        tailer.watch(interval=0, until_finished=True)
+        self.assertTrue(tailer.is_finished(self.log_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
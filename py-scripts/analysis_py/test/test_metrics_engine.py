@@ -0,0 +1,145 @@
+"""
+Unit tests for metrics_engine.py
+"""
+import os
+import unittest
+from math import log2
+import numpy as np
+
+import data_processor
+from config import PERFORMANCE_FACTORS
+from dataset import LazyResults, ResultsDataset
+from metrics_engine import OPERATIONS, MetricsCache, compute_metrics
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+class TestMetricsEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lazy = LazyResults(HWPQ_DIR)
+        cls.data_dicts = dict(cls.lazy.items())
+
+    def test_matches_per_architecture_loops(self):
+        """Test every column against a straightforward per-entry computation."""
+        table = compute_metrics(self.data_dicts)
+        self.assertEqual(table.architectures(), list(self.data_dicts))
+
+        for arch_name, data_dict in self.data_dicts.items():
+            queue_sizes = sorted(data_dict)
+            for operation in OPERATIONS:
+                expected_performance = []
+                expected_efficiency = []
+                for queue_size in queue_sizes:
+                    metrics = data_dict[queue_size]
+                    if operation == "enqueue" and arch_name == "register_tree_enq_enabled":
+                        factor = 1 / log2(queue_size)
+                    elif operation == "enqueue" and arch_name == "register_tree_pipelined_enq_enabled":
+                        factor = 1 / (log2(queue_size) + 1)
+                    else:
+                        factor = PERFORMANCE_FACTORS[operation].get(arch_name, 1)
+                    performance = metrics["max_achieved_frequency"] * factor
+                    utilization = max(
+                        metrics["luts_util_percent"], metrics["registers_util_percent"], metrics["bram_util_percent"]
+                    )
+                    expected_performance.append(performance)
+                    expected_efficiency.append(performance / utilization)
+
+                sizes, performance = table.series(arch_name, f"{operation}_performance")
+                np.testing.assert_array_equal(sizes, queue_sizes)
+                np.testing.assert_allclose(performance, expected_performance)
+                np.testing.assert_allclose(table.series(arch_name, f"{operation}_efficiency")[1], expected_efficiency)
+
+    def test_dataset_input(self):
+        """Test that a dataset gives the same table as its data dictionaries."""
+        dataset = ResultsDataset.from_results_tree(HWPQ_DIR, devices=["xcau25p"])
+        from_dataset = compute_metrics(dataset)
+        from_dicts = compute_metrics(self.data_dicts)
+
+        self.assertEqual(from_dataset.architectures(), from_dicts.architectures())
+        np.testing.assert_array_equal(from_dataset.queue_sizes, from_dicts.queue_sizes)
+        for metric, values in from_dicts.columns.items():
+            np.testing.assert_allclose(from_dataset[metric], values, err_msg=metric)
+
+        with self.assertRaises(ValueError):
+            compute_metrics(ResultsDataset.from_results_tree(HWPQ_DIR, architectures=["register_tree"]))
+
+    def test_missing_metrics_are_skipped(self):
+        """Test that series leave out queue sizes without the metric."""
+        table = compute_metrics({"hybrid_tree": {4: {"max_achieved_frequency": 100.0}, 2: {"max_achieved_frequency": 50.0, "luts_used": 10}}})
+        sizes, luts = table.series("hybrid_tree", "luts_used")
+        np.testing.assert_array_equal(sizes, [2])
+        np.testing.assert_array_equal(luts, [10])
+        np.testing.assert_array_equal(table.series("hybrid_tree", "max_achieved_frequency")[0], [2, 4])
+
+    def test_energy_metrics(self):
+        """Test nJ/op and MOPS/W from power, including missing power and zero throughput."""
+        data = {
+            "bram_tree": {
+                # 1/8 dequeue per cycle: 50 MOPS at 0.5 W
+                8: {"max_achieved_frequency": 400.0, "power": 0.5},
+                16: {"max_achieved_frequency": 0.0, "power": 0.5},
+                32: {"max_achieved_frequency": 400.0},
+            }
+        }
+        table = compute_metrics(data, operations=("dequeue",))
+        np.testing.assert_allclose(table["dequeue_energy"], [10.0, np.inf, np.nan])
+        np.testing.assert_allclose(table["dequeue_performance_per_watt"], [100.0, 0.0, np.nan])
+
+        ranking = data_processor.rank_energy_efficiency(
+            {**data, "hybrid_tree": {8: {"max_achieved_frequency": 300.0, "power": 1.0}}}, "dequeue"
+        )
+        self.assertEqual(list(ranking), [8])
+        self.assertEqual([entry["arch"] for entry in ranking[8]], ["hybrid_tree", "bram_tree"])
+        self.assertAlmostEqual(ranking[8][0]["energy"], 1000 / 300)
+
+
+class TestMetricsCache(unittest.TestCase):
+    def setUp(self):
+        self.data_dict = {4: {"max_achieved_frequency": 400.0}, 8: {"max_achieved_frequency": 300.0}}
+
+    def test_hits_and_invalidation(self):
+        """Test that a series is computed once until its data is invalidated."""
+        cache = MetricsCache()
+        performance = cache.series(self.data_dict, "register_tree_enq_enabled", "enqueue_performance", "enqueue")
+        np.testing.assert_allclose(performance[1], [200.0, 100.0])
+        cache.series(self.data_dict, "register_tree_enq_enabled", "enqueue_efficiency", "enqueue")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        self.data_dict[8]["max_achieved_frequency"] = 600.0
+        cache.invalidate(self.data_dict)
+        performance = cache.series(self.data_dict, "register_tree_enq_enabled", "enqueue_performance", "enqueue")
+        np.testing.assert_allclose(performance[1], [200.0, 200.0])
+        self.assertEqual(cache.misses, 2)
+
+    def test_datasets_are_versioned(self):
+        """Test that every dataset gets its own entries."""
+        cache = MetricsCache()
+        dataset = ResultsDataset.from_results_tree(HWPQ_DIR, devices=["xcau25p"], architectures=["bram_tree"])
+        cache.series(dataset, "bram_tree", "dequeue_performance", "dequeue")
+        cache.series(ResultsDataset(dataset.rows), "bram_tree", "dequeue_performance", "dequeue")
+        self.assertEqual(cache.misses, 2)
+
+    def test_performance_factor_changes(self):
+        """Test that changing PERFORMANCE_FACTORS is not served from the cache."""
+        cache = MetricsCache()
+        cache.series(self.data_dict, "bram_tree", "dequeue_performance", "dequeue")
+        PERFORMANCE_FACTORS["dequeue"]["bram_tree"], original = 1 / 2, PERFORMANCE_FACTORS["dequeue"]["bram_tree"]
+        try:
+            _, performance = cache.series(self.data_dict, "bram_tree", "dequeue_performance", "dequeue")
+        finally:
+            PERFORMANCE_FACTORS["dequeue"]["bram_tree"] = original
+        np.testing.assert_allclose(performance, [200.0, 150.0])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = MetricsCache(maxsize=2)
+        for operation in ("enqueue", "dequeue", "enqueue", "replace", "dequeue"):
+            cache.series(self.data_dict, "systolic_array", f"{operation}_performance", operation)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
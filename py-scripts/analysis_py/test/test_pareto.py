@@ -0,0 +1,75 @@
+"""
+Unit tests for pareto.py
+"""
+import os
+import unittest
+import numpy as np
+
+from dataset import LazyResults
+from pareto import pareto_frontier, pareto_frontiers, skyline
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+def dominated(costs, i, j):
+    """Whether row j dominates row i"""
+    return np.all(costs[j] <= costs[i]) and np.any(costs[j] < costs[i])
+
+
+class TestSkyline(unittest.TestCase):
+    def test_matches_pairwise_definition(self):
+        """Test frontier and dominance counts against all-pairs comparison on random data, with ties."""
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            costs = rng.integers(0, 4, (rng.integers(1, 20), 3)).astype(float)
+            non_dominated, dominated_by, dominates = skyline(costs, counts=True)
+            indices = range(len(costs))
+            expected_by = [sum(dominated(costs, i, j) for j in indices) for i in indices]
+            expected_dominates = [sum(dominated(costs, j, i) for j in indices) for i in indices]
+
+            np.testing.assert_array_equal(non_dominated, np.array(expected_by) == 0)
+            np.testing.assert_array_equal(dominated_by, expected_by)
+            np.testing.assert_array_equal(dominates, expected_dominates)
+            np.testing.assert_array_equal(skyline(costs)[0], non_dominated)
+
+    def test_infinite_costs(self):
+        """Test that missing objectives, stored as infinity, never dominate."""
+        non_dominated, _, _ = skyline([[1.0, np.inf], [2.0, 5.0], [1.0, 4.0]])
+        np.testing.assert_array_equal(non_dominated, [False, False, True])
+
+
+class TestParetoFrontier(unittest.TestCase):
+    def test_frontier_on_results(self):
+        """Test frontiers per queue size, bucketing 2^k - 1 and 2^k sizes together."""
+        frontiers = pareto_frontiers(LazyResults(HWPQ_DIR, device="xcvu19p"), operations=["enqueue", "dequeue"], counts=True)
+
+        for operation, by_size in frontiers.items():
+            for queue_size, frontier in by_size.items():
+                self.assertGreater(len(frontier["frontier"]), 0)
+                for point in frontier["points"]:
+                    self.assertEqual(2 ** round(np.log2(point["queue_size"])), queue_size)
+                    self.assertEqual(point["pareto"], point["dominated_by"] == 0)
+
+        # Enqueue disabled variants cannot be compared on enqueue
+        archs = {point["arch"] for frontier in frontiers["enqueue"].values() for point in frontier["points"]}
+        self.assertFalse(any("enq_disabled" in arch for arch in archs))
+
+    def test_dominated_architecture(self):
+        """Test that a variant worse on every objective is filtered out."""
+        data = {
+            "register_array_enq_enabled": {8: {"max_achieved_frequency": 300.0, "power": 0.5, "luts_util_percent": 1.0, "registers_util_percent": 1.0, "bram_util_percent": 0.0}},
+            "register_array_pipelined_enq_enabled": {8: {"max_achieved_frequency": 700.0, "power": 0.6, "luts_util_percent": 1.2, "registers_util_percent": 1.5, "bram_util_percent": 0.0}},
+            "systolic_array": {8: {"max_achieved_frequency": 250.0, "power": 0.7, "luts_util_percent": 2.0, "registers_util_percent": 2.0, "bram_util_percent": 0.0}},
+        }
+        frontier = pareto_frontier(data, "enqueue")[8]
+        self.assertEqual(frontier["frontier"], ["register_array_enq_enabled", "register_array_pipelined_enq_enabled"])
+        self.assertNotIn("dominates", frontier["points"][0])
+
+        frontier = pareto_frontier(data, "enqueue", counts=True)[8]
+        dominates = {point["arch"]: point["dominates"] for point in frontier["points"]}
+        self.assertEqual(dominates, {"register_array_enq_enabled": 1, "register_array_pipelined_enq_enabled": 1, "systolic_array": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
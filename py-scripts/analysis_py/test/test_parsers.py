@@ -3,7 +3,18 @@ Unit tests for parsers.py
 """
 import unittest
 import os
-from parsers import parse_achieved_frequencies, parse_metrics, process_directory
+from parsers import (
+    parse_achieved_frequencies,
+    parse_frequency_records,
+    parse_metrics,
+    process_directory,
+    process_directories,
+    FREQUENCY_RECORD_FIELDS,
+    FrequencyRecordBuilder,
+)
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
 
 
 class TestParsers(unittest.TestCase):
@@ -82,5 +93,90 @@ class TestParsers(unittest.TestCase):
             parse_achieved_frequencies("/home/charlielinux/Workspace/hwpq_qw2246/bram_tree/vivado_analysis_results_16bit/vivado_analysis_on_queue_size_65536.txt") # queue size 65536 does not exist
 
 
+class TestFrequencyRecords(unittest.TestCase):
+    def setUp(self):
+        self.log_file = os.path.join(
+            HWPQ_DIR,
+            "register_array/vivado_analysis_results_16bit_xcau25p/enqueue_0/vivado_analysis_on_queue_size_16.txt",
+        )
+        self.assertTrue(os.path.exists(self.log_file), f"Test file {self.log_file} does not exist")
+
+    def test_parse_frequency_records(self):
+        """Test that every frequency block becomes a full record."""
+        records = parse_frequency_records(self.log_file)
+
+        self.assertEqual(len(records), 13)
+        self.assertEqual([r["target_frequency"] for r in records], [100.0 + 50 * i for i in range(13)])
+
+        first = records[0]
+        self.assertEqual(tuple(first.keys()), FREQUENCY_RECORD_FIELDS)
+        self.assertEqual(first["achieved_frequency"], 233.863)
+        self.assertEqual(first["wns"], 5.724)
+        self.assertEqual(first["power"], 0.477)
+        self.assertEqual(first["luts_used"], 580)
+        self.assertEqual(first["luts_util_percent"], 0.41)
+        self.assertEqual(first["registers_used"], 261)
+        self.assertEqual(first["registers_util_percent"], 0.09)
+        self.assertEqual(first["bram_used"], 0.0)
+        self.assertEqual(first["bram_util_percent"], 0.0)
+        self.assertEqual(first["synthesis_seconds"], 12)
+        self.assertEqual(first["implementation_seconds"], 46)
+
+        # "1m 4s -> 64s" is reported in total seconds
+        self.assertEqual(records[1]["implementation_seconds"], 64)
+
+    def test_parse_metrics_selects_max_record(self):
+        """Test that parse_metrics picks the record with the maximum achieved frequency."""
+        metrics = parse_metrics(self.log_file)
+
+        self.assertEqual(metrics["queue_size"], 16)
+        self.assertEqual(metrics["max_achieved_frequency"], 419.776)
+        self.assertEqual(metrics["power"], 0.570)
+        self.assertEqual(metrics["luts_used"], 764)
+        self.assertEqual(metrics["luts_util_percent"], 0.54)
+
+        frequencies, achieved_frequencies = parse_achieved_frequencies(self.log_file)
+        self.assertEqual(len(frequencies), len(achieved_frequencies))
+        self.assertEqual(max(achieved_frequencies), metrics["max_achieved_frequency"])
+
+    def test_builder_handles_missing_power_and_tiny_utilization(self):
+        """Test unreported power and "<0.01" utilization values."""
+        builder = FrequencyRecordBuilder()
+        lines = [
+            "Frequency: 100 MHz -> Power: No power report",
+            "Frequency: 100 MHz -> CLB LUTs Util%: <0.01 %",
+            "Frequency: 100 MHz -> Achieved Frequency: 250.000 MHz",
+        ]
+        records = [r for r in map(builder.feed, lines) if r is not None]
+
+        self.assertEqual(len(records), 1)
+        self.assertIsNone(records[0]["power"])
+        self.assertEqual(records[0]["luts_util_percent"], 0.01)
+        self.assertEqual(records[0]["achieved_frequency"], 250.0)
+
+
+class TestParallelIngest(unittest.TestCase):
+    def setUp(self):
+        self.enqueue_dir = os.path.join(HWPQ_DIR, "register_tree/vivado_analysis_results_16bit_xcau25p")
+        self.flat_dir = os.path.join(HWPQ_DIR, "bram_tree/vivado_analysis_results_16bit_xcau25p")
+
+    def test_parallel_matches_serial(self):
+        """Test that pooled parsing returns the same data as serial parsing."""
+        serial = process_directories([self.enqueue_dir, self.flat_dir])
+        parallel = process_directories([self.enqueue_dir, self.flat_dir], workers=2, chunksize=3)
+
+        self.assertEqual(serial, parallel)
+
+    def test_return_shapes(self):
+        """Test that enqueue_0/enqueue_1 layouts return a tuple and flat layouts a dict."""
+        enqueue_disabled_data, enqueue_enabled_data = process_directory(self.enqueue_dir, workers=2)
+        self.assertIn(1023, enqueue_disabled_data)
+        self.assertIn(1023, enqueue_enabled_data)
+
+        data_dict = process_directory(self.flat_dir, workers=2)
+        self.assertIsInstance(data_dict, dict)
+        self.assertEqual(data_dict[1023]["queue_size"], 1023)
+
+
 if __name__ == "__main__":
     unittest.main()
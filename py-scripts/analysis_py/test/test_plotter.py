@@ -0,0 +1,187 @@
+"""
+Unit tests for plotter.py
+"""
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from concurrent.futures import wait
+from matplotlib.image import imread
+import metrics_engine
+import plotter
+from dataset import LazyResults
+from plotter import FigureTemplate, defer_render, draw_panels, figure_jobs, preview_jobs, render_figures
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+class TestFigureJobs(unittest.TestCase):
+    def test_jobs_carry_only_their_slices(self):
+        """Test that jobs are picklable and hold only the architectures their figure draws."""
+        results = LazyResults(HWPQ_DIR)
+        figures = ["bram_utilization_comparison", "enqueue_performance_comparison", "dequeue_energy_comparison"]
+        jobs = figure_jobs(results, figures, "plots")
+
+        self.assertEqual([job["figure"] for job in jobs], figures)
+        self.assertEqual(sorted(jobs[0]["data"]), ["bram_tree", "bram_tree_pipelined", "hybrid_tree"])
+        self.assertNotIn("hybrid_tree", jobs[1]["data"])
+        self.assertEqual(set(jobs[1]["samples"]["arch_key"].tolist()), set(jobs[1]["data"]))
+        self.assertIsNone(jobs[2]["samples"])
+        self.assertEqual(jobs[2]["path"], os.path.join("plots", "dequeue_energy_comparison.png"))
+
+        restored = pickle.loads(pickle.dumps(jobs))
+        self.assertEqual(restored[0]["data"], jobs[0]["data"])
+        self.assertEqual(len(restored[1]["samples"]), len(jobs[1]["samples"]))
+
+
+class TestFigureTemplate(unittest.TestCase):
+    def test_outputs_only_keep_their_own_data(self):
+        """Test that the canvas is reused while lines, bands, labels, scales and limits are swapped."""
+        template = FigureTemplate(figsize=(4, 3))
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                ax = template.axes()
+                ax.plot([2, 1024], [1, 1000], label="first")
+                ax.fill_between([2, 1024], [1, 10], [2, 20])
+                ax.set_yscale("log")
+                ax.set_title("First")
+                template.save(os.path.join(temp_dir, "first.png"))
+
+                ax = template.axes()
+                self.assertIs(ax, template.ax)
+                self.assertEqual((len(ax.lines), len(ax.collections), ax.get_title()), (0, 0, ""))
+                self.assertEqual((ax.get_xscale(), ax.get_yscale()), ("log", "linear"))
+
+                ax.plot([4, 8], [5, 6], label="second")
+                template.save(os.path.join(temp_dir, "second.png"))
+                low, high = ax.get_xlim()
+                self.assertTrue(3 < low and high < 9)
+                self.assertEqual([text.get_text() for text in ax.get_legend().get_texts()], ["second"])
+                self.assertEqual(template.outputs, 2)
+                self.assertTrue(os.path.exists(os.path.join(temp_dir, "second.png")))
+        finally:
+            template.close()
+
+    def test_output_does_not_depend_on_earlier_outputs(self):
+        """Test that an image is the same whether or not the template saved another one first."""
+
+        def draw(template, label, ylabel):
+            ax = template.axes()
+            ax.plot([2, 1024], [1, 1000], label=label)
+            ax.set_ylabel(ylabel)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, name) for name in ("wide.png", "after.png", "alone.png")]
+            shared, fresh = FigureTemplate(figsize=(8, 4)), FigureTemplate(figsize=(8, 4))
+            try:
+                draw(shared, "a longer entry", "Label\nover two lines")
+                shared.save(paths[0], dpi=50)
+                draw(shared, "b", "y")
+                shared.save(paths[1], dpi=50)
+                draw(fresh, "b", "y")
+                fresh.save(paths[2], dpi=50)
+            finally:
+                shared.close()
+                fresh.close()
+
+            with open(paths[1], "rb") as after, open(paths[2], "rb") as alone:
+                self.assertEqual(after.read(), alone.read())
+
+
+def metrics(queue_size, frequency, luts):
+    return {
+        "queue_size": queue_size,
+        "max_achieved_frequency": frequency,
+        "luts_used": luts,
+        "luts_util_percent": luts / 1000,
+        "registers_util_percent": 0.1,
+        "bram_util_percent": 0.5,
+    }
+
+
+DATA = {
+    "systolic_array": {q: metrics(q, 500.0 - q, 40 * q) for q in (4, 8, 16)},
+    "hybrid_tree": {q: metrics(q, 450.0, 10 * q) for q in (3, 7, 15)},
+}
+
+
+class TestPanels(unittest.TestCase):
+    def test_grids_use_one_data_pass(self):
+        """Test that summary and comparison grids compute their metrics once, hiding empty panels."""
+        plotter.METRICS_CACHE.invalidate()
+        with mock.patch.object(metrics_engine, "compute_metrics", wraps=metrics_engine.compute_metrics) as compute:
+            fig = plotter.create_comparison_plots(DATA)
+            self.assertEqual(compute.call_count, 1)
+            self.assertEqual(sum(ax.get_visible() for ax in fig.axes), 9)
+            plt.close(fig)
+
+            fig = plotter.create_summary_plots(DATA["hybrid_tree"], "Hybrid Tree", enqueue_option="disabled")
+            self.assertEqual(compute.call_count, 2)
+            self.assertEqual(sum(ax.get_visible() for ax in fig.axes), 8)
+            plt.close(fig)
+
+            # Drawing the same architectures and operations again reuses the cached table
+            plt.close(plotter.create_comparison_plots(DATA))
+            self.assertEqual(compute.call_count, 2)
+
+    def test_panel_specs(self):
+        """Test series, titles, scales and architecture selection drawn from panel specs."""
+        fig, axs = plt.subplots(1, 2)
+        panels = [
+            {"spec": "lut_usage"},
+            {"spec": "performance", "operation": "enqueue", "archs": ["systolic_array", "register_tree"], "title": "Mine"},
+        ]
+        draw_panels(axs, DATA, panels)
+
+        self.assertEqual([line.get_label() for line in axs[0].lines], ["Systolic Array", "Hybrid Tree"])
+        self.assertEqual(axs[0].lines[1].get_ydata().tolist(), [30, 70, 150])
+        self.assertEqual((axs[0].get_xscale(), axs[0].get_yscale()), ("log", "linear"))
+        self.assertEqual(axs[1].get_title(), "Mine")
+        self.assertEqual(len(axs[1].lines), 1)
+        self.assertEqual(axs[1].lines[0].get_ydata().tolist(), [496.0, 492.0, 484.0])
+        plt.close(fig)
+
+    def test_performance_without_legend(self):
+        """Test that the presentation performance panel draws the spec's series without a legend."""
+        fig, ax = plt.subplots()
+        plotter.plot_performance_comparison_nolegend(ax, DATA, ["systolic_array"], "enqueue")
+        self.assertEqual(ax.lines[0].get_ydata().tolist(), [496.0, 492.0, 484.0])
+        self.assertIsNone(ax.get_legend())
+        self.assertEqual((ax.get_title(), ax.title.get_fontsize()), ("Enqueue Performance", 32))
+        plt.close(fig)
+
+
+class TestPreview(unittest.TestCase):
+    def test_final_figure_replaces_preview(self):
+        """Test that a draft preview is saved first and replaced by the deferred final figure."""
+        data = {"systolic_array": {q: {"queue_size": q, "max_achieved_frequency": 400.0 - q} for q in (4, 8, 16)}}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jobs = figure_jobs(data, ["frequency_comparison"], temp_dir)
+            path = jobs[0]["path"]
+
+            render_figures(preview_jobs(jobs))
+            preview_height = imread(path).shape[0]
+            wait(defer_render(jobs))
+            self.assertEqual(os.listdir(temp_dir), ["frequency_comparison.png"])
+            self.assertGreater(imread(path).shape[0], 3 * preview_height)
+
+    def test_screen_figures_use_low_resolution(self):
+        """Test that interactive figures default to the preview resolution, saved ones to the final one."""
+        with mock.patch.dict(plt.rcParams):
+            plotter.setup_plot_style()
+            self.assertEqual(plt.figure().dpi, plotter.PREVIEW_DPI)
+            plt.close("all")
+            plotter.setup_plot_style(dpi=plotter.FINAL_DPI)
+            self.assertEqual(plotter.render_style()["rc"]["figure.dpi"], plotter.FINAL_DPI)
+
+
+if __name__ == "__main__":
+    unittest.main()
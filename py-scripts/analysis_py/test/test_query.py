@@ -0,0 +1,116 @@
+"""
+Unit tests for query.py
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from query import DesignSpaceIndex, load_index, parse_mix
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+def metrics(queue_size, frequency, luts_percent, power=1.0):
+    return {
+        "queue_size": queue_size,
+        "max_achieved_frequency": frequency,
+        "power": power,
+        "luts_util_percent": luts_percent,
+        "registers_util_percent": 1.0,
+        "bram_util_percent": 0.0,
+    }
+
+
+def build_index():
+    data = {
+        "xcau25p": {
+            # 1 enqueue and dequeue per cycle
+            "systolic_array": {8: metrics(8, 400, 2), 16: metrics(16, 300, 4), 32: metrics(32, 200, 8)},
+            # 1/2 dequeue per cycle, no enqueue throughput
+            "register_tree_pipelined_enq_disabled": {8: metrics(8, 600, 1), 16: metrics(16, 500, 2)},
+        },
+        "xcvu19p": {"systolic_array": {15: metrics(15, 350, 0.5, power=5.0)}},
+    }
+    return DesignSpaceIndex.from_data(data)
+
+
+class TestDesignSpaceIndex(unittest.TestCase):
+    def test_smallest_fitting_queue_size(self):
+        """Test that each architecture is represented by its smallest queue size holding N entries."""
+        results = build_index().query(queue_size=10, devices=["xcau25p"])
+        self.assertEqual(
+            [(r["arch"], r["queue_size"]) for r in results],
+            [("systolic_array", 16), ("register_tree_pipelined_enq_disabled", 16)],
+        )
+        self.assertAlmostEqual(results[0]["throughput"], 300)
+        self.assertAlmostEqual(results[1]["throughput"], 250)
+
+    def test_constraints(self):
+        """Test LUT, power and throughput limits, which may push to a larger or exclude a variant."""
+        index = build_index()
+        results = index.query(queue_size=10, max_luts_percent=3)
+        self.assertEqual(
+            [(r["device"], r["arch"]) for r in results],
+            [("xcvu19p", "systolic_array"), ("xcau25p", "register_tree_pipelined_enq_disabled")],
+        )
+        results = index.query(queue_size=10, max_power=2, min_throughput=260)
+        self.assertEqual([r["arch"] for r in results], ["systolic_array"])
+        self.assertEqual(index.query(queue_size=64), [])
+
+    def test_operation_mix(self):
+        """Test the harmonic mix throughput and that unsupported operations exclude a variant."""
+        index = build_index()
+        results = index.query(queue_size=8, mix={"enqueue": 1, "dequeue": 1}, devices=["xcau25p"])
+        self.assertEqual([r["arch"] for r in results], ["systolic_array"])
+        self.assertAlmostEqual(results[0]["throughput"], 400)
+
+        results = index.query(queue_size=8, mix=parse_mix("dequeue"), devices=["xcau25p"], rank_by="luts")
+        self.assertEqual([r["arch"] for r in results], ["register_tree_pipelined_enq_disabled", "systolic_array"])
+        with self.assertRaises(ValueError):
+            parse_mix("peek=1")
+
+    def test_save_load(self):
+        """Test that a saved index answers queries the same way."""
+        index = build_index()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "index.npz")
+            index.save(path)
+            loaded = DesignSpaceIndex.load(path)
+        self.assertEqual(loaded.query(queue_size=4), index.query(queue_size=4))
+
+
+class TestIndexStaleness(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = os.path.join(self.temp_dir.name, "hwpq")
+        shutil.copytree(os.path.join(HWPQ_DIR, "register_array"), os.path.join(self.base_dir, "register_array"))
+        self.path = os.path.join(self.temp_dir.name, "index.npz")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_changed_log_makes_index_stale(self):
+        """Test that a saved index is reused until a log is rewritten or added."""
+        self.assertIsNone(load_index(self.path, self.base_dir))
+        DesignSpaceIndex.from_results_tree(self.base_dir, workers=1).save(self.path)
+        index = load_index(self.path, self.base_dir)
+        self.assertEqual(set(index.devices.tolist()), {"xcau25p", "xcvu19p"})
+        self.assertFalse(index.is_stale(self.base_dir))
+
+        log_dir = os.path.join(self.base_dir, "register_array", "vivado_analysis_results_16bit_xcvu19p", "enqueue_0")
+        source = os.path.join(log_dir, "vivado_analysis_on_queue_size_15.txt")
+        shutil.copy(source, source.replace("_15.txt", "_14.txt"))
+        self.assertTrue(index.is_stale(self.base_dir))
+        self.assertIsNone(load_index(self.path, self.base_dir))
+
+    def test_partial_index_is_stale(self):
+        """Test that an index of some devices only, or of in-memory results, is never taken for the tree."""
+        DesignSpaceIndex.from_results_tree(self.base_dir, devices=["xcau25p"], workers=1).save(self.path)
+        self.assertTrue(DesignSpaceIndex.load(self.path).is_stale(self.base_dir))
+        self.assertTrue(build_index().is_stale(self.base_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
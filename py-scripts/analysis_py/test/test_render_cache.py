@@ -0,0 +1,88 @@
+"""
+Unit tests for render_cache.py
+"""
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from render_cache import MANIFEST_FILE, RenderStore, job_digest, render_modules
+
+
+def job(figure, frequency, path):
+    return {"figure": figure, "data": {"bram_tree": {8: {"max_achieved_frequency": frequency}}}, "samples": None, "path": path}
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.rendered = []
+
+    def __call__(self, jobs):
+        for job in jobs:
+            with open(job["path"], "w") as f:
+                f.write(f"{job['figure']} {job['data']}")
+            self.rendered.append(job["figure"])
+
+
+class TestRenderStore(unittest.TestCase):
+    def test_digest(self):
+        """Test that digests ignore the output path but follow data, samples, style and code version."""
+        base = job("frequency_comparison", 500.0, "a/frequency_comparison.png")
+        digest = job_digest(base, {"font.size": 16}, "v1")
+        self.assertEqual(digest, job_digest(dict(base, path="b/frequency_comparison.png"), {"font.size": 16}, "v1"))
+        changed = [
+            job_digest(job("frequency_comparison", 501.0, base["path"]), {"font.size": 16}, "v1"),
+            job_digest(dict(base, samples=np.arange(3)), {"font.size": 16}, "v1"),
+            job_digest(base, {"font.size": 18}, "v1"),
+            job_digest(base, {"font.size": 16}, "v2"),
+        ]
+        self.assertNotIn(digest, changed)
+
+    def test_render_modules_follow_imports(self):
+        """Test that the code version covers modules plotter only reaches through other modules."""
+        modules = render_modules()
+        for name in ("plotter", "fmax_stats", "dataset", "parsers", "config"):
+            self.assertIn(name, modules)
+        self.assertNotIn("numpy", modules)
+        self.assertNotIn("cli", modules)
+
+    def test_only_changed_figures_are_rendered(self):
+        """Test that a second run renders only the changed figure and links the others."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = RenderStore(os.path.join(temp_dir, "store"), version="v1")
+            render = FakeRenderer()
+
+            first_dir = os.path.join(temp_dir, "run1")
+            jobs = [job(name, 500.0, os.path.join(first_dir, "xcau25p", f"{name}.png")) for name in ("a", "b")]
+            store.build(jobs, {}, render)
+
+            second_dir = os.path.join(temp_dir, "run2")
+            jobs = [job("a", 500.0, os.path.join(second_dir, "xcau25p", "a.png")), job("b", 450.0, os.path.join(second_dir, "xcau25p", "b.png"))]
+            outputs = store.build(jobs, {}, render)
+            store.write_manifest(second_dir, outputs)
+
+            self.assertEqual(render.rendered, ["a", "b", "b"])
+            self.assertEqual((store.rendered, store.reused), (3, 1))
+            with open(os.path.join(second_dir, "xcau25p", "b.png")) as f:
+                self.assertIn("450.0", f.read())
+            self.assertTrue(os.path.samefile(os.path.join(first_dir, "xcau25p", "a.png"), os.path.join(second_dir, "xcau25p", "a.png")))
+            with open(os.path.join(second_dir, MANIFEST_FILE)) as f:
+                self.assertEqual(sorted(json.load(f)["figures"]), [os.path.join("xcau25p", "a.png"), os.path.join("xcau25p", "b.png")])
+
+    def test_failed_render_leaves_no_entry(self):
+        """Test that a render error leaves no partial store entry behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = RenderStore(os.path.join(temp_dir, "store"), version="v1")
+
+            def fail(jobs):
+                FakeRenderer()(jobs)
+                raise RuntimeError("render failed")
+
+            with self.assertRaises(RuntimeError):
+                store.build([job("a", 500.0, os.path.join(temp_dir, "run", "a.png"))], {}, fail)
+            self.assertEqual(os.listdir(store.store_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Unit tests for scaling_model.py
+"""
+import unittest
+import numpy as np
+
+import data_processor
+from scaling_model import fit_architecture, fit_metric, predict_points
+
+
+def synthetic_data():
+    # Exact laws: Fmax = 700 - 40 log2(N), LUTs = 3 N^1.5, registers = 20 N, no BRAM
+    data = {}
+    for queue_size in [4, 8, 16, 32, 64, 128]:
+        data[queue_size] = {
+            "max_achieved_frequency": 700 - 40 * np.log2(queue_size),
+            "luts_used": 3 * queue_size**1.5,
+            "registers_used": 20 * queue_size,
+            "bram_used": 0,
+        }
+    return data
+
+
+class TestScalingModel(unittest.TestCase):
+    def test_recovers_exact_laws(self):
+        """Test that exact scaling laws are recovered, with tight intervals and R^2 of 1."""
+        fits = fit_architecture(synthetic_data())
+        self.assertEqual(fits["max_achieved_frequency"].kind, "log_linear")
+        self.assertEqual(fits["luts_used"].kind, "power_law")
+        self.assertEqual(fits["bram_used"].kind, "constant")
+        for fit in fits.values():
+            self.assertAlmostEqual(fit.r_squared, 1.0)
+
+        estimate, lower, upper = fits["max_achieved_frequency"].predict([1024])
+        np.testing.assert_allclose(estimate, [300])
+        np.testing.assert_allclose(lower, [300], atol=1e-6)
+        np.testing.assert_allclose(upper, [300], atol=1e-6)
+        np.testing.assert_allclose(fits["luts_used"].predict([256])[0], [3 * 256**1.5])
+        np.testing.assert_allclose(fits["bram_used"].predict([256])[0], [0])
+
+    def test_interval_widens_when_extrapolating(self):
+        """Test that noisy fits give intervals that contain the estimate and widen far from the data."""
+        data = synthetic_data()
+        for offset, queue_size in zip([5, -7, 3, -2, 6, -4], sorted(data)):
+            data[queue_size]["max_achieved_frequency"] += offset
+        fit = fit_metric(data, "max_achieved_frequency")
+        self.assertLess(fit.r_squared, 1.0)
+
+        estimate, lower, upper = fit.predict([16, 4096])
+        self.assertTrue(np.all(lower < estimate) and np.all(estimate < upper))
+        self.assertGreater(upper[1] - lower[1], upper[0] - lower[0])
+        np.testing.assert_array_equal(fit.extrapolates([16, 4096]), [False, True])
+
+    def test_non_positive_frequency_has_no_estimate(self):
+        """Test that a log-linear law falling to zero gives NaN instead of a clamped 0 MHz."""
+        fit = fit_metric(synthetic_data(), "max_achieved_frequency")
+        estimate, lower, upper = fit.predict([2**16, 2**20])
+        np.testing.assert_allclose(estimate[0], 60)
+        self.assertTrue(np.isnan(estimate[1]) and np.isnan(lower[1]) and np.isnan(upper[1]))
+
+    def test_fit_needs_two_points(self):
+        """Test that a fit on a single queue size is rejected."""
+        with self.assertRaises(ValueError):
+            fit_metric({4: {"luts_used": 10}}, "luts_used")
+
+    def test_predicted_points_are_flagged(self):
+        """Test predicted data dictionary entries and measured/predicted series."""
+        data = synthetic_data()
+        points = predict_points(data, [256])
+        self.assertTrue(points[256]["predicted"])
+        self.assertTrue(points[256]["extrapolated"])
+        self.assertAlmostEqual(points[256]["registers_used"], 20 * 256)
+        self.assertIn("luts_used_lower", points[256])
+
+        queue_sizes, values, lower, upper, states = data_processor.get_with_predictions(
+            data, "registers_used", [8, 12, 256]
+        )
+        np.testing.assert_array_equal(queue_sizes, [8, 12, 256])
+        self.assertEqual(states.tolist(), ["measured", "interpolated", "extrapolated"])
+        np.testing.assert_allclose(values, [160, 240, 20 * 256])
+        self.assertEqual(lower[0], upper[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for scanner.py
+"""
+import glob
+import os
+import tempfile
+import unittest
+
+from parsers import parse_frequency_records, process_directory
+from scanner import benchmark, pack_logs, scan_file, scan_packed
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.log_files = sorted(
+            glob.glob(os.path.join(HWPQ_DIR, "*", "vivado_analysis_results_*", "**", "*.txt"), recursive=True)
+        )
+        self.assertGreater(len(self.log_files), 0)
+
+    def test_scan_file_matches_parser(self):
+        """Test that the scanner returns the same records as the line-based parser for every log."""
+        for log_file in self.log_files:
+            self.assertEqual(scan_file(log_file), parse_frequency_records(log_file), log_file)
+
+    def test_packed_logs(self):
+        """Test scanning a packed concatenation of logs."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            packed_path = os.path.join(tmp_dir, "logs.packed")
+            pack_logs(self.log_files[:20], packed_path)
+            packed = scan_packed(packed_path)
+
+        self.assertEqual(list(packed), self.log_files[:20])
+        for log_file, records in packed.items():
+            self.assertEqual(records, parse_frequency_records(log_file))
+
+    def test_unreported_power_and_empty_file(self):
+        """Test blocks without a power report and empty logs."""
+        with open(self.log_files[0]) as f:
+            content = f.read().replace("Power: 0.", "Power: No power report 0.", 1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_file = os.path.join(tmp_dir, "vivado_analysis_on_queue_size_8.txt")
+            with open(log_file, "w") as f:
+                f.write(content)
+            self.assertEqual(scan_file(log_file), parse_frequency_records(log_file))
+            self.assertIsNone(scan_file(log_file)[0]["power"])
+
+            open(log_file, "w").close()
+            self.assertEqual(scan_file(log_file), [])
+
+    def test_process_directory_backend(self):
+        """Test selecting the scanner from process_directory."""
+        log_dir = os.path.join(HWPQ_DIR, "register_tree/vivado_analysis_results_16bit_xcau25p")
+        self.assertEqual(process_directory(log_dir, backend="mmap"), process_directory(log_dir))
+
+        with self.assertRaises(ValueError):
+            process_directory(log_dir, backend="unknown")
+
+    def test_benchmark(self):
+        """Test that the benchmark times every backend."""
+        timings = benchmark(self.log_files[:10], repeat=1)
+        self.assertEqual(set(timings), {"python", "mmap", "mmap_packed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Unit tests for sweep.py
+"""
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from parsers import parse_frequency_records
+from sweep import COMPLETION_MARKER, SweepRunner, default_parallel_jobs, sweep_jobs, sweep_queue_sizes
+
+# Stand-in for Vivado, mirroring synth_design_param_sweep_parallel.tcl: writes the result
+# file under vivado_analysis_results_<width>bit_<device>, then the completion line
+FAKE_VIVADO = f"""#!{sys.executable}
+import os, subprocess, sys, time
+args = sys.argv[1:]
+script = args[args.index("-source") + 1]
+tclargs = args[args.index("-tclargs") + 1:]
+arch, enq_ena, data_width, queue_size = tclargs[:4]
+device = (tclargs[4] if len(tclargs) > 4 else "xcau25p-ffvb676-1-e").split("-")[0]
+if queue_size == os.environ.get("FAKE_VIVADO_FAIL"):
+    print("ERROR: [Synth 8-439] module not found")
+    sys.exit(1)
+if os.environ.get("FAKE_VIVADO_HANG"):
+    # Like the vivado launcher script, leave the work to a child process
+    child = subprocess.Popen(["sleep", "60"])
+    with open(os.environ["FAKE_VIVADO_HANG"], "w") as f:
+        f.write(str(child.pid))
+    sys.exit(child.wait())
+time.sleep(0.3)
+root = os.path.dirname(os.path.dirname(script))
+log_dir = os.path.join(root, "hwpq", arch, "vivado_analysis_results_" + data_width + "bit_" + device, "enqueue_" + enq_ena)
+os.makedirs(log_dir, exist_ok=True)
+with open(os.path.join(log_dir, "vivado_analysis_on_queue_size_" + queue_size + ".txt"), "w") as f:
+    f.write("Analysis for QUEUE_SIZE = " + queue_size + ", ENQ_ENA = " + enq_ena + "\\n\\n")
+    for frequency in (100, 150):
+        for line in ("Synthesis: 1m 21s -> 81s", "Implementation: 4m 14s -> 254s", "Power: 1.116 W",
+                     "CLB LUTs Used: " + queue_size, "CLB LUTs Util%: 0.01 %", "CLB Registers Used: 16",
+                     "CLB Registers Util%: 0.01 %", "BRAM Util: 0", "BRAM Util%: 0.00 %", "WNS: 0.5 ns",
+                     "Achieved Frequency: " + str(frequency + 10) + " MHz"):
+            f.write("Frequency: " + str(frequency) + " MHz -> " + line + "\\n")
+        f.write("\\n")
+print("\\n{COMPLETION_MARKER}_ENA=" + enq_ena + ", QUEUE_SIZE=" + queue_size)
+"""
+
+
+def process_alive(pid):
+    # Killed processes whose parent is gone may stay zombies when nothing reaps them
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            return "\tZ" not in next(line for line in f if line.startswith("State:"))
+    except FileNotFoundError:
+        return False
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        os.makedirs(os.path.join(self.root, "vivado-synthesis_tcl"))
+        self.vivado = os.path.join(self.root, "vivado")
+        with open(self.vivado, "w") as f:
+            f.write(FAKE_VIVADO)
+        os.chmod(self.vivado, os.stat(self.vivado).st_mode | stat.S_IEXEC)
+        self.lines = []
+
+    def tearDown(self):
+        os.environ.pop("FAKE_VIVADO_FAIL", None)
+        os.environ.pop("FAKE_VIVADO_HANG", None)
+        self.temp_dir.cleanup()
+
+    def jobs(self, queue_sizes=(3, 7), **options):
+        return sweep_jobs(
+            "register_tree", project_root=self.root, vivado=self.vivado,
+            queue_sizes=queue_sizes, log_dir=os.path.join(self.root, "parallel_logs"), **options,
+        )
+
+    def test_sweep_grid(self):
+        """Test the queue sizes and job names of tree and array sweeps."""
+        self.assertEqual(sweep_queue_sizes("bram_tree_pipelined")[0], 3)
+        self.assertEqual(sweep_queue_sizes("systolic_array")[-1], 2048)
+        with self.assertRaises(ValueError):
+            sweep_queue_sizes("heap")
+        self.assertEqual([job["name"] for job in self.jobs()], ["ENQ0_QS3", "ENQ0_QS7", "ENQ1_QS3", "ENQ1_QS7"])
+        self.assertGreaterEqual(default_parallel_jobs(), 1)
+
+    def test_run_in_parallel_and_skip_completed(self):
+        """Test that jobs share the slots, write parseable results and are skipped once completed."""
+        jobs = self.jobs()
+        start = time.perf_counter()
+        outcomes = SweepRunner(parallel=4, report=self.lines.append).run(jobs)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(sorted(outcome["name"] for outcome in outcomes), sorted(job["name"] for job in jobs))
+        self.assertTrue(all(outcome["ok"] for outcome in outcomes))
+        self.assertLess(elapsed, 4 * 0.3)
+        self.assertTrue(any(line.startswith("[1/4]") and "ETA" in line for line in self.lines))
+        records = parse_frequency_records(jobs[1]["result"])
+        self.assertEqual([record["achieved_frequency"] for record in records], [110.0, 160.0])
+        self.assertEqual(records[0]["luts_used"], 7)
+
+        self.lines.clear()
+        self.assertEqual(SweepRunner(parallel=4, report=self.lines.append).run(jobs), [])
+        self.assertEqual(sum(line.startswith("Skipping") for line in self.lines), 4)
+
+    def test_failed_job_is_reported_and_rerun(self):
+        """Test that a failing job is reported and runs again on the next sweep."""
+        os.environ["FAKE_VIVADO_FAIL"] = "7"
+        jobs = self.jobs()
+        outcomes = {outcome["name"]: outcome for outcome in SweepRunner(parallel=2, report=self.lines.append).run(jobs)}
+        self.assertFalse(outcomes["ENQ0_QS7"]["ok"])
+        self.assertEqual(outcomes["ENQ0_QS7"]["returncode"], 1)
+        self.assertTrue(outcomes["ENQ0_QS3"]["ok"])
+        self.assertIn("2 completed, 2 failed (", self.lines[-1])
+
+        del os.environ["FAKE_VIVADO_FAIL"]
+        outcomes = SweepRunner(parallel=2, report=self.lines.append).run(jobs)
+        self.assertEqual(sorted(outcome["name"] for outcome in outcomes), ["ENQ0_QS7", "ENQ1_QS7"])
+
+    def test_data_width_and_device_reach_vivado(self):
+        """Test that a non-default width and device are passed on and their results found."""
+        jobs = self.jobs(queue_sizes=(3,), data_width=32, device="xcvu19p")
+        self.assertEqual(jobs[0]["command"][-3:], ["32", "3", "xcvu19p-fsva3824-1-e"])
+        self.assertIn(os.path.join("vivado_analysis_results_32bit_xcvu19p", "enqueue_0"), jobs[0]["result"])
+        outcomes = SweepRunner(parallel=2, report=self.lines.append).run(jobs)
+        self.assertTrue(all(outcome["ok"] for outcome in outcomes))
+        with self.assertRaises(ValueError):
+            self.jobs(device="xc7a35t")
+
+    def test_stop_kills_the_process_group(self):
+        """Test that stopping terminates the processes Vivado's launcher started, not only the launcher."""
+        pid_file = os.path.join(self.root, "child.pid")
+        os.environ["FAKE_VIVADO_HANG"] = pid_file
+        runner = SweepRunner(parallel=1, report=self.lines.append)
+        outcomes = []
+        thread = threading.Thread(target=lambda: outcomes.extend(runner.run(self.jobs(queue_sizes=(3,)))))
+        thread.start()
+        deadline = time.monotonic() + 10
+        while not os.path.exists(pid_file) or not os.path.getsize(pid_file):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.05)
+        with open(pid_file) as f:
+            child = int(f.read())
+
+        runner.stop()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(any(outcome["ok"] for outcome in outcomes))
+        deadline = time.monotonic() + 5
+        while process_alive(child) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(process_alive(child))
+
+    def test_stopped_runner_keeps_previous_logs(self):
+        """Test that jobs left unstarted by a stop do not truncate the logs of their previous run."""
+        job = self.jobs(queue_sizes=(3,))[0]
+        os.makedirs(os.path.dirname(job["log"]))
+        with open(job["log"], "w") as f:
+            f.write("previous run\n")
+        runner = SweepRunner(parallel=1, report=self.lines.append)
+        runner.stop()
+        self.assertFalse(runner.run_job(job)["ok"])
+        with open(job["log"]) as f:
+            self.assertEqual(f.read(), "previous run\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for sweep_cost.py
+"""
+import os
+import unittest
+import numpy as np
+
+from dataset import ResultsDataset
+from parsers import FREQUENCY_RECORD_FIELDS
+from sweep_cost import costly_points, fit_cost_scaling, point_costs, sweep_costs
+
+# Logs shipped with the repository
+HWPQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "hwpq")
+
+
+def make_record(target, achieved, synthesis, implementation):
+    record = dict.fromkeys(FREQUENCY_RECORD_FIELDS)
+    record.update(
+        target_frequency=target,
+        achieved_frequency=achieved,
+        synthesis_seconds=synthesis,
+        implementation_seconds=implementation,
+    )
+    return record
+
+
+class TestSweepCost(unittest.TestCase):
+    def setUp(self):
+        sweep = ("register_tree", "enq_enabled", "xcau25p", 16)
+        # Cost grows as 10 * N^1.5 over three queue sizes
+        self.dataset = ResultsDataset.from_records(
+            (
+                sweep + (queue_size,),
+                [
+                    make_record(100.0, 100.0, 1, 10 * queue_size**1.5 / 2 - 1),
+                    make_record(200.0, 150.0, None, None),
+                    make_record(300.0, 140.0, 0, 10 * queue_size**1.5 / 2),
+                ],
+            )
+            for queue_size in (4, 16, 64)
+        )
+
+    def test_point_costs(self):
+        """Test cost per point and flagging of points that do not raise Fmax."""
+        costs = point_costs(self.dataset)
+        self.assertEqual(costs["raises_fmax"].tolist(), [True, True, False] * 3)
+        self.assertEqual(costs["cost_seconds"][0], 40.0)
+        self.assertTrue(np.isnan(costs["cost_seconds"][1]))
+
+        wasted = costly_points(self.dataset, top=2)
+        self.assertEqual(wasted["queue_size"].tolist(), [64, 16])
+        self.assertEqual(wasted["target_frequency"].tolist(), [300.0, 300.0])
+
+    def test_fit_cost_scaling(self):
+        """Test that a power law is recovered exactly."""
+        fit = fit_cost_scaling(self.dataset)[("register_tree", "enq_enabled", "xcau25p", 16)]
+        self.assertAlmostEqual(fit["exponent"], 1.5)
+        self.assertAlmostEqual(fit["coefficient"], 10.0)
+        self.assertAlmostEqual(fit["r_squared"], 1.0)
+        self.assertEqual(fit["queue_sizes"], [4, 16, 64])
+
+    def test_sweep_costs_cover_logs(self):
+        """Test that sweep totals add up to the timings in the logs."""
+        dataset = ResultsDataset.from_results_tree(HWPQ_DIR, architectures=["bram_tree"])
+        summary = sweep_costs(dataset)
+        total = dataset["synthesis_seconds"].sum() + dataset["implementation_seconds"].sum()
+
+        self.assertEqual(sum(entry["points"] for entry in summary), len(dataset))
+        self.assertAlmostEqual(sum(entry["cost_seconds"] for entry in summary), total)
+        for entry in summary:
+            self.assertLessEqual(entry["wasted_seconds"], entry["cost_seconds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit tests for throughput.py
+"""
+import unittest
+import numpy as np
+
+import data_processor
+from throughput import (
+    models_version,
+    ops_per_cycle,
+    ops_per_cycle_by_arch,
+    register_throughput_model,
+    supports,
+    unregister_throughput_model,
+)
+
+
+class TestThroughputRegistry(unittest.TestCase):
+    def test_builtin_models(self):
+        """Test constant factors and the register tree enqueue models over arrays of sizes."""
+        queue_sizes = np.array([4, 16, 256])
+        np.testing.assert_allclose(ops_per_cycle("register_tree_enq_enabled", "enqueue", queue_sizes), [1 / 2, 1 / 4, 1 / 8])
+        np.testing.assert_allclose(
+            ops_per_cycle("register_tree_pipelined_enq_enabled", "enqueue", queue_sizes), [1 / 3, 1 / 5, 1 / 9]
+        )
+        np.testing.assert_allclose(ops_per_cycle("BRAM_TREE", "dequeue", queue_sizes), [1 / 8] * 3)
+        np.testing.assert_allclose(ops_per_cycle("unknown_tree", "dequeue", queue_sizes), [1] * 3)
+
+        factors = ops_per_cycle_by_arch(np.array(["systolic_array", "register_tree_enq_enabled"]), np.array([8, 8]), "enqueue")
+        np.testing.assert_allclose(factors, [1, 1 / 3])
+
+    def test_supports(self):
+        """Test which architectures declare an enqueue throughput."""
+        self.assertTrue(supports("register_tree_enq_enabled", "enqueue"))
+        self.assertTrue(supports("systolic_array", "enqueue"))
+        self.assertFalse(supports("register_array_enq_disabled", "enqueue"))
+        self.assertFalse(supports("hybrid_tree", "enqueue"))
+        self.assertTrue(supports("hybrid_tree", "replace"))
+
+    def test_register_new_architecture(self):
+        """Test plugging in a model without touching data_processor."""
+        version = models_version()
+        register_throughput_model("heap_tree", "enqueue", lambda queue_sizes, **_: 2 / queue_sizes)
+        try:
+            self.assertGreater(models_version(), version)
+            self.assertTrue(supports("heap_tree", "enqueue"))
+            data_dict = {2: {"max_achieved_frequency": 100.0}, 4: {"max_achieved_frequency": 100.0}}
+            _, performance = data_processor.compute_performance(data_dict, "heap_tree", "enqueue")
+            np.testing.assert_allclose(performance, [100.0, 50.0])
+        finally:
+            unregister_throughput_model("heap_tree", "enqueue")
+        self.assertFalse(supports("heap_tree", "enqueue"))
+
+
+if __name__ == "__main__":
+    unittest.main()
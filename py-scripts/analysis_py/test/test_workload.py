@@ -0,0 +1,74 @@
+"""
+Unit tests for workload.py
+"""
+import unittest
+import numpy as np
+
+import data_processor
+from workload import harmonic_throughput, mix_sweep, mix_throughput, normalize_mix, parse_mix
+
+
+def metrics(queue_size, frequency):
+    return {"queue_size": queue_size, "max_achieved_frequency": frequency, "luts_util_percent": 1.0}
+
+
+DATA = {
+    # 1 op/cycle for every operation
+    "systolic_array": {16: metrics(16, 300)},
+    # 1/2 op/cycle for every operation
+    "register_array_pipelined_enq_enabled": {16: metrics(16, 800)},
+    # No enqueue, 1 dequeue or replace per cycle
+    "hybrid_tree": {15: metrics(15, 500)},
+}
+
+
+class TestWorkloadMix(unittest.TestCase):
+    def test_normalize_mix(self):
+        """Test fractions aligned with OPERATIONS and rejected mixes."""
+        np.testing.assert_allclose(normalize_mix({"replace": 6, "enqueue": 3, "dequeue": 1}), [0.3, 0.1, 0.6])
+        self.assertEqual(parse_mix("enqueue=3,dequeue"), {"enqueue": 3.0, "dequeue": 1.0})
+        for mix in ({"peek": 1}, {"enqueue": -1, "dequeue": 2}, {"enqueue": 0}):
+            with self.assertRaises(ValueError):
+                normalize_mix(mix)
+
+    def test_harmonic_throughput(self):
+        """Test that times add up and unsupported operations make a mix infeasible."""
+        performance = np.array([[100.0, np.nan], [400.0, 200.0], [400.0, 0.0]])
+        throughput = harmonic_throughput(np.array([[0.5, 0.5, 0.0], [0.0, 1.0, 0.0]]), performance)
+        np.testing.assert_allclose(throughput, [[160.0, np.nan], [400.0, 200.0]])
+
+    def test_mix_throughput(self):
+        """Test sustained MOPS per architecture, with pipeline factors and unsupported enqueue."""
+        results = mix_throughput(DATA, {"enqueue": 1, "dequeue": 1})
+        self.assertEqual(sorted(results), ["register_array_pipelined_enq_enabled", "systolic_array"])
+        np.testing.assert_allclose(results["register_array_pipelined_enq_enabled"][1], [400])
+
+        queue_sizes, mops = data_processor.compute_mix_performance(DATA["hybrid_tree"], "hybrid_tree", {"replace": 1})
+        self.assertEqual(queue_sizes.tolist(), [15])
+        np.testing.assert_allclose(mops, [500])
+        queue_sizes, _ = data_processor.compute_mix_performance(DATA["hybrid_tree"], "hybrid_tree", {"enqueue": 1})
+        self.assertEqual(len(queue_sizes), 0)
+
+    def test_mix_sweep(self):
+        """Test the best architecture over a grid of mixes, matching 15 and 16 entries."""
+        sweep = mix_sweep(DATA, 16, step=0.5)
+        self.assertEqual(sweep["enqueue"].tolist(), [0.0, 0.5, 1.0])
+        best = [[sweep["architectures"][i] if i >= 0 else None for i in row] for row in sweep["best"].tolist()]
+        # Rows are replace shares, columns enqueue shares
+        pipelined = "register_array_pipelined_enq_enabled"
+        self.assertEqual(best[0], ["hybrid_tree", pipelined, pipelined])
+        self.assertEqual(best[2], ["hybrid_tree", None, None])
+        self.assertTrue(np.isnan(sweep["best_throughput"][2, 2]))
+        self.assertAlmostEqual(sweep["best_throughput"][1, 1], 400)
+
+    def test_mix_sweep_without_queue_size(self):
+        """Test that a queue size no architecture was implemented with finds no best architecture."""
+        sweep = mix_sweep(DATA, 10**8, step=0.5)
+        self.assertEqual(sweep["architectures"], [])
+        self.assertEqual(sweep["throughput"].shape, (3, 3, 0))
+        self.assertTrue(np.all(sweep["best"] == -1))
+        self.assertTrue(np.all(np.isnan(sweep["best_throughput"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
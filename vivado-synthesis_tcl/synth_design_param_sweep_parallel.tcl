@@ -1,11 +1,11 @@
 # Script for running a single parameter configuration in parallel
-# This script accepts command line arguments: enq_ena queue_size
-# Example: vivado -mode batch -source synth_design_param_sweep_parallel.tcl -tclargs 0 16 1023
+# This script accepts command line arguments: architecture_name enq_ena data_width queue_size [part]
+# Example: vivado -mode batch -source synth_design_param_sweep_parallel.tcl -tclargs register_tree 0 16 1023
 
 # Get parameters from command line arguments
 if {$argc < 4} {
   puts "Error: This script requires four arguments: Architecture name, ENQ_ENA, DATA_WIDTH, and QUEUE_SIZE"
-  puts "Usage: vivado -mode batch -source synth_design_param_sweep_parallel.tcl -tclargs <ARCHITECTURE_NAME> <ENQ_ENA> <DATA_WIDTH> <QUEUE_SIZE>"
+  puts "Usage: vivado -mode batch -source synth_design_param_sweep_parallel.tcl -tclargs <ARCHITECTURE_NAME> <ENQ_ENA> <DATA_WIDTH> <QUEUE_SIZE> \[PART\]"
   exit 1
 }
 
@@ -14,9 +14,14 @@ set enq_ena [lindex $argv 1]
 set data_width [lindex $argv 2]
 set queue_size [lindex $argv 3]
 
-# NOTE - Set the device to use
+# NOTE - Set the device to use, or pass its part as the fifth argument
 # set running_device xcvu19p-fsva3824-1-e
 set running_device xcau25p-ffvb676-1-e
+if {$argc > 4} {
+  set running_device [lindex $argv 4]
+}
+# Short device name used in the results directory, e.g. xcau25p
+set device_name [lindex [split $running_device "-"] 0]
 
 # NOTE - Set the number of threads to use
 set_param general.maxThreads 16
@@ -26,7 +31,7 @@ set_param general.maxThreads 16
 set script_dir [file dirname [file normalize [info script]]]
 set project_root [file normalize [file join $script_dir ".."]]
 set sv_file_path [file join $project_root "hwpq" $architecture_name "rtl" "src"]
-set base_log_path [file join $project_root "hwpq" $architecture_name "vivado_analysis_results_16bit_xcau25p"]
+set base_log_path [file join $project_root "hwpq" $architecture_name "vivado_analysis_results_${data_width}bit_${device_name}"]
 
 # Clock frequency values
 set clock_freq_values {100 150 200 250 300 350 400 450 500 550 600 650 700 750 800}